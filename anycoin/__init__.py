@@ -1,4 +1,32 @@
-# ruff: noqa: F401
+from typing import TYPE_CHECKING, Any
+
 from ._enums import CoinSymbols, QuoteSymbols
-from ._interfaces.async_ import AsyncAnyCoin
-from ._interfaces.sync import AnyCoin
+
+if TYPE_CHECKING:
+    from ._interfaces.async_ import AsyncAnyCoin
+    from ._interfaces.sync import AnyCoin
+
+__all__ = ['AnyCoin', 'AsyncAnyCoin', 'CoinSymbols', 'QuoteSymbols']
+
+# The facades (and with them anyio, pydantic, httpx and aiocache) are-
+# imported on first access, so code that only needs the symbols starts fast
+_LAZY_ATTRS = {
+    'AsyncAnyCoin': '._interfaces.async_',
+    'AnyCoin': '._interfaces.sync',
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    import importlib  # noqa: PLC0415
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -1,14 +1,249 @@
-from dataclasses import dataclass
-from enum import Enum
+import sys
+import threading
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Iterator, Mapping, NamedTuple
 
+from ._mapped_ids import get_ids
 
-@dataclass
-class CoinItem:
+if TYPE_CHECKING:
+    from pydantic_core import core_schema
+
+
+class CoinItem(NamedTuple):
     value: str
     name: str
 
 
-class CoinSymbols(Enum):
+# Symbols are read-only once created
+_set_attr = object.__setattr__
+
+
+class _SymbolsMeta(type):
+    """
+    Registry behind ``CoinSymbols``/``QuoteSymbols``: the ``CoinItem``-
+    attributes of the class body become interned symbols (like enum-
+    members), more can be registered at runtime and calling the class-
+    looks a symbol up by value in O(1).
+    """
+
+    def __new__(mcs, cls_name: str, bases: tuple, namespace: dict):
+        items = {
+            attr: namespace.pop(attr)
+            for attr, value in list(namespace.items())
+            if isinstance(value, CoinItem)
+        }
+        cls = super().__new__(mcs, cls_name, bases, namespace)
+        cls._members = {}  # value -> symbol
+        cls._provider_index = {}  # api service -> provider id -> symbol
+        cls._provider_ids = {}  # api service -> value -> provider id
+        cls._provider_ids_loaded = False
+        cls._lock = threading.Lock()
+
+        for attr, item in items.items():
+            setattr(cls, attr, cls._create(item.value, item.name, attr))
+        return cls
+
+    def __call__(cls, value):
+        if type(value) is cls:
+            return value
+        try:
+            return cls._members[value]
+        except (KeyError, TypeError):
+            raise ValueError(
+                f'{value!r} is not a valid {cls.__name__}'
+            ) from None
+
+    def __getitem__(cls, key: str):
+        """Symbol by attribute name (like ``Enum['name']``) or value"""
+        symbol = cls.__dict__.get(key)
+        if type(symbol) is cls:
+            return symbol
+        try:
+            return cls._members[key]
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __iter__(cls) -> Iterator:
+        return iter(list(cls._members.values()))
+
+    def __len__(cls) -> int:
+        return len(cls._members)
+
+    def __contains__(cls, value) -> bool:
+        return type(value) is cls or value in cls._members
+
+    def __repr__(cls) -> str:
+        return f"<symbols '{cls.__name__}'>"
+
+
+class _Symbol(metaclass=_SymbolsMeta):
+    """
+    Interned symbol: there is one object per value, so symbols compare-
+    and hash by identity, like enum members.
+    """
+
+    __slots__ = ('_key', '_name', 'value')
+
+    # api service -> mapped ids file of the provider ids of the symbols
+    _data_files: dict[str, str] = {}
+
+    @classmethod
+    def _create(
+        cls, value: str, name: str | None, key: str | None = None
+    ) -> '_Symbol':
+        symbol = object.__new__(cls)
+        _set_attr(symbol, 'value', sys.intern(value))
+        _set_attr(symbol, '_name', name or value.upper())
+        _set_attr(symbol, '_key', key)
+        cls._members[symbol.value] = symbol
+        return symbol
+
+    @classmethod
+    def register(
+        cls,
+        value: str,
+        name: str | None = None,
+        provider_ids: dict[str, str] | None = None,
+    ) -> '_Symbol':
+        """
+        Add a symbol, or provider ids to an existing one (e.g.-
+        ``provider_ids={'coingecko': 'bitcoin'}``), and return it.
+        """
+        with cls._lock:
+            symbol = cls._members.get(value)
+            if symbol is None:
+                symbol = cls._create(value, name)
+            for api_service, provider_id in (provider_ids or {}).items():
+                symbol._add_provider_id(api_service, provider_id)
+        return symbol
+
+    @classmethod
+    def from_provider_id(cls, api_service: str, provider_id: str) -> '_Symbol':
+        """Symbol of the id used by ``api_service`` (KeyError if unknown)"""
+        cls._load_provider_ids()
+        return cls._provider_index[api_service][provider_id]
+
+    @classmethod
+    def get_provider_index(cls, api_service: str) -> Mapping[str, '_Symbol']:
+        """Read-only (live) provider id -> symbol table of ``api_service``"""
+        cls._load_provider_ids()
+        return MappingProxyType(
+            cls._provider_index.setdefault(api_service, {})
+        )
+
+    def get_provider_id(self, api_service: str) -> str:
+        """Id of the symbol in ``api_service`` (KeyError if unknown)"""
+        return type(self).get_provider_ids(api_service)[self.value]
+
+    @classmethod
+    def get_provider_ids(cls, api_service: str) -> Mapping[str, str]:
+        """Read-only (live) value -> provider id table of ``api_service``"""
+        cls._load_provider_ids()
+        return MappingProxyType(cls._provider_ids.setdefault(api_service, {}))
+
+    @classmethod
+    def _load_provider_ids(cls) -> None:
+        """Register the symbols and ids of the mapped ids files, once"""
+        if cls._provider_ids_loaded:
+            return
+
+        with cls._lock:
+            if cls._provider_ids_loaded:
+                return
+
+            for api_service, file_name in cls._data_files.items():
+                for value, provider_id in get_ids(file_name).items():
+                    symbol = cls._members.get(value) or cls._create(
+                        value, None
+                    )
+                    symbol._add_provider_id(api_service, provider_id)
+
+            cls._provider_ids_loaded = True
+
+    def _add_provider_id(self, api_service: str, provider_id: str) -> None:
+        provider_id = sys.intern(str(provider_id))
+        cls = type(self)
+        cls._provider_ids.setdefault(api_service, {}).setdefault(
+            self.value, provider_id
+        )
+        # If two symbols share an id, the first one is kept
+        cls._provider_index.setdefault(api_service, {}).setdefault(
+            provider_id, self
+        )
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        raise AttributeError(f'{type(self).__name__} is read-only')
+
+    def __reduce__(self):
+        return type(self), (self.value,)
+
+    def __copy__(self) -> '_Symbol':
+        return self
+
+    def __deepcopy__(self, memo: dict) -> '_Symbol':
+        return self
+
+    def __repr__(self) -> str:
+        return f"<{self}: '{self.value}'>"
+
+    def __str__(self) -> str:
+        return f'{type(self).__name__}.{self._key or self.value}'
+
+    @classmethod
+    def __get_pydantic_core_schema__(  # noqa: PLW3201
+        cls, source: Any, handler: Any
+    ) -> 'core_schema.CoreSchema':
+        # Imported here so that ``import anycoin`` does not load pydantic
+        from pydantic_core import core_schema  # noqa: PLC0415
+
+        members = cls._members
+
+        def validate(value: Any) -> _Symbol:
+            # Symbols (and their values in JSON) are validated by one lookup
+            if type(value) is cls:
+                return value
+            try:
+                return members[value]
+            except (KeyError, TypeError):
+                raise ValueError(
+                    f'{value!r} is not a valid {cls.__name__}'
+                ) from None
+
+        return core_schema.no_info_plain_validator_function(
+            validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda symbol: symbol.value, when_used='json'
+            ),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(  # noqa: PLW3201
+        cls, schema: 'core_schema.CoreSchema', handler: Any
+    ) -> dict[str, Any]:
+        # A plain validator has no JSON schema of its own (the
+        # ``json_schema_input_schema`` argument needs pydantic 2.10)
+        from pydantic_core import core_schema  # noqa: PLC0415
+
+        return handler(core_schema.str_schema())
+
+
+class CoinSymbols(_Symbol):
+    """
+    Coins. Symbols beyond the members below are added with-
+    ``CoinSymbols.register`` or loaded from the mapped ids files.
+    """
+
+    __slots__ = ()
+
+    _data_files = {
+        'coinmarketcap': 'mapped_cmc_coin_ids.json',
+        'coingecko': 'mapped_cgk_coin_ids.json',
+    }
+
     btc = CoinItem('btc', 'Bitcoin')
     eth = CoinItem('eth', 'Ethereum')
     xrp = CoinItem('xrp', 'XRP')
@@ -29,30 +264,19 @@ class CoinSymbols(Enum):
     pepe = CoinItem('pepe', 'Pepe')
     pol = CoinItem('pol', 'Polygon')
 
-    def __new__(cls, item):
-        obj = object.__new__(cls)
-        obj._value_ = item.value
-        obj._name = item.name
-        return obj
 
-    @property
-    def name(self):
-        return self._name
+class QuoteSymbols(_Symbol):
+    """Quote (fiat) currencies, extensible like ``CoinSymbols``"""
+
+    __slots__ = ()
 
+    _data_files = {
+        'coinmarketcap': 'mapped_cmc_quote_ids.json',
+        'coingecko': 'mapped_cgk_quote_ids.json',
+    }
 
-class QuoteSymbols(Enum):
     usd = CoinItem('usd', 'United States Dollar')
     eur = CoinItem('eur', 'Euro')
     brl = CoinItem('brl', 'Brazilian Real')
     rub = CoinItem('rub', 'Russian ruble')
     bdt = CoinItem('bdt', 'Bangladeshi taka')
-
-    def __new__(cls, item):
-        obj = object.__new__(cls)
-        obj._value_ = item.value
-        obj._name = item.name
-        return obj
-
-    @property
-    def name(self):
-        return self._name
@@ -1,98 +1,538 @@
+import asyncio
+import time
 import traceback
+from dataclasses import dataclass, field
+from datetime import datetime
 from decimal import Decimal
-from typing import Any, Generator
+from functools import partial
+from typing import Any, Awaitable, Callable, Generator, Literal, TypeVar
+
+import anyio
 
 from .._enums import CoinSymbols, QuoteSymbols
 from ..abc import APIService
-from ..exeptions import ConvertCoin as ConvertCoinException
+from ..circuit_breaker import CircuitBreaker, CircuitBreakerPolicy
+from ..exeptions import CircuitOpen as CircuitOpenException
 from ..exeptions import GetCoinQuotes as GetCoinQuotesException
-from ..response_models import CoinQuotes
+from ..exeptions import GetOHLCV as GetOHLCVException
+from ..exeptions import NotSupported as NotSupportedException
+from ..exeptions import RateLimited as RateLimitedException
+from ..instrumentation import Instrumentation
+from ..quote_store import QuoteStore
+from ..rate_graph import RateGraph
+from ..response_models import (
+    CoinQuotes,
+    HistoricalQuotes,
+)
+from ..services.base import BaseAPIService
+
+_T = TypeVar('_T')
+
+
+@dataclass
+class _QuotesBatch:
+    """Concurrent ``get_coin_quotes`` calls sent as one request"""
+
+    coins: dict[CoinSymbols, None] = field(default_factory=dict)
+    quotes_in: dict[QuoteSymbols, None] = field(default_factory=dict)
+    size: int = 0
+    done: anyio.Event = field(default_factory=anyio.Event)
+    result: CoinQuotes | None = None
+    # Error of the batch (for every caller), unless it was split
+    error: GetCoinQuotesException | None = None
+    failed: bool = False
 
 
 class AsyncAnyCoin:
     def __init__(
         self,
         api_services: list[APIService],
+        hedge_delay: float | None = None,
+        circuit_breaker_policy: CircuitBreakerPolicy | None = None,
+        batch_window: float | None = None,
+        instrumentation: Instrumentation | None = None,
+        rates_max_age: float | None = None,
+        quote_store: QuoteStore | None = None,
     ) -> None:
+        """
+        By default the services are tried one after another. With-
+        ``hedge_delay`` set, the next service is also started when the-
+        previous one has not answered after ``hedge_delay`` seconds; the-
+        first valid result wins and the other requests are cancelled.
+        ``hedge_delay=0`` races all the services at once.
+
+        With ``circuit_breaker_policy`` each service gets a circuit-
+        breaker and services with an open circuit are skipped.
+
+        With ``batch_window`` set, the ``get_coin_quotes`` calls made-
+        within ``batch_window`` seconds are sent as one request for the-
+        union of their coins and quotes; each caller gets its own slice.-
+        If the request fails every caller gets its error, unless a coin or-
+        quote was not supported: the calls are then sent one by one.
+
+        ``instrumentation`` receives the latency of each service call and-
+        the failover events.
+
+        ``convert_coin`` and ``convert_many`` compute the conversions from-
+        a rate graph of the fetched prices, fetching only the missing-
+        ones. Reusing prices across calls is opt-in: by default (``None``)-
+        every conversion call builds its own graph. With ``rates_max_age``-
+        set, the prices of every call are kept in the graph until they are-
+        ``rates_max_age`` seconds old (counted from their fetch, so cached-
+        prices expire sooner), and later conversions linked by them (e.g.-
+        btc to eth, then eth to brl through the same usd prices) need no-
+        request.
+
+        With ``quote_store`` every ``get_coin_quotes`` result is recorded-
+        in the store, and calls whose prices are all in the store (within-
+        its ``max_age``) are answered from it (see ``QuoteStore``).
+        """
         self._api_services: list[APIService] = api_services
+        self._hedge_delay = hedge_delay
+        self._batch_window = batch_window
+        # One pending batch per event loop (see ``AnyCoin`` portals)
+        self._pending_batches: dict[
+            asyncio.AbstractEventLoop, _QuotesBatch
+        ] = {}
+        self._instrumentation = instrumentation
+        self._quote_store = quote_store
+        self._rate_graph: RateGraph | None = None
+        if rates_max_age is not None:
+            self._rate_graph = RateGraph(max_age=rates_max_age)
 
         if not self._api_services:
             raise RuntimeError('At least one service is required')
 
+        self._circuit_breakers: dict[APIService, CircuitBreaker] = {}
+        if circuit_breaker_policy is not None:
+            self._circuit_breakers = {
+                service: CircuitBreaker(
+                    name=f'{index}:{service.__class__.__name__}',
+                    policy=circuit_breaker_policy,
+                )
+                for index, service in enumerate(self._api_services)
+            }
+
+    @property
+    def circuit_breakers(self) -> dict[APIService, CircuitBreaker]:
+        """Circuit breaker of each service (for inspection)"""
+        return dict(self._circuit_breakers)
+
     async def get_coin_quotes(
         self,
         coins: list[CoinSymbols],
         quotes_in: list[QuoteSymbols],
     ) -> CoinQuotes:
+        coin_quotes: CoinQuotes | None = None
+        if self._quote_store is not None:
+            coin_quotes = await self._get_stored_coin_quotes(
+                coins=coins, quotes_in=quotes_in
+            )
+
+        if coin_quotes is None:
+            if self._batch_window is not None:
+                coin_quotes = await self._get_coin_quotes_batched(
+                    coins=coins, quotes_in=quotes_in
+                )
+            else:
+                coin_quotes = await self._get_coin_quotes(
+                    coins=coins, quotes_in=quotes_in
+                )
+
+            if self._quote_store is not None:
+                try:
+                    # At the fetch time (e.g. of a cached result), now if-
+                    # the service does not report it
+                    self._quote_store.add(
+                        coin_quotes, at=coin_quotes.fetched_at
+                    )
+                except Exception:  # e.g. closed: the result is not recorded
+                    traceback.print_exc()
+
+        if self._rate_graph is not None:
+            self._rate_graph.add(coin_quotes)
+
+        return coin_quotes
+
+    async def _get_stored_coin_quotes(
+        self, coins: list[CoinSymbols], quotes_in: list[QuoteSymbols]
+    ) -> CoinQuotes | None:
+        """
+        ``get_coin_quotes`` of the quote store, in a worker thread when it-
+        reads the database so the event loop is not blocked by SQLite
+        """
+        if self._quote_store.is_loaded(coins, quotes_in):
+            return self._quote_store.get_coin_quotes(
+                coins=coins, quotes_in=quotes_in
+            )
+        return await anyio.to_thread.run_sync(
+            partial(
+                self._quote_store.get_coin_quotes,
+                coins=coins,
+                quotes_in=quotes_in,
+            )
+        )
+
+    async def _get_coin_quotes(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> CoinQuotes:
+        if self._hedge_delay is not None:
+            return await self._get_coin_quotes_hedged(
+                coins=coins, quotes_in=quotes_in
+            )
+
+        not_supported: NotSupportedException | None = None
         for service in self._get_services():
             try:
-                return await service.get_coin_quotes(
-                    coins=coins, quotes_in=quotes_in
+                return await self._request_service(
+                    service, coins=coins, quotes_in=quotes_in
                 )
-            except GetCoinQuotesException:
+            except CircuitOpenException as expt:
+                self._report_failover(service, expt)
+                continue
+            except GetCoinQuotesException as expt:
                 traceback.print_exc()
+                self._report_failover(service, expt)
+                if isinstance(expt.__cause__, NotSupportedException):
+                    not_supported = expt.__cause__
                 continue
 
-        raise GetCoinQuotesException('Unable to get quote through services')
+        # Caused by a coin/quote not supported if a service said so (see-
+        # ``_get_coin_quotes_batched``)
+        raise GetCoinQuotesException(
+            'Unable to get quote through services'
+        ) from not_supported
 
-    async def convert_coin(
+    async def _get_coin_quotes_batched(
         self,
-        amount: int | float | Decimal,
-        from_coin: CoinSymbols | QuoteSymbols,
-        to_coin: CoinSymbols | QuoteSymbols,
-    ) -> Decimal:
-        if isinstance(from_coin, CoinSymbols) and isinstance(
-            to_coin, QuoteSymbols
-        ):
-            result: CoinQuotes = await self.get_coin_quotes(
-                coins=[from_coin],
-                quotes_in=[to_coin],
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> CoinQuotes:
+        loop = asyncio.get_running_loop()
+        batch = self._pending_batches.get(loop)
+        is_leader = batch is None
+        if is_leader:
+            batch = self._pending_batches[loop] = _QuotesBatch()
+
+        batch.coins.update(dict.fromkeys(coins))
+        batch.quotes_in.update(dict.fromkeys(quotes_in))
+        batch.size += 1
+
+        if is_leader:
+            # The first caller waits for the others and sends the request
+            try:
+                await anyio.sleep(self._batch_window)
+                del self._pending_batches[loop]
+                try:
+                    batch.result = await self._get_coin_quotes(
+                        coins=list(batch.coins),
+                        quotes_in=list(batch.quotes_in),
+                    )
+                except GetCoinQuotesException as expt:
+                    if batch.size == 1:
+                        raise
+                    # A coin/quote of one caller not supported: split the-
+                    # batch. Otherwise (e.g. the services are down) every-
+                    # caller gets the error instead of retrying on its own
+                    if not isinstance(expt.__cause__, NotSupportedException):
+                        batch.error = expt
+            finally:
+                if self._pending_batches.get(loop) is batch:
+                    del self._pending_batches[loop]
+                batch.failed = batch.result is None
+                batch.done.set()
+        else:
+            await batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+
+        if batch.failed:
+            # Do not let one caller's coins fail the whole batch
+            return await self._get_coin_quotes(
+                coins=coins, quotes_in=quotes_in
             )
-            coin_quote: Decimal = result.coins[from_coin].quotes[to_coin].quote
-            return Decimal(str(amount)) * coin_quote
 
-        elif isinstance(from_coin, CoinSymbols) and isinstance(
-            to_coin, CoinSymbols
+        return batch.result.subset(coins=coins, quotes_in=quotes_in)
+
+    async def _get_coin_quotes_hedged(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> CoinQuotes:
+        services: list[APIService] = list(self._get_services())
+        started = [anyio.Event() for _ in services]
+        failed = [anyio.Event() for _ in services]
+        result: CoinQuotes | None = None
+        error: Exception | None = None
+        not_supported: NotSupportedException | None = None
+
+        async def request(index: int, service: APIService) -> None:
+            nonlocal result, error, not_supported
+
+            if index > 0:
+                # Start when the previous service fails or is too slow
+                await started[index - 1].wait()
+                with anyio.move_on_after(self._hedge_delay):
+                    await failed[index - 1].wait()
+
+            started[index].set()
+            try:
+                coin_quotes: CoinQuotes = await self._request_service(
+                    service, coins=coins, quotes_in=quotes_in
+                )
+            except CircuitOpenException as expt:
+                self._report_failover(service, expt)
+                failed[index].set()
+                return
+            except GetCoinQuotesException as expt:
+                traceback.print_exc()
+                self._report_failover(service, expt)
+                if isinstance(expt.__cause__, NotSupportedException):
+                    not_supported = expt.__cause__
+                failed[index].set()
+                return
+            except Exception as expt:  # Same as the sequential mode
+                error = expt
+                task_group.cancel_scope.cancel()
+                return
+
+            if result is None:
+                result = coin_quotes
+                task_group.cancel_scope.cancel()  # Cancel the slower ones
+
+        async with anyio.create_task_group() as task_group:
+            for index, service in enumerate(services):
+                task_group.start_soon(request, index, service)
+
+        if error is not None:
+            raise error
+
+        if result is None:
+            raise GetCoinQuotesException(
+                'Unable to get quote through services'
+            ) from not_supported
+
+        return result
+
+    async def _request_service(
+        self,
+        service: APIService,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> CoinQuotes:
+        """
+        Get the coin quotes from one service through its circuit breaker.
+
+        Raises ``CircuitOpen`` without calling the service if its circuit-
+        is open.
+        """
+        return await self._call_service(
+            service,
+            partial(service.get_coin_quotes, coins=coins, quotes_in=quotes_in),
+        )
+
+    async def _call_service(
+        self, service: APIService, call: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """``call`` of a method of ``service`` through its circuit breaker"""
+        circuit_breaker = self._circuit_breakers.get(service)
+        if circuit_breaker is not None and not (
+            await circuit_breaker.allow_request()
         ):
-            quote_in = QuoteSymbols.usd
+            raise CircuitOpenException(
+                f'Circuit of {circuit_breaker.name} is open'
+            )
 
-            result: CoinQuotes = await self.get_coin_quotes(
-                coins=[from_coin, to_coin],
-                quotes_in=[quote_in],
+        start = time.monotonic()
+        try:
+            result = await call()
+        except (GetCoinQuotesException, GetOHLCVException) as expt:
+            if circuit_breaker is not None:
+                # A coin not supported by the service is the caller's-
+                # error (raised before any request), not the service's
+                if isinstance(expt.__cause__, NotSupportedException):
+                    circuit_breaker.release_request()
+                else:
+                    await circuit_breaker.record_failure()
+            if self._instrumentation is not None:
+                self._instrumentation.on_service_call(
+                    service.__class__.__name__,
+                    time.monotonic() - start,
+                    expt,
+                )
+            raise
+        except BaseException:
+            # Cancelled (e.g. the losing call of a hedged request) or an-
+            # unexpected error: no outcome, but a half-open trial call-
+            # must not be kept forever
+            if circuit_breaker is not None:
+                circuit_breaker.release_request()
+            raise
+
+        duration = time.monotonic() - start
+        if circuit_breaker is not None:
+            await circuit_breaker.record_success(duration)
+        if self._instrumentation is not None:
+            self._instrumentation.on_service_call(
+                service.__class__.__name__, duration, None
             )
-            from_rate: Decimal = result.coins[from_coin].quotes[quote_in].quote
-            to_rate: Decimal = result.coins[to_coin].quotes[quote_in].quote
-            return (Decimal(str(amount)) * from_rate) / to_rate
+        return result
 
-        elif isinstance(from_coin, QuoteSymbols) and isinstance(
-            to_coin, CoinSymbols
-        ):
-            result: CoinQuotes = await self.get_coin_quotes(
-                coins=[to_coin],
-                quotes_in=[from_coin],
+    def _report_failover(self, service: APIService, error: Exception) -> None:
+        if self._instrumentation is not None:
+            self._instrumentation.on_failover(
+                service.__class__.__name__, error
             )
-            to_rate: Decimal = result.coins[to_coin].quotes[from_coin].quote
-            return Decimal(str(amount)) / to_rate
 
-        elif isinstance(from_coin, QuoteSymbols) and isinstance(
-            to_coin, QuoteSymbols
-        ):
-            coin_symbol_reference = CoinSymbols.usdt
+    async def get_coin_quotes_many(
+        self,
+        requests: list[tuple[list[CoinSymbols], list[QuoteSymbols]]],
+    ) -> list[CoinQuotes]:
+        """
+        Several ``(coins, quotes_in)`` requests answered by one-
+        ``get_coin_quotes`` call for the union of their coins and quotes.
 
-            result: CoinQuotes = await self.get_coin_quotes(
-                coins=[coin_symbol_reference],
-                quotes_in=[from_coin, to_coin],
+        The results are in the order of ``requests``.
+        """
+        if not requests:
+            return []
+
+        coins: dict[CoinSymbols, None] = {}
+        quotes_in: dict[QuoteSymbols, None] = {}
+        for request_coins, request_quotes_in in requests:
+            coins.update(dict.fromkeys(request_coins))
+            quotes_in.update(dict.fromkeys(request_quotes_in))
+
+        coin_quotes: CoinQuotes = await self.get_coin_quotes(
+            coins=list(coins), quotes_in=list(quotes_in)
+        )
+
+        return [
+            coin_quotes.subset(
+                coins=request_coins, quotes_in=request_quotes_in
             )
-            rates = result.coins[coin_symbol_reference]
+            for request_coins, request_quotes_in in requests
+        ]
 
-            from_rate: Decimal = rates.quotes[from_coin].quote
-            to_rate: Decimal = rates.quotes[to_coin].quote
-            return (Decimal(str(amount)) / from_rate) * to_rate
+    async def get_ohlcv(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+        start: datetime,
+        end: datetime,
+        interval: Literal['daily', 'hourly'] = 'daily',
+    ) -> HistoricalQuotes:
+        """
+        Historical OHLCV candles as columns (see ``HistoricalQuotes``),-
+        from the first service that has them. The services are tried one-
+        after another, through their circuit breakers; those without-
+        OHLCV (see ``_supports_ohlcv``) are skipped.
+        """
+        for service in self._get_services():
+            if not _supports_ohlcv(service):
+                continue
 
-        raise ConvertCoinException(
-            f'Invalid conversion from {from_coin} to {to_coin}'
+            try:
+                return await self._call_service(
+                    service,
+                    partial(
+                        service.get_ohlcv,
+                        coins=coins,
+                        quotes_in=quotes_in,
+                        start=start,
+                        end=end,
+                        interval=interval,
+                    ),
+                )
+            except CircuitOpenException as expt:
+                self._report_failover(service, expt)
+                continue
+            except GetOHLCVException as expt:  # e.g. coin not supported
+                self._report_failover(service, expt)
+                continue
+            except RateLimitedException as expt:  # Rate limiter queue full
+                self._report_failover(service, expt)
+                continue
+
+        raise GetOHLCVException('Unable to get OHLCV through services')
+
+    async def convert_coin(
+        self,
+        amount: int | float | Decimal,
+        from_coin: CoinSymbols | QuoteSymbols,
+        to_coin: CoinSymbols | QuoteSymbols,
+    ) -> Decimal:
+        (result,) = await self.convert_many(
+            conversions=[(amount, from_coin, to_coin)]
         )
+        return result
+
+    async def convert_many(
+        self,
+        conversions: list[
+            tuple[
+                int | float | Decimal,
+                CoinSymbols | QuoteSymbols,
+                CoinSymbols | QuoteSymbols,
+            ]
+        ],
+    ) -> list[Decimal]:
+        """
+        Several ``(amount, from_coin, to_coin)`` conversions with the-
+        rates of at most one ``get_coin_quotes`` call, which fetches only-
+        the prices missing from the rate graph (see ``RateGraph``).
+
+        The results are in the order of ``conversions``.
+        """
+        rate_graph = self._rate_graph or RateGraph()
+        # The prices found by ``get_missing`` must not expire before-
+        # ``convert``, so both check their age at the same time
+        now = time.monotonic()
+        coins, quotes_in = rate_graph.get_missing(
+            [(from_coin, to_coin) for _, from_coin, to_coin in conversions],
+            now=now,
+        )
+        if coins:
+            result: CoinQuotes = await self.get_coin_quotes(
+                coins=coins, quotes_in=quotes_in
+            )
+            if self._rate_graph is None:  # Otherwise added already
+                rate_graph.add(result)
+
+        return [
+            rate_graph.convert(amount, from_coin, to_coin, now=now)
+            for amount, from_coin, to_coin in conversions
+        ]
+
+    async def aclose(self) -> None:
+        """
+        Close all the API services (and their HTTP clients) and write the-
+        buffered prices of the quote store
+        """
+        for service in self._api_services:
+            await service.aclose()
+        if self._quote_store is not None:
+            await anyio.to_thread.run_sync(self._quote_store.flush)
+
+    async def __aenter__(self) -> 'AsyncAnyCoin':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
 
     def _get_services(self) -> Generator[APIService, Any, None]:
         for service in self._api_services:
             yield service
+
+
+def _supports_ohlcv(service: APIService) -> bool:
+    """
+    Whether ``service`` overrides the OHLCV method of its base class-
+    (``_get_ohlcv`` of a ``BaseAPIService``, ``get_ohlcv`` otherwise)
+    """
+    if isinstance(service, BaseAPIService):
+        return type(service)._get_ohlcv is not BaseAPIService._get_ohlcv
+    return type(service).get_ohlcv is not APIService.get_ohlcv
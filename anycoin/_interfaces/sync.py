@@ -1,14 +1,23 @@
 import atexit
 import threading
 from contextlib import ExitStack
+from datetime import datetime
 from decimal import Decimal
 from functools import partial
+from typing import Literal
 
+from aiocache import SimpleMemoryCache
 from anyio.from_thread import BlockingPortal, start_blocking_portal
 
 from .._enums import CoinSymbols, QuoteSymbols
 from ..abc import APIService
-from ..response_models import CoinQuotes
+from ..circuit_breaker import CircuitBreaker, CircuitBreakerPolicy
+from ..instrumentation import Instrumentation
+from ..quote_store import QuoteStore
+from ..response_models import (
+    CoinQuotes,
+    HistoricalQuotes,
+)
 from .async_ import AsyncAnyCoin
 
 
@@ -16,18 +25,67 @@ class AnyCoin:
     def __init__(
         self,
         api_services: list[APIService],
+        hedge_delay: float | None = None,
+        circuit_breaker_policy: CircuitBreakerPolicy | None = None,
+        batch_window: float | None = None,
+        instrumentation: Instrumentation | None = None,
+        portals: int = 1,
+        rates_max_age: float | None = None,
+        quote_store: QuoteStore | None = None,
     ) -> None:
+        """
+        Calls run on ``AsyncAnyCoin`` in a background event loop thread-
+        (blocking portal). With ``portals`` > 1 a pool of event loop-
+        threads is used and each calling thread sticks to one of them, so-
+        many calling threads (e.g. a threaded WSGI server) are not all-
+        served by a single loop.
+
+        The services are then shared by several event loops, which-
+        requires the memory cache (or no cache): the other cache backends-
+        keep connections bound to one event loop.
+        """
         self._api_services: list[APIService] = api_services
 
         if not self._api_services:
             raise RuntimeError('At least one service is required')
 
+        if portals < 1:
+            raise ValueError('portals must be at least 1')
+
+        if portals > 1:
+            caches = [
+                getattr(service, '_cache', None) for service in api_services
+            ]
+            if circuit_breaker_policy is not None:
+                caches.append(circuit_breaker_policy.cache)
+            if any(
+                cache is not None and not isinstance(cache, SimpleMemoryCache)
+                for cache in caches
+            ):
+                raise RuntimeError(
+                    'portals > 1 is only supported with the memory cache'
+                )
+
         self._async_instance = AsyncAnyCoin(
             api_services=api_services,
+            hedge_delay=hedge_delay,
+            circuit_breaker_policy=circuit_breaker_policy,
+            batch_window=batch_window,
+            instrumentation=instrumentation,
+            rates_max_age=rates_max_age,
+            quote_store=quote_store,
         )
         self._lock = threading.Lock()
         self._exit_stack = None
-        self._portal = None
+        self._max_portals = portals
+        self._portals: list[BlockingPortal] = []
+        self._next_portal = 0
+        self._local = threading.local()
+
+    @property
+    def circuit_breakers(self) -> dict[APIService, CircuitBreaker]:
+        """Circuit breaker of each service (for inspection)"""
+        return self._async_instance.circuit_breakers
 
     def get_coin_quotes(
         self,
@@ -59,16 +117,94 @@ class AnyCoin:
             )
         )
 
+    def get_coin_quotes_many(
+        self,
+        requests: list[tuple[list[CoinSymbols], list[QuoteSymbols]]],
+    ) -> list[CoinQuotes]:
+        """See ``AsyncAnyCoin.get_coin_quotes_many``"""
+        portal: BlockingPortal = self._get_portal()
+        return portal.call(
+            partial(
+                self._async_instance.get_coin_quotes_many,
+                requests=requests,
+            )
+        )
+
+    def convert_many(
+        self,
+        conversions: list[
+            tuple[
+                int | float | Decimal,
+                CoinSymbols | QuoteSymbols,
+                CoinSymbols | QuoteSymbols,
+            ]
+        ],
+    ) -> list[Decimal]:
+        """See ``AsyncAnyCoin.convert_many``"""
+        portal: BlockingPortal = self._get_portal()
+        return portal.call(
+            partial(self._async_instance.convert_many, conversions=conversions)
+        )
+
+    def get_ohlcv(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+        start: datetime,
+        end: datetime,
+        interval: Literal['daily', 'hourly'] = 'daily',
+    ) -> HistoricalQuotes:
+        """See ``AsyncAnyCoin.get_ohlcv``"""
+        portal: BlockingPortal = self._get_portal()
+        return portal.call(
+            partial(
+                self._async_instance.get_ohlcv,
+                coins=coins,
+                quotes_in=quotes_in,
+                start=start,
+                end=end,
+                interval=interval,
+            )
+        )
+
+    def close(self) -> None:
+        """Close all the API services (and their HTTP clients)"""
+        if not self._portals:
+            self._get_portal()
+
+        # The HTTP clients are per event loop: close them in each one
+        for portal in list(self._portals):
+            portal.call(self._async_instance.aclose)
+
+    def __enter__(self) -> 'AnyCoin':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def _get_portal(self) -> BlockingPortal:
-        """Thread portal for working with AsyncAnyCoin"""
+        """
+        Thread portal for working with AsyncAnyCoin. Each calling thread-
+        is assigned a portal of the pool once (round-robin); later calls-
+        do not take the lock.
+        """
+        portal: BlockingPortal | None = getattr(self._local, 'portal', None)
+        if portal is not None:
+            return portal
+
         with self._lock:
-            if self._portal is None:
+            if len(self._portals) < self._max_portals:
                 if self._exit_stack is None:
                     self._exit_stack = ExitStack()
                     atexit.register(self._exit_stack.close)
 
-                self._portal: BlockingPortal = self._exit_stack.enter_context(
+                portal = self._exit_stack.enter_context(
                     start_blocking_portal()
                 )
+                self._portals.append(portal)
+            else:
+                portal = self._portals[self._next_portal % self._max_portals]
+                self._next_portal += 1
 
-        return self._portal
+        self._local.portal = portal
+        return portal
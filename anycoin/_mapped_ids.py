@@ -1,15 +1,65 @@
 import json
+import os
+import sys
+import threading
+from types import MappingProxyType
+from typing import Mapping
 
-import aiocache
-from anyio import Path, open_file
+_DATA_PATH = os.path.join(os.path.dirname(__file__), '_data')
 
+_FILE_NAMES = (
+    'mapped_cmc_coin_ids.json',
+    'mapped_cmc_quote_ids.json',
+    'mapped_cgk_coin_ids.json',
+    'mapped_cgk_quote_ids.json',
+)
 
-@aiocache.cached(ttl=None, cache=aiocache.Cache.MEMORY)
-async def _get_json_data(file_name: str) -> dict:
-    path_resolved = await Path(__file__).resolve()
-    file_path = path_resolved.parent.joinpath('_data', file_name)
-    async with await open_file(file_path, encoding='utf-8') as file:
-        return json.loads(await file.read())
+# file name -> (symbol -> id, id -> symbol), filled on first use
+_tables: dict[str, tuple[Mapping[str, str], Mapping[str, str]]] = {}
+_lock = threading.Lock()
+
+
+def _load_tables() -> dict[str, tuple[Mapping[str, str], Mapping[str, str]]]:
+    """
+    Read every mapped ids file once, synchronously, into read-only-
+    tables; every lookup after that is a plain dict access.
+    """
+    if _tables:
+        return _tables
+
+    with _lock:
+        if _tables:
+            return _tables
+
+        tables = {}
+        for file_name in _FILE_NAMES:
+            with open(
+                os.path.join(_DATA_PATH, file_name), encoding='utf-8'
+            ) as file:
+                data: dict[str, str] = json.load(file)
+
+            ids = {sys.intern(k): sys.intern(str(v)) for k, v in data.items()}
+            # If two symbols share an id, the first one in the file is kept
+            symbols: dict[str, str] = {}
+            for symbol, id_ in ids.items():
+                symbols.setdefault(id_, symbol)
+
+            tables[file_name] = (
+                MappingProxyType(ids),
+                MappingProxyType(symbols),
+            )
+        _tables.update(tables)
+    return _tables
+
+
+def get_ids(file_name: str) -> Mapping[str, str]:
+    """Read-only symbol -> id table of a mapped ids file"""
+    return _load_tables()[file_name][0]
+
+
+def get_symbols(file_name: str) -> Mapping[str, str]:
+    """Read-only id -> symbol table (reverse index) of a mapped ids file"""
+    return _load_tables()[file_name][1]
 
 
 """
@@ -23,12 +73,20 @@ Quote Ids: https://coinmarketcap.com/api/documentation/
 """
 
 
-async def get_cmc_coins_ids() -> dict[str, str]:
-    return await _get_json_data('mapped_cmc_coin_ids.json')
+def get_cmc_coins_ids() -> Mapping[str, str]:
+    return get_ids('mapped_cmc_coin_ids.json')
+
+
+def get_cmc_quotes_ids() -> Mapping[str, str]:
+    return get_ids('mapped_cmc_quote_ids.json')
+
+
+def get_cmc_coins_symbols() -> Mapping[str, str]:
+    return get_symbols('mapped_cmc_coin_ids.json')
 
 
-async def get_cmc_quotes_ids() -> dict[str, str]:
-    return await _get_json_data('mapped_cmc_quote_ids.json')
+def get_cmc_quotes_symbols() -> Mapping[str, str]:
+    return get_symbols('mapped_cmc_quote_ids.json')
 
 
 """
@@ -42,9 +100,17 @@ Quote ids: https://docs.coingecko.com/reference/
 """
 
 
-async def get_cgk_coin_ids() -> dict[str, str]:
-    return await _get_json_data('mapped_cgk_coin_ids.json')
+def get_cgk_coin_ids() -> Mapping[str, str]:
+    return get_ids('mapped_cgk_coin_ids.json')
+
+
+def get_cgk_quotes_ids() -> Mapping[str, str]:
+    return get_ids('mapped_cgk_quote_ids.json')
+
+
+def get_cgk_coin_symbols() -> Mapping[str, str]:
+    return get_symbols('mapped_cgk_coin_ids.json')
 
 
-async def get_cgk_quotes_ids() -> dict[str, str]:
-    return await _get_json_data('mapped_cgk_quote_ids.json')
+def get_cgk_quotes_symbols() -> Mapping[str, str]:
+    return get_symbols('mapped_cgk_quote_ids.json')
@@ -1,6 +1,10 @@
 from abc import ABCMeta, abstractmethod
+from datetime import datetime
+from typing import Literal
 
 from ._enums import CoinSymbols, QuoteSymbols
+from .exeptions import GetOHLCV as GetOHLCVException
+from .exeptions import NotSupported as NotSupportedException
 
 
 class APIService(metaclass=ABCMeta):
@@ -42,5 +46,33 @@ class APIService(metaclass=ABCMeta):
     ) -> QuoteSymbols:
         """..."""
 
+    async def get_ohlcv(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+        start: datetime,
+        end: datetime,
+        interval: Literal['daily', 'hourly'] = 'daily',
+    ) -> 'HistoricalQuotes':
+        """
+        OHLCV candles from ``start`` to ``end`` (not every service has-
+        them: by default it raises ``GetOHLCV``, so ``AnyCoin`` fails-
+        over to the next service)
+        """
+        message = f'{self.__class__.__name__} does not support OHLCV'
+        raise GetOHLCVException(message) from NotSupportedException(message)
+
+    async def aclose(self) -> None:
+        """Release the resources held by the service (e.g. HTTP clients)"""
+
+    async def __aenter__(self) -> 'APIService':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
 
-from anycoin.response_models import CoinQuotes  # noqa: E402
+from anycoin.response_models import (  # noqa: E402
+    CoinQuotes,
+    HistoricalQuotes,
+)
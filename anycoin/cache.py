@@ -1,4 +1,11 @@
+import asyncio
+import hashlib
+import uuid
+import weakref
+
+import anyio
 from aiocache import Cache as _Cache
+from aiocache.lock import RedLock
 
 from ._enums import CoinSymbols, QuoteSymbols
 
@@ -24,21 +31,154 @@ class Cache(_Cache):
     """
 
 
+CACHE_KEY_VERSION = 'v1'
+
+# Memcached rejects keys longer than 250 bytes. Leave room for the-
+# aiocache namespace and the "-lock" suffix added by RedLock.
+_MAX_CACHE_KEY_LENGTH = 200
+
+
 def _get_cache_key_for_get_coin_quotes_method_params(
     coins: list[CoinSymbols],
     quotes_in: list[QuoteSymbols],
+    codec: str | None = None,
 ) -> str:
     """
+    Canonical cache key: coins and quotes are deduplicated and sorted, so-
+    the same request in any order maps to the same cache entry.
+
     Example result:
-        "coins:btc,ltc;quotes_in:usd,eur"
+        "anycoin:v1:coins:btc,ltc;quotes_in:eur,usd"
+
+    With ``codec`` (the ``CacheCodec.name`` of the value) the values of-
+    each codec get their own keys:
+        "anycoin:v1:codec:compact;coins:btc,ltc;quotes_in:eur,usd"
+
+    Keys longer than ``_MAX_CACHE_KEY_LENGTH`` are hashed:
+        "anycoin:v1:sha256:<hex digest>"
     """
 
     assert coins
     assert quotes_in
 
-    cache_key = ''
+    params = _get_coins_params(coins, quotes_in)
+    if codec is not None:
+        params = f'codec:{codec};{params}'
+    return _build_cache_key(params)
+
 
-    cache_key += 'coins:' + ','.join(coin.value for coin in coins)
+def _get_cache_key_for_ohlcv(
+    api_service: str,
+    coins: list[CoinSymbols],
+    quotes_in: list[QuoteSymbols],
+    start: int,
+    end: int,
+    interval: str,
+) -> str:
+    """
+    Cache key of a ``get_ohlcv`` call (``start``/``end`` in unix seconds).
+
+    Example result:
+        "anycoin:v1:ohlcv:coingecko:daily:1733011200-1733788800;coins:btc;-
+        quotes_in:usd"
+    """
+    assert coins
+    assert quotes_in
+
+    return _build_cache_key(
+        f'ohlcv:{api_service}:{interval}:{start}-{end};'
+        + _get_coins_params(coins, quotes_in)
+    )
+
+
+def _get_coins_params(
+    coins: list[CoinSymbols], quotes_in: list[QuoteSymbols]
+) -> str:
+    return (
+        'coins:'
+        + ','.join(sorted({coin.value for coin in coins}))
+        + ';quotes_in:'
+        + ','.join(sorted({quote.value for quote in quotes_in}))
+    )
+
+
+def _build_cache_key(params: str) -> str:
+    """Prefixed key, hashed if longer than ``_MAX_CACHE_KEY_LENGTH``"""
+    prefix = f'anycoin:{CACHE_KEY_VERSION}:'
+    cache_key = prefix + params
+    if len(cache_key) > _MAX_CACHE_KEY_LENGTH:
+        digest = hashlib.sha256(params.encode('utf-8')).hexdigest()
+        cache_key = prefix + 'sha256:' + digest
 
-    cache_key += ';quotes_in:' + ','.join(quote.value for quote in quotes_in)
     return cache_key
+
+
+def _get_cache_key_for_coin_quote(
+    api_service: str,
+    coin: CoinSymbols,
+    quote: QuoteSymbols,
+) -> str:
+    """
+    Cache key of a single coin/quote price (granular cache mode).
+
+    Example result:
+        "anycoin:v1:quote:coingecko:btc:usd"
+    """
+    return (
+        f'anycoin:{CACHE_KEY_VERSION}:quote:'
+        f'{api_service}:{coin.value}:{quote.value}'
+    )
+
+
+class _LoopLocalRedLock(RedLock):
+    """
+    ``RedLock`` that can be used from several event loops.
+
+    ``RedLock`` wakes the in-process waiters with an ``asyncio.Event``-
+    shared by all the loops, which is not safe across loops (threads).-
+    Here each loop has its own events: a waiter in another loop than the-
+    lock holder does not wait, like a waiter in another process.
+    """
+
+    _LOOP_EVENTS: weakref.WeakKeyDictionary[
+        asyncio.AbstractEventLoop, dict[str, asyncio.Event]
+    ] = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def _get_events(cls) -> dict[str, asyncio.Event]:
+        loop = asyncio.get_running_loop()
+        events = cls._LOOP_EVENTS.get(loop)
+        if events is None:
+            events = cls._LOOP_EVENTS[loop] = {}
+        return events
+
+    async def _acquire(self):
+        self._value = str(uuid.uuid4())
+        try:
+            await self.client._add(self.key, self._value, ttl=self.lease)
+            self._get_events()[self.key] = asyncio.Event()
+        except ValueError:
+            await self._wait_for_release()
+
+    async def _wait_for_release(self):
+        try:
+            await asyncio.wait_for(
+                self._get_events()[self.key].wait(), self.lease
+            )
+        except asyncio.TimeoutError:
+            pass
+        except KeyError:  # Not held in this loop, or already released
+            pass
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        # Released even if the holder is cancelled (e.g. the losing call of-
+        # a hedged request); otherwise the key stays locked for the lease
+        with anyio.CancelScope(shield=True):
+            await self._release()
+
+    async def _release(self):
+        removed = await self.client._redlock_release(self.key, self._value)
+        if removed:
+            event = self._get_events().pop(self.key, None)
+            if event is not None:
+                event.set()
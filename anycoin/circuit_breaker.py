@@ -0,0 +1,231 @@
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+
+from .cache import CACHE_KEY_VERSION, Cache
+
+
+class CircuitState(Enum):
+    closed = 'closed'
+    open = 'open'
+    half_open = 'half_open'
+
+
+@dataclass
+class CircuitBreakerPolicy:
+    """
+    Settings of the circuit breakers created by ``AsyncAnyCoin``.
+
+    The circuit opens when, over the last ``window_size`` calls (and at-
+    least ``minimum_calls``), the error rate reaches-
+    ``failure_rate_threshold`` or the rate of calls slower than-
+    ``slow_call_duration`` seconds reaches ``slow_call_rate_threshold``.
+    After ``cool_down`` seconds ``half_open_max_calls`` trial calls are-
+    allowed: a success closes the circuit, a failure opens it again.
+
+    If ``cache`` is passed, open/closed transitions are shared through it-
+    so that every node using the same cache agrees on the state. The-
+    shared state is read at most every ``cache_sync_interval`` seconds.
+    """
+
+    failure_rate_threshold: float = 0.5
+    slow_call_duration: float | None = None
+    slow_call_rate_threshold: float = 0.5
+    window_size: int = 20
+    minimum_calls: int = 5
+    cool_down: float = 30
+    half_open_max_calls: int = 1
+    cache: Cache | None = None
+    cache_sync_interval: float = 1.0
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker (and health score) of one API service.
+
+    It can be shared by several event loops (``AnyCoin`` with-
+    ``portals``): its state is only changed under a thread lock, which is-
+    never held across an ``await``.
+    """
+
+    def __init__(self, name: str, policy: CircuitBreakerPolicy) -> None:
+        self.name = name
+        self._policy = policy
+        self._lock = threading.Lock()
+
+        self._state = CircuitState.closed
+        self._opened_at = 0.0
+        self._updated_at = 0.0
+        self._half_open_calls = 0
+        self._synced_at = float('-inf')
+
+        # (failed, slow) of the last calls
+        self._outcomes: deque[tuple[bool, bool]] = deque(
+            maxlen=policy.window_size
+        )
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            return self._get_rates()[0]
+
+    @property
+    def slow_call_rate(self) -> float:
+        with self._lock:
+            return self._get_rates()[1]
+
+    @property
+    def health_score(self) -> float:
+        """From 0.0 (every recent call failed or was slow) to 1.0"""
+        with self._lock:
+            if self._state is CircuitState.open:
+                return 0.0
+            return 1.0 - max(self._get_rates())
+
+    async def allow_request(self) -> bool:
+        """
+        Whether the service can be called. An open circuit is rejected-
+        without any I/O.
+        """
+        if self._state is not CircuitState.open:
+            await self._sync_from_cache()
+
+        with self._lock:
+            if self._state is CircuitState.open:
+                if time.time() - self._opened_at < self._policy.cool_down:
+                    return False
+                self._state = CircuitState.half_open
+                self._half_open_calls = 0
+
+            if self._state is CircuitState.half_open:
+                if self._half_open_calls >= self._policy.half_open_max_calls:
+                    return False
+                self._half_open_calls += 1
+
+        return True
+
+    def release_request(self) -> None:
+        """
+        Give back the trial call of a half-open circuit taken by-
+        ``allow_request`` for a call without an outcome (cancelled, or-
+        failed with a client error), so that the next call can try again.
+        """
+        with self._lock:
+            if self._state is CircuitState.half_open and self._half_open_calls:
+                self._half_open_calls -= 1
+
+    async def record_success(self, duration: float) -> None:
+        slow_call_duration = self._policy.slow_call_duration
+        slow = slow_call_duration is not None and duration > slow_call_duration
+
+        with self._lock:
+            if self._state is CircuitState.half_open:
+                self._close()
+                changed = True
+            else:
+                self._outcomes.append((False, slow))
+                changed = self._open_if_unhealthy()
+
+        if changed:
+            await self._sync_to_cache()
+
+    async def record_failure(self) -> None:
+        with self._lock:
+            if self._state is CircuitState.half_open:
+                self._open()
+                changed = True
+            else:
+                self._outcomes.append((True, False))
+                changed = self._open_if_unhealthy()
+
+        if changed:
+            await self._sync_to_cache()
+
+    def _get_rates(self) -> tuple[float, float]:
+        """Error and slow call rates of the last calls (under ``_lock``)"""
+        if not self._outcomes:
+            return 0.0, 0.0
+
+        failed = slow = 0
+        for call_failed, call_slow in self._outcomes:
+            failed += call_failed
+            slow += call_slow
+        return failed / len(self._outcomes), slow / len(self._outcomes)
+
+    def _open_if_unhealthy(self) -> bool:
+        """Open the circuit if unhealthy (under ``_lock``)"""
+        if self._state is not CircuitState.closed:
+            return False
+        if len(self._outcomes) < self._policy.minimum_calls:
+            return False
+
+        error_rate, slow_call_rate = self._get_rates()
+        if (
+            error_rate >= self._policy.failure_rate_threshold
+            or slow_call_rate >= self._policy.slow_call_rate_threshold
+        ):
+            self._open()
+            return True
+        return False
+
+    def _open(self) -> None:
+        self._state = CircuitState.open
+        self._opened_at = self._updated_at = time.time()
+
+    def _close(self) -> None:
+        self._state = CircuitState.closed
+        self._updated_at = time.time()
+        self._outcomes.clear()
+
+    def _get_cache_key(self) -> str:
+        return f'anycoin:{CACHE_KEY_VERSION}:circuit:{self.name}'
+
+    async def _sync_to_cache(self) -> None:
+        if self._policy.cache is None:
+            return
+
+        with self._lock:
+            value = json.dumps({
+                'state': self._state.value,
+                'opened_at': self._opened_at,
+                'updated_at': self._updated_at,
+            })
+        await self._policy.cache.set(self._get_cache_key(), value)
+
+    async def _sync_from_cache(self) -> None:
+        if self._policy.cache is None:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            if now - self._synced_at < self._policy.cache_sync_interval:
+                return
+            self._synced_at = now
+
+        cached_value = await self._policy.cache.get(self._get_cache_key())
+        if not cached_value:
+            return
+
+        shared = json.loads(cached_value)
+        with self._lock:
+            if shared['updated_at'] <= self._updated_at:
+                return  # The local state is more recent
+
+            self._state = CircuitState(shared['state'])
+            self._opened_at = shared['opened_at']
+            self._updated_at = shared['updated_at']
+            if self._state is CircuitState.closed:
+                self._outcomes.clear()
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(name='{self.name}', "
+            f'state={self._state.value}, health_score={self.health_score:.2f})'
+        )
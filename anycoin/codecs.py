@@ -0,0 +1,248 @@
+import json
+import struct
+from abc import ABCMeta, abstractmethod
+from decimal import Decimal
+
+from .response_models import CoinQuotes
+
+# Decimal text (digits, '.', '-', 'E', '+') packed two chars per byte as-
+# hex nibbles; 'f' pads odd lengths
+_TO_NIBBLES = str.maketrans('.-E+', 'abcd')
+_FROM_NIBBLES = str.maketrans('abcd', '.-E+', 'f')
+
+
+class CacheCodec(metaclass=ABCMeta):
+    """
+    Interface for cache codecs
+
+    A cache codec turns the ``CoinQuotes`` cached by the API services into-
+    the value stored in the cache and back. ``fetched_at`` (a unix-
+    timestamp) is stored along with the quotes when the service needs it-
+    (stale-while-revalidate cache mode).
+
+    ``name`` is written in the cache keys, so that services using-
+    different codecs on one cache (e.g. during a rolling codec change)-
+    do not read each other's values. ``JSONCacheCodec`` has none and-
+    keeps the keys from before the codecs.
+    """
+
+    name: str | None = None
+    binary: bool = False
+
+    @abstractmethod
+    def encode(
+        self, coin_quotes: CoinQuotes, fetched_at: float | None = None
+    ) -> str | bytes:
+        """..."""
+
+    @abstractmethod
+    def decode(self, data: str | bytes) -> tuple[CoinQuotes, float | None]:
+        """..."""
+
+
+class JSONCacheCodec(CacheCodec):
+    """``CoinQuotes`` as JSON, including ``raw_data`` (default codec)"""
+
+    def encode(  # noqa: PLR6301
+        self, coin_quotes: CoinQuotes, fetched_at: float | None = None
+    ) -> str:
+        if fetched_at is None:
+            return coin_quotes.model_dump_json()
+
+        return (
+            f'{{"fetched_at": {fetched_at!r}, '
+            f'"coin_quotes": {coin_quotes.model_dump_json()}}}'
+        )
+
+    def decode(  # noqa: PLR6301
+        self, data: str
+    ) -> tuple[CoinQuotes, float | None]:
+        if not data.startswith('{"fetched_at"'):
+            return CoinQuotes.model_validate_json(data), None
+
+        envelope: dict = json.loads(data)
+        return (
+            CoinQuotes.model_validate(envelope['coin_quotes']),
+            envelope['fetched_at'],
+        )
+
+
+class CompactCacheCodec(CacheCodec):
+    """
+    Compact binary codec that stores only the normalized prices.
+
+    ``raw_data`` is dropped (decoded as ``{}``) unless-
+    ``include_raw_data=True``. Prices are stored as their decimal text-
+    packed in 4-bit nibbles, so every ``Decimal`` round-trips exactly.
+
+    Layout (little-endian)::
+
+        b'AC' version:u8 flags:u8 api_service:u8 [fetched_at:f64]
+        n_coins:u32 n_quotes:u16 symbols... prices... [raw_data]
+    """
+
+    name = 'compact'
+    binary = True
+
+    _MAGIC = b'AC'
+    _VERSION = 1
+    _FLAG_FETCHED_AT = 0b01
+    _FLAG_RAW_DATA = 0b10
+    _API_SERVICES = ('coinmarketcap', 'coingecko')
+
+    # First byte of a price
+    _PRICE_MISSING = 0xFF
+    _PRICE_TEXT = 0xFE  # Too long to pack: stored as plain text
+
+    def __init__(self, include_raw_data: bool = False) -> None:
+        self._include_raw_data = include_raw_data
+
+    def encode(
+        self, coin_quotes: CoinQuotes, fetched_at: float | None = None
+    ) -> bytes:
+        coins = list(coin_quotes.coins)
+        quotes_in = list({
+            quote: None
+            for coin_row in coin_quotes.coins.values()
+            for quote in coin_row.quotes
+        })
+
+        flags = 0
+        if fetched_at is not None:
+            flags |= self._FLAG_FETCHED_AT
+        if self._include_raw_data:
+            flags |= self._FLAG_RAW_DATA
+
+        buffer = bytearray(self._MAGIC)
+        buffer += struct.pack(
+            '<BBB',
+            self._VERSION,
+            flags,
+            self._API_SERVICES.index(coin_quotes.api_service),
+        )
+        if fetched_at is not None:
+            buffer += struct.pack('<d', fetched_at)
+
+        buffer += struct.pack('<IH', len(coins), len(quotes_in))
+        for symbol in coins + quotes_in:
+            value = symbol.value.encode('utf-8')
+            buffer += struct.pack('<B', len(value)) + value
+
+        for coin_row in coin_quotes.coins.values():
+            for quote in quotes_in:
+                quote_row = coin_row.quotes.get(quote)
+                self._encode_price(
+                    buffer, None if quote_row is None else quote_row.quote
+                )
+
+        if self._include_raw_data:
+            raw_data = json.dumps(
+                coin_quotes.raw_data, separators=(',', ':')
+            ).encode('utf-8')
+            buffer += struct.pack('<I', len(raw_data)) + raw_data
+
+        return bytes(buffer)
+
+    def decode(self, data: bytes) -> tuple[CoinQuotes, float | None]:
+        view = memoryview(data)
+        if bytes(view[:2]) != self._MAGIC:
+            raise ValueError('Invalid compact cache value')
+
+        version, flags, api_service_index = struct.unpack_from('<BBB', view, 2)
+        if version != self._VERSION:
+            raise ValueError(f'Unsupported compact cache version {version}')
+        offset = 5
+
+        fetched_at = None
+        if flags & self._FLAG_FETCHED_AT:
+            (fetched_at,) = struct.unpack_from('<d', view, offset)
+            offset += 8
+
+        n_coins, n_quotes = struct.unpack_from('<IH', view, offset)
+        offset += 6
+
+        coins, offset = self._decode_symbols(view, offset, n_coins)
+        quotes_in, offset = self._decode_symbols(view, offset, n_quotes)
+        coins_data, offset = self._decode_prices(
+            view, offset, coins, quotes_in
+        )
+
+        raw_data = {}
+        if flags & self._FLAG_RAW_DATA:
+            (length,) = struct.unpack_from('<I', view, offset)
+            offset += 4
+            raw_data = json.loads(bytes(view[offset : offset + length]))
+
+        # One validation of plain data is faster than constructing the-
+        # nested models one by one
+        coin_quotes = CoinQuotes.model_validate({
+            'coins': coins_data,
+            'api_service': self._API_SERVICES[api_service_index],
+            'raw_data': raw_data,
+        })
+        return coin_quotes, fetched_at
+
+    @staticmethod
+    def _decode_symbols(
+        view: memoryview, offset: int, count: int
+    ) -> tuple[list[str], int]:
+        symbols: list[str] = []
+        for _ in range(count):
+            length = view[offset]
+            value = bytes(view[offset + 1 : offset + 1 + length])
+            symbols.append(value.decode('utf-8'))
+            offset += 1 + length
+        return symbols, offset
+
+    @classmethod
+    def _decode_prices(
+        cls,
+        view: memoryview,
+        offset: int,
+        coins: list[str],
+        quotes_in: list[str],
+    ) -> tuple[dict[str, dict], int]:
+        coins_data: dict[str, dict] = {}
+        for coin in coins:
+            quotes: dict[str, dict] = {}
+            for quote in quotes_in:
+                price, offset = cls._decode_price(view, offset)
+                if price is not None:
+                    quotes[quote] = {'quote': price}
+            coins_data[coin] = {'quotes': quotes}
+        return coins_data, offset
+
+    @classmethod
+    def _encode_price(cls, buffer: bytearray, price: Decimal | None) -> None:
+        if price is None:
+            buffer.append(cls._PRICE_MISSING)
+            return
+
+        text = str(price)
+        if not price.is_finite() or len(text) > 2 * (cls._PRICE_TEXT - 1):
+            data = text.encode('ascii')
+            buffer += struct.pack('<BH', cls._PRICE_TEXT, len(data)) + data
+            return
+
+        if len(text) % 2:
+            text += 'f'
+        buffer.append(len(text) // 2)
+        buffer += bytes.fromhex(text.translate(_TO_NIBBLES))
+
+    @classmethod
+    def _decode_price(
+        cls, view: memoryview, offset: int
+    ) -> tuple[Decimal | None, int]:
+        tag = view[offset]
+        if tag == cls._PRICE_MISSING:
+            return None, offset + 1
+
+        if tag == cls._PRICE_TEXT:
+            (length,) = struct.unpack_from('<H', view, offset + 1)
+            start = offset + 3
+            text = bytes(view[start : start + length]).decode('ascii')
+            return Decimal(text), start + length
+
+        start = offset + 1
+        text = view[start : start + tag].hex().translate(_FROM_NIBBLES)
+        return Decimal(text), start + tag
@@ -4,16 +4,30 @@ class BaseAnyCoinException(Exception): ...
 class GetCoinQuotes(BaseAnyCoinException): ...
 
 
-class CoinNotSupportedCMC(BaseAnyCoinException): ...
+# Coin/quote (or method) not supported by a service: a client error-
+# raised before any request
+class NotSupported(BaseAnyCoinException): ...
 
 
-class QuoteCoinNotSupportedCMC(BaseAnyCoinException): ...
+class CoinNotSupportedCMC(NotSupported): ...
 
 
-class CoinNotSupportedCGK(BaseAnyCoinException): ...
+class QuoteCoinNotSupportedCMC(NotSupported): ...
 
 
-class QuoteCoinNotSupportedCGK(BaseAnyCoinException): ...
+class CoinNotSupportedCGK(NotSupported): ...
+
+
+class QuoteCoinNotSupportedCGK(NotSupported): ...
 
 
 class ConvertCoin(BaseAnyCoinException): ...
+
+
+class CircuitOpen(BaseAnyCoinException): ...
+
+
+class RateLimited(GetCoinQuotes): ...
+
+
+class GetOHLCV(BaseAnyCoinException): ...
@@ -0,0 +1,190 @@
+import statistics
+from collections import Counter, defaultdict, deque
+
+
+class Instrumentation:
+    """
+    Base class for metrics/tracing sinks. Every hook is a no-op; override-
+    the ones you need (e.g. to record OpenTelemetry spans or metrics) and-
+    pass the instance as ``instrumentation`` to the services and to-
+    ``AsyncAnyCoin``/``AnyCoin``.
+
+    ``service`` is the class name of the API service and durations are in-
+    seconds. Without instrumentation the hooks are never called, so it-
+    costs nothing.
+    """
+
+    def on_http_request(
+        self, service: str, duration: float, status_code: int | None
+    ) -> None:
+        """
+        An HTTP request to the API. ``status_code`` is None when no-
+        response was received
+        """
+
+    def on_service_call(
+        self, service: str, duration: float, error: Exception | None
+    ) -> None:
+        """
+        A ``get_coin_quotes`` or ``get_ohlcv`` call made by-
+        ``AsyncAnyCoin`` to a service
+        """
+
+    def on_failover(self, service: str, error: Exception) -> None:
+        """``AsyncAnyCoin`` moved on to the next service"""
+
+    def on_cache_hit(self, service: str, cache_key: str) -> None:
+        """..."""
+
+    def on_cache_miss(self, service: str, cache_key: str) -> None:
+        """..."""
+
+    def on_lock_wait(
+        self, service: str, cache_key: str, duration: float
+    ) -> None:
+        """Time spent waiting to acquire the ``RedLock`` of a cache key"""
+
+    def on_rate_limit_wait(self, service: str, duration: float) -> None:
+        """Time an API request waited for its turn in the rate limiter"""
+
+    def on_serialize(self, service: str, duration: float, size: int) -> None:
+        """A cache value was encoded (``size`` in bytes or characters)"""
+
+    def on_deserialize(self, service: str, duration: float) -> None:
+        """A cache value was decoded"""
+
+    def on_deserialize_error(
+        self, service: str, cache_key: str, error: Exception
+    ) -> None:
+        """
+        A cache value could not be decoded (e.g. written by another codec)-
+        and was taken as a miss
+        """
+
+
+class InMemoryCollector(Instrumentation):
+    """
+    Keeps the metrics in memory (the last ``max_samples`` durations of-
+    each kind per service) and summarizes them with ``summary()``.
+    """
+
+    def __init__(self, max_samples: int = 10_000) -> None:
+        self._max_samples = max_samples
+        self.reset()
+
+    def reset(self) -> None:
+        self.http_requests: defaultdict[str, deque[float]] = self._samples()
+        self.http_statuses: defaultdict[str, Counter[int | None]] = (
+            defaultdict(Counter)
+        )
+        self.service_calls: defaultdict[str, deque[float]] = self._samples()
+        self.service_errors: Counter[str] = Counter()
+        self.failovers: Counter[str] = Counter()
+        self.cache_hits: Counter[str] = Counter()
+        self.cache_misses: Counter[str] = Counter()
+        self.lock_waits: defaultdict[str, deque[float]] = self._samples()
+        self.rate_limit_waits: defaultdict[str, deque[float]] = self._samples()
+        self.serializations: defaultdict[str, deque[float]] = self._samples()
+        self.deserializations: defaultdict[str, deque[float]] = self._samples()
+        self.deserialization_errors: Counter[str] = Counter()
+
+    def _samples(self) -> defaultdict[str, deque[float]]:
+        return defaultdict(lambda: deque(maxlen=self._max_samples))
+
+    def on_http_request(
+        self, service: str, duration: float, status_code: int | None
+    ) -> None:
+        self.http_requests[service].append(duration)
+        self.http_statuses[service][status_code] += 1
+
+    def on_service_call(
+        self, service: str, duration: float, error: Exception | None
+    ) -> None:
+        self.service_calls[service].append(duration)
+        if error is not None:
+            self.service_errors[service] += 1
+
+    def on_failover(self, service: str, error: Exception) -> None:
+        self.failovers[service] += 1
+
+    def on_cache_hit(self, service: str, cache_key: str) -> None:
+        self.cache_hits[service] += 1
+
+    def on_cache_miss(self, service: str, cache_key: str) -> None:
+        self.cache_misses[service] += 1
+
+    def on_lock_wait(
+        self, service: str, cache_key: str, duration: float
+    ) -> None:
+        self.lock_waits[service].append(duration)
+
+    def on_rate_limit_wait(self, service: str, duration: float) -> None:
+        self.rate_limit_waits[service].append(duration)
+
+    def on_serialize(self, service: str, duration: float, size: int) -> None:
+        self.serializations[service].append(duration)
+
+    def on_deserialize(self, service: str, duration: float) -> None:
+        self.deserializations[service].append(duration)
+
+    def on_deserialize_error(
+        self, service: str, cache_key: str, error: Exception
+    ) -> None:
+        self.deserialization_errors[service] += 1
+
+    def summary(self) -> dict[str, dict]:
+        """Metrics per service (durations summarized in milliseconds)"""
+        services = (
+            set(self.http_requests)
+            | set(self.service_calls)
+            | set(self.failovers)
+            | set(self.cache_hits)
+            | set(self.cache_misses)
+            | set(self.lock_waits)
+            | set(self.rate_limit_waits)
+            | set(self.serializations)
+            | set(self.deserializations)
+            | set(self.deserialization_errors)
+        )
+
+        summary = {}
+        for service in sorted(services):
+            hits = self.cache_hits[service]
+            misses = self.cache_misses[service]
+            summary[service] = {
+                'http_requests': _summarize(self.http_requests[service]),
+                'http_statuses': {
+                    str(status_code): count
+                    for status_code, count in self.http_statuses[
+                        service
+                    ].items()
+                },
+                'service_calls': _summarize(self.service_calls[service]),
+                'service_errors': self.service_errors[service],
+                'failovers': self.failovers[service],
+                'cache_hits': hits,
+                'cache_misses': misses,
+                'cache_hit_rate': hits / (hits + misses) if hits else 0.0,
+                'lock_waits': _summarize(self.lock_waits[service]),
+                'rate_limit_waits': _summarize(self.rate_limit_waits[service]),
+                'serializations': _summarize(self.serializations[service]),
+                'deserializations': _summarize(self.deserializations[service]),
+                'deserialization_errors': self.deserialization_errors[service],
+            }
+        return summary
+
+
+def _summarize(durations: deque[float]) -> dict[str, float | int]:
+    if not durations:
+        return {'count': 0}
+
+    milliseconds = sorted(duration * 1000 for duration in durations)
+    return {
+        'count': len(milliseconds),
+        'mean_ms': statistics.fmean(milliseconds),
+        'p50_ms': milliseconds[len(milliseconds) // 2],
+        'p99_ms': milliseconds[
+            min(len(milliseconds) - 1, int(len(milliseconds) * 0.99))
+        ],
+        'max_ms': milliseconds[-1],
+    }
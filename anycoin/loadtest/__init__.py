@@ -0,0 +1,3 @@
+# ruff: noqa: F401
+from .runner import LoadTestResult, run, run_async, run_sync
+from .server import StubProviderConfig, StubProviderServer
@@ -0,0 +1,164 @@
+"""
+Load test of AsyncAnyCoin/AnyCoin against a local stand-in provider.
+
+A local HTTP server answers the CoinMarketCap and CoinGecko quote-
+endpoints (with the configured latency, error rate and rate limit) and-
+real services are pointed at it through ``base_url``, so no API credits-
+are used.
+
+Usage:
+    python -m anycoin.loadtest --users 50 --duration 10 --latency 0.05
+    python -m anycoin.loadtest --mode sync --services cmc cgk \\
+        --error-rate 0.1 --rate-limit 200 --burst 20 --json result.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+from functools import partial
+
+from ..cache import Cache
+from ..rate_limit import RateLimit, RateLimiter
+from ..services.base import RequestOptions
+from ..services.coingecko import CoinGeckoService
+from ..services.coinmarketcap import CoinMarketCapService
+from .runner import run
+from .server import StubProviderConfig, StubProviderServer
+
+
+def _create_services(
+    server: StubProviderServer,
+    names: list[str],
+    cache: str,
+    cache_ttl: int,
+    client_rate_limit: float | None = None,
+) -> list:
+    services = []
+    for name in names:
+        service_class, base_url = {
+            'cmc': (CoinMarketCapService, server.cmc_base_url),
+            'cgk': (CoinGeckoService, server.cgk_base_url),
+        }[name]
+        services.append(
+            service_class(
+                api_key='loadtest',
+                cache=Cache(Cache.MEMORY) if cache == 'memory' else None,
+                cache_ttl=cache_ttl,
+                base_url=base_url,
+                request_options=RequestOptions(
+                    rate_limiter=RateLimiter([
+                        RateLimit(requests=client_rate_limit, period=1)
+                    ])
+                    if client_rate_limit
+                    else None
+                ),
+            )
+        )
+    return services
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog='python -m anycoin.loadtest',
+        description=__doc__.split('\n')[1],
+    )
+    parser.add_argument(
+        '--mode', nargs='+', choices=['async', 'sync'], default=['async']
+    )
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument(
+        '--services', nargs='+', choices=['cmc', 'cgk'], default=['cmc']
+    )
+    parser.add_argument('--cache', choices=['none', 'memory'], default='none')
+    parser.add_argument('--cache-ttl', type=int, default=300)
+    parser.add_argument('--hedge-delay', type=float, default=None)
+    parser.add_argument('--batch-window', type=float, default=None)
+    parser.add_argument(
+        '--portals',
+        type=int,
+        default=1,
+        help='Event loop threads of the sync facade',
+    )
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--latency-jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument(
+        '--rate-limit', type=float, default=None, help='Requests per second'
+    )
+    parser.add_argument('--burst', type=int, default=1)
+    parser.add_argument(
+        '--client-rate-limit',
+        type=float,
+        default=None,
+        help='Requests per second each service paces itself to',
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='Write the results to this file')
+    parser.add_argument(
+        '--verbose',
+        action='store_true',
+        help='Show the tracebacks of the failed service requests',
+    )
+    args = parser.parse_args()
+
+    config = StubProviderConfig(
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        seed=args.seed,
+    )
+
+    results = []
+    with StubProviderServer(config) as server:
+        for mode in args.mode:
+            # Failover prints a traceback for every failed request
+            with (
+                contextlib.nullcontext()
+                if args.verbose
+                else contextlib.redirect_stderr(io.StringIO())
+            ):
+                result = run(
+                    mode,
+                    services_factory=partial(
+                        _create_services,
+                        server,
+                        args.services,
+                        args.cache,
+                        args.cache_ttl,
+                        args.client_rate_limit,
+                    ),
+                    users=args.users,
+                    duration=args.duration,
+                    seed=args.seed,
+                    hedge_delay=args.hedge_delay,
+                    batch_window=args.batch_window,
+                    **({'portals': args.portals} if mode == 'sync' else {}),
+                )
+            results.append(result)
+            print(result.format())
+
+        stats = server.stats
+        print(
+            f'provider: {stats.requests} requests, {stats.errors} errors, '
+            f'{stats.rate_limited} rate limited'
+        )
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(
+                {
+                    'config': vars(args),
+                    'results': [result.to_dict() for result in results],
+                    'provider': vars(stats),
+                },
+                file,
+                indent=2,
+            )
+
+
+if __name__ == '__main__':
+    main()
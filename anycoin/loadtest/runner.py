@@ -0,0 +1,226 @@
+import asyncio
+import bisect
+import random
+import statistics
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from .._enums import CoinSymbols, QuoteSymbols
+from .._interfaces.async_ import AsyncAnyCoin
+from .._interfaces.sync import AnyCoin
+from ..abc import APIService
+from ..exeptions import GetCoinQuotes as GetCoinQuotesException
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+# Coins and quotes the virtual users pick their requests from
+WORKLOAD_COINS = [
+    CoinSymbols.btc,
+    CoinSymbols.eth,
+    CoinSymbols.ltc,
+    CoinSymbols.sol,
+    CoinSymbols.usdt,
+]
+WORKLOAD_QUOTES = [QuoteSymbols.usd, QuoteSymbols.eur]
+
+
+@dataclass
+class LoadTestResult:
+    """Outcome of a load test run (latencies in seconds)"""
+
+    mode: str
+    users: int
+    duration: float
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies) + self.errors
+
+    @property
+    def throughput(self) -> float:
+        """Successful requests per second"""
+        return len(self.latencies) / self.duration if self.duration else 0.0
+
+    def percentile(self, percent: float) -> float:
+        if not self.latencies:
+            return 0.0
+        if len(self.latencies) == 1:
+            return self.latencies[0]
+        return statistics.quantiles(self.latencies, n=100, method='inclusive')[
+            min(98, max(0, round(percent) - 1))
+        ]
+
+    def histogram(self) -> list[tuple[str, int]]:
+        """(bucket label, count) of the latencies"""
+        counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        for latency in self.latencies:
+            counts[
+                bisect.bisect_left(HISTOGRAM_BUCKETS_MS, latency * 1000)
+            ] += 1
+
+        labels = [f'<= {bound} ms' for bound in HISTOGRAM_BUCKETS_MS]
+        labels.append(f'> {HISTOGRAM_BUCKETS_MS[-1]} ms')
+        return list(zip(labels, counts))
+
+    def to_dict(self) -> dict:
+        return {
+            'mode': self.mode,
+            'users': self.users,
+            'duration': round(self.duration, 3),
+            'requests': self.requests,
+            'errors': self.errors,
+            'throughput': round(self.throughput, 2),
+            'latency_ms': {
+                'p50': round(self.percentile(50) * 1000, 3),
+                'p90': round(self.percentile(90) * 1000, 3),
+                'p99': round(self.percentile(99) * 1000, 3),
+                'max': round(max(self.latencies, default=0.0) * 1000, 3),
+            },
+            'histogram': dict(self.histogram()),
+        }
+
+    def format(self) -> str:
+        data = self.to_dict()
+        latency = data['latency_ms']
+        lines = [
+            f'[{self.mode}] {self.users} users, {data["duration"]} s: '
+            f'{data["requests"]} requests, {self.errors} errors, '
+            f'{data["throughput"]} req/s',
+            f'  latency p50 {latency["p50"]} ms, p90 {latency["p90"]} ms, '
+            f'p99 {latency["p99"]} ms, max {latency["max"]} ms',
+        ]
+
+        histogram = self.histogram()
+        largest = max((count for _, count in histogram), default=0) or 1
+        for label, count in histogram:
+            if count:
+                bar = '#' * max(1, round(count / largest * 40))
+                lines.append(f'  {label:>11} {count:>8} {bar}')
+        return '\n'.join(lines)
+
+
+def _get_request(
+    rand: random.Random,
+) -> tuple[list[CoinSymbols], list[QuoteSymbols]]:
+    coins = rand.sample(WORKLOAD_COINS, rand.randint(1, 3))
+    quotes_in = rand.sample(WORKLOAD_QUOTES, rand.randint(1, 2))
+    return coins, quotes_in
+
+
+async def run_async(
+    api_services: list[APIService],
+    users: int,
+    duration: float,
+    seed: int = 0,
+    **anycoin_kwargs,
+) -> LoadTestResult:
+    """``users`` concurrent tasks calling ``AsyncAnyCoin`` for ``duration``"""
+    result = LoadTestResult(mode='async', users=users, duration=duration)
+
+    async with AsyncAnyCoin(
+        api_services=api_services, **anycoin_kwargs
+    ) as anycoin:
+
+        async def user(index: int) -> None:
+            rand = random.Random(seed + index)
+            while time.monotonic() < deadline:
+                coins, quotes_in = _get_request(rand)
+                start = time.perf_counter()
+                try:
+                    await anycoin.get_coin_quotes(
+                        coins=coins, quotes_in=quotes_in
+                    )
+                except GetCoinQuotesException:
+                    result.errors += 1
+                else:
+                    result.latencies.append(time.perf_counter() - start)
+
+        start = time.monotonic()
+        deadline = start + duration
+        await asyncio.gather(*(user(index) for index in range(users)))
+        result.duration = time.monotonic() - start
+
+    return result
+
+
+def run_sync(
+    api_services: list[APIService],
+    users: int,
+    duration: float,
+    seed: int = 0,
+    **anycoin_kwargs,
+) -> LoadTestResult:
+    """``users`` threads calling ``AnyCoin`` for ``duration`` seconds"""
+    result = LoadTestResult(mode='sync', users=users, duration=duration)
+    lock = threading.Lock()
+
+    with AnyCoin(api_services=api_services, **anycoin_kwargs) as anycoin:
+
+        def user(index: int) -> None:
+            rand = random.Random(seed + index)
+            while time.monotonic() < deadline:
+                coins, quotes_in = _get_request(rand)
+                start = time.perf_counter()
+                try:
+                    anycoin.get_coin_quotes(coins=coins, quotes_in=quotes_in)
+                except GetCoinQuotesException:
+                    with lock:
+                        result.errors += 1
+                else:
+                    latency = time.perf_counter() - start
+                    with lock:
+                        result.latencies.append(latency)
+
+        threads = [
+            threading.Thread(target=user, args=(index,))
+            for index in range(users)
+        ]
+        start = time.monotonic()
+        deadline = start + duration
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        result.duration = time.monotonic() - start
+
+    return result
+
+
+def run(
+    mode: str,
+    services_factory: Callable[[], list[APIService]],
+    users: int,
+    duration: float,
+    seed: int = 0,
+    **anycoin_kwargs,
+) -> LoadTestResult:
+    """
+    Run one load test. ``services_factory`` creates new services for the-
+    run, since services are bound to the event loop they are used on.
+    """
+    if mode == 'async':
+        return asyncio.run(
+            run_async(
+                services_factory(),
+                users=users,
+                duration=duration,
+                seed=seed,
+                **anycoin_kwargs,
+            )
+        )
+
+    if mode == 'sync':
+        return run_sync(
+            services_factory(),
+            users=users,
+            duration=duration,
+            seed=seed,
+            **anycoin_kwargs,
+        )
+
+    raise ValueError(f'Unknown mode {mode!r}')
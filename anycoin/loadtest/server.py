@@ -0,0 +1,252 @@
+import json
+import random
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+CMC_QUOTES_PATH = '/v2/cryptocurrency/quotes/latest'
+CGK_PRICE_PATH = '/api/v3/simple/price'
+
+# CoinMarketCap status.error_code of a rate-limited request
+CMC_RATE_LIMIT_ERROR_CODE = 1008
+
+
+@dataclass
+class StubProviderConfig:
+    """
+    Behaviour of the stand-in provider.
+
+    Each response waits ``latency`` seconds (plus a random-
+    ``latency_jitter``), ``error_rate`` of the requests fail with a 500-
+    and, with ``rate_limit`` set, requests over ``rate_limit`` per second-
+    (with bursts of up to ``burst`` requests) get a 429 with a-
+    ``Retry-After`` header.
+    """
+
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    error_rate: float = 0.0
+    rate_limit: float | None = None
+    burst: int = 1
+    seed: int | None = None
+
+
+@dataclass
+class StubProviderStats:
+    requests: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, capacity: int) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """0 if a token was taken, otherwise the seconds until the next one"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity,
+                self._tokens + (now - self._updated_at) * self._rate,
+            )
+            self._updated_at = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self._rate
+
+
+def _get_price(coin_id: str, quote_id: str) -> float:
+    """Stable fake price of a coin/quote pair"""
+    return zlib.crc32(f'{coin_id}:{quote_id}'.encode()) % 100_000 / 7 + 0.01
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real APIs
+    # Headers and body are separate writes: don't let Nagle's algorithm-
+    # hold the body back for the client's delayed ACK
+    disable_nagle_algorithm = True
+    server: 'StubProviderServer'
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        params = {
+            key: values[0] for key, values in parse_qs(url.query).items()
+        }
+        if url.path not in {CMC_QUOTES_PATH, CGK_PRICE_PATH}:
+            self._send_json(HTTPStatus.NOT_FOUND, {'error': 'Not found'})
+            return
+
+        is_cmc = url.path == CMC_QUOTES_PATH
+        status, body, headers = self.server.handle_quotes(is_cmc, params)
+        self._send_json(status, body, headers)
+
+    def _send_json(
+        self, status: int, body: dict, headers: dict | None = None
+    ) -> None:
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        pass  # Keep the load test output readable
+
+
+class StubProviderServer(ThreadingHTTPServer):
+    """
+    Local HTTP stand-in for the CoinMarketCap and CoinGecko APIs.
+
+    It answers ``/v2/cryptocurrency/quotes/latest`` (CoinMarketCap) and-
+    ``/api/v3/simple/price`` (CoinGecko) in their formats, with a price for-
+    every requested coin/quote, and runs in a background thread:
+
+    >>> with StubProviderServer(StubProviderConfig(latency=0.05)) as server:
+    ...     service = CoinMarketCapService(
+    ...         api_key='test', base_url=server.cmc_base_url
+    ...     )
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        config: StubProviderConfig | None = None,
+        host: str = '127.0.0.1',
+        port: int = 0,
+    ) -> None:
+        super().__init__((host, port), _Handler)
+        self.config = config or StubProviderConfig()
+        self.stats = StubProviderStats()
+        self._stats_lock = threading.Lock()
+        self._random = random.Random(self.config.seed)
+        self._bucket = None
+        if self.config.rate_limit is not None:
+            self._bucket = _TokenBucket(
+                self.config.rate_limit, self.config.burst
+            )
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def cmc_base_url(self) -> str:
+        return f'{self.url}/v2'
+
+    @property
+    def cgk_base_url(self) -> str:
+        return f'{self.url}/api/v3'
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'StubProviderServer':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def handle_quotes(
+        self, is_cmc: bool, params: dict[str, str]
+    ) -> tuple[int, dict, dict]:
+        """Status, body and headers of a quotes request"""
+        with self._stats_lock:
+            self.stats.requests += 1
+            failed = self._random.random() < self.config.error_rate
+            jitter = self._random.uniform(0, self.config.latency_jitter)
+
+        retry_after = self._bucket.acquire() if self._bucket else 0.0
+        if retry_after:
+            with self._stats_lock:
+                self.stats.rate_limited += 1
+            return (
+                HTTPStatus.TOO_MANY_REQUESTS,
+                self._error_body(
+                    CMC_RATE_LIMIT_ERROR_CODE
+                    if is_cmc
+                    else HTTPStatus.TOO_MANY_REQUESTS,
+                    'Rate limit exceeded',
+                ),
+                {'Retry-After': str(max(1, round(retry_after)))},
+            )
+
+        time.sleep(self.config.latency + jitter)
+
+        if failed:
+            with self._stats_lock:
+                self.stats.errors += 1
+            return (
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                self._error_body(
+                    HTTPStatus.INTERNAL_SERVER_ERROR,
+                    'Internal server error',
+                ),
+                {},
+            )
+
+        if is_cmc:
+            return HTTPStatus.OK, self._cmc_body(params), {}
+        return HTTPStatus.OK, self._cgk_body(params), {}
+
+    @staticmethod
+    def _cmc_body(params: dict[str, str]) -> dict:
+        coin_ids = params.get('id', '').split(',')
+        convert_ids = params.get('convert_id', '').split(',')
+        return {
+            'status': {'error_code': 0, 'error_message': None},
+            'data': {
+                coin_id: {
+                    'id': int(coin_id),
+                    'quote': {
+                        convert_id: {'price': _get_price(coin_id, convert_id)}
+                        for convert_id in convert_ids
+                    },
+                }
+                for coin_id in coin_ids
+            },
+        }
+
+    @staticmethod
+    def _cgk_body(params: dict[str, str]) -> dict:
+        coin_ids = params.get('ids', '').split(',')
+        vs_currencies = params.get('vs_currencies', '').split(',')
+        return {
+            coin_id: {
+                currency: _get_price(coin_id, currency)
+                for currency in vs_currencies
+            }
+            for coin_id in coin_ids
+        }
+
+    @staticmethod
+    def _error_body(error_code: int, message: str) -> dict:
+        # Both APIs report errors in a "status" object
+        return {
+            'status': {'error_code': int(error_code), 'error_message': message}
+        }
@@ -0,0 +1,333 @@
+import atexit
+import os
+import sqlite3
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from ._enums import CoinSymbols, QuoteSymbols
+from .response_models import CoinQuotes, CoinRow, QuoteRow
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS quotes (
+        coin TEXT NOT NULL,
+        quote TEXT NOT NULL,
+        time REAL NOT NULL,
+        price TEXT NOT NULL,
+        api_service TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS quotes_coin_quote_time
+    ON quotes (coin, quote, time)
+    """,
+)
+
+
+@dataclass(frozen=True)
+class StoredPrice:
+    time: float  # Unix seconds
+    price: Decimal
+    api_service: str
+
+
+class QuoteStore:
+    """
+    Persistent history of the coin quotes, in a SQLite database indexed-
+    on (coin, quote, time). Pass it as ``quote_store`` to-
+    ``AsyncAnyCoin``/``AnyCoin`` to record every ``get_coin_quotes``-
+    result and to answer the calls whose prices are all newer than-
+    ``max_age`` seconds from the store (also after a restart).
+
+    ``get_price``/``get_prices`` answer point-in-time and range queries.
+
+    Writes are buffered and inserted by a background thread in-
+    transactions of up to ``batch_size`` rows, at least every-
+    ``flush_interval`` seconds, so recording a result costs a list-
+    append. ``flush()`` writes the buffer now; ``close()`` (also run at-
+    exit) writes it and closes the database.
+
+    The latest price of each pair is also kept in memory, so the cache-
+    lookups of ``get_coin_quotes`` only read the database for pairs not-
+    seen since the start of the process (see ``is_loaded``; a closed-
+    store only answers from memory).
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike = ':memory:',
+        max_age: float | None = 60,
+        batch_size: int = 1000,
+        flush_interval: float = 1.0,
+    ) -> None:
+        self._max_age = max_age
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._db_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        with self._db_lock:
+            if path != ':memory:':
+                self._connection.execute('PRAGMA journal_mode=WAL')
+                self._connection.execute('PRAGMA synchronous=NORMAL')
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+
+        # (coin, quote) -> latest price, including the buffered ones
+        self._latest: dict[tuple[str, str], StoredPrice] = {}
+        self._pending: list[tuple[str, str, float, str, str]] = []
+        self._condition = threading.Condition()
+        self._writer: threading.Thread | None = None
+        self._closed = False
+
+    def add(self, coin_quotes: CoinQuotes, at: float | None = None) -> None:
+        """Record the prices of ``coin_quotes`` (at ``at``, default now)"""
+        at = time.time() if at is None else at
+        api_service = coin_quotes.api_service
+        prices = [
+            (coin.value, quote.value, quote_row.quote)
+            for coin, coin_row in coin_quotes.coins.items()
+            for quote, quote_row in coin_row.quotes.items()
+        ]
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('QuoteStore is closed')
+
+            for coin, quote, price in prices:
+                latest = self._latest.get((coin, quote))
+                if latest is None or latest.time <= at:
+                    self._latest[coin, quote] = StoredPrice(
+                        time=at, price=price, api_service=api_service
+                    )
+
+            self._pending.extend(
+                (coin, quote, at, str(price), api_service)
+                for coin, quote, price in prices
+            )
+            if self._writer is None:
+                self._start_writer()
+            elif len(self._pending) >= self._batch_size:
+                self._condition.notify()
+
+    def get_coin_quotes(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+        max_age: float | None = None,
+    ) -> CoinQuotes | None:
+        """
+        The latest stored prices as a ``CoinQuotes`` (with an empty-
+        ``raw_data`` and the time of the oldest price as ``fetched_at``),-
+        or None if a price is missing or older than ``max_age`` (the-
+        store's ``max_age`` by default), or if the latest prices come-
+        from different services
+        """
+        max_age = self._max_age if max_age is None else max_age
+        oldest = None if max_age is None else time.time() - max_age
+
+        coins_data: dict[CoinSymbols, CoinRow] = {}
+        api_service = None
+        fetched_at = None
+        for coin in coins:
+            quotes: dict[QuoteSymbols, QuoteRow] = {}
+            for quote in quotes_in:
+                latest = self._get_latest(coin.value, quote.value)
+                if latest is None or (
+                    oldest is not None and latest.time < oldest
+                ):
+                    return None
+
+                api_service = api_service or latest.api_service
+                if latest.api_service != api_service:
+                    return None
+
+                quotes[quote] = QuoteRow(quote=latest.price)
+                if fetched_at is None or latest.time < fetched_at:
+                    fetched_at = latest.time
+            coins_data[coin] = CoinRow(quotes=quotes)
+
+        if api_service is None:
+            return None
+
+        return CoinQuotes(
+            coins=coins_data,
+            api_service=api_service,
+            raw_data={},
+            fetched_at=fetched_at,
+        )
+
+    def is_loaded(
+        self, coins: list[CoinSymbols], quotes_in: list[QuoteSymbols]
+    ) -> bool:
+        """
+        Whether ``get_coin_quotes`` answers from memory, without reading-
+        the database (so ``AsyncAnyCoin`` reads it in a worker thread-
+        otherwise)
+        """
+        if self._closed:
+            return True
+        return all(
+            (coin.value, quote.value) in self._latest
+            for coin in coins
+            for quote in quotes_in
+        )
+
+    def get_price(
+        self,
+        coin: CoinSymbols,
+        quote: QuoteSymbols,
+        at: datetime | float,
+    ) -> StoredPrice | None:
+        """Price of ``coin`` in ``quote`` at ``at`` (the last one before)"""
+        self.flush()
+        with self._db_lock:
+            row = self._connection.execute(
+                'SELECT time, price, api_service FROM quotes '
+                'WHERE coin = ? AND quote = ? AND time <= ? '
+                'ORDER BY time DESC LIMIT 1',
+                (coin.value, quote.value, _get_timestamp(at)),
+            ).fetchone()
+        return None if row is None else _to_stored_price(row)
+
+    def get_prices(
+        self,
+        coin: CoinSymbols,
+        quote: QuoteSymbols,
+        start: datetime | float,
+        end: datetime | float,
+    ) -> list[StoredPrice]:
+        """Prices of ``coin`` in ``quote`` from ``start`` to ``end``"""
+        self.flush()
+        with self._db_lock:
+            rows = self._connection.execute(
+                'SELECT time, price, api_service FROM quotes '
+                'WHERE coin = ? AND quote = ? AND time BETWEEN ? AND ? '
+                'ORDER BY time',
+                (
+                    coin.value,
+                    quote.value,
+                    _get_timestamp(start),
+                    _get_timestamp(end),
+                ),
+            ).fetchall()
+        return [_to_stored_price(row) for row in rows]
+
+    def flush(self) -> None:
+        """
+        Write the buffered prices to the database, after the batch the-
+        writer thread may be inserting
+        """
+        # Held from taking the rows to their commit, so that a flush-
+        # (and the queries after it) waits for an in-flight batch
+        with self._flush_lock:
+            with self._condition:
+                rows, self._pending = self._pending, []
+            if not rows:
+                return
+
+            with self._db_lock:
+                self._connection.execute('BEGIN')
+                try:
+                    self._connection.executemany(
+                        'INSERT INTO quotes VALUES (?, ?, ?, ?, ?)', rows
+                    )
+                except BaseException:
+                    self._connection.execute('ROLLBACK')
+                    raise
+                self._connection.execute('COMMIT')
+
+    def close(self) -> None:
+        """Write the buffered prices and close the database"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+            writer = self._writer
+
+        if writer is not None:
+            writer.join()
+            atexit.unregister(self.close)
+        self.flush()
+        with self._db_lock:
+            self._connection.close()
+
+    def __enter__(self) -> 'QuoteStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _get_latest(self, coin: str, quote: str) -> StoredPrice | None:
+        latest = self._latest.get((coin, quote))
+        if latest is not None:
+            return latest
+
+        # Not seen by this process: the database may have it
+        with self._db_lock:
+            if self._closed:
+                return None
+            row = self._connection.execute(
+                'SELECT time, price, api_service FROM quotes '
+                'WHERE coin = ? AND quote = ? ORDER BY time DESC LIMIT 1',
+                (coin, quote),
+            ).fetchone()
+        if row is None:
+            return None
+
+        return self._latest.setdefault((coin, quote), _to_stored_price(row))
+
+    def _start_writer(self) -> None:
+        self._writer = threading.Thread(
+            target=self._write_in_background,
+            name='anycoin-quote-store',
+            daemon=True,
+        )
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _write_in_background(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: (
+                        self._closed or len(self._pending) >= self._batch_size
+                    ),
+                    timeout=self._flush_interval,
+                )
+                closed = self._closed
+
+            try:
+                self.flush()
+            except Exception:  # The prices of this batch are lost
+                traceback.print_exc()
+
+            if closed:
+                return
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(max_age={self._max_age})'
+
+
+def _get_timestamp(value: datetime | float) -> float:
+    """Unix seconds of a datetime (naive datetimes are taken as UTC)"""
+    if not isinstance(value, datetime):
+        return float(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _to_stored_price(row: tuple[float, str, str]) -> StoredPrice:
+    time_, price, api_service = row
+    return StoredPrice(
+        time=time_, price=Decimal(price), api_service=api_service
+    )
@@ -0,0 +1,228 @@
+import threading
+import time
+from collections import deque
+from decimal import Decimal
+
+from ._enums import CoinSymbols, QuoteSymbols
+from .exeptions import ConvertCoin as ConvertCoinException
+from .response_models import CoinQuotes
+
+Symbol = CoinSymbols | QuoteSymbols
+
+# Pivots fetched when no price links the two sides of a conversion
+PIVOT_QUOTE = QuoteSymbols.usd
+PIVOT_COIN = CoinSymbols.usdt
+
+# (price, multiply) steps of a conversion; divide when multiply is False
+_Path = list[tuple[Decimal, bool]]
+
+
+class RateGraph:
+    """
+    Coin prices as a graph whose edges are the coin/quote prices: a-
+    conversion follows the shortest chain of prices between the two-
+    symbols (e.g. btc -> usd -> eth), so any pair linked by known prices-
+    is converted without a request.
+
+    With ``max_age`` set the prices older than ``max_age`` seconds are-
+    ignored; the age of a price counts from its ``fetched_at`` (e.g. a-
+    cached price is as old as its fetch), from ``add`` if unknown.-
+    ``get_missing`` and ``convert`` take the ``now`` (a-
+    ``time.monotonic()`` value) the ages are computed at, so that prices-
+    checked by one do not expire before the other.
+
+    The graph can be shared by several event loops (``AnyCoin`` with-
+    ``portals``): it is read and changed under a thread lock.
+    """
+
+    def __init__(self, max_age: float | None = None) -> None:
+        self._max_age = max_age
+        self._lock = threading.Lock()
+        # coin -> quote -> (price, added at) and the other way round
+        self._quotes: dict[
+            CoinSymbols, dict[QuoteSymbols, tuple[Decimal, float]]
+        ] = {}
+        self._coins: dict[
+            QuoteSymbols, dict[CoinSymbols, tuple[Decimal, float]]
+        ] = {}
+
+    def add(self, coin_quotes: CoinQuotes) -> None:
+        """Add (or replace) the prices of a ``get_coin_quotes`` result"""
+        added_at = time.monotonic()
+        if coin_quotes.fetched_at is not None:
+            added_at -= max(0.0, time.time() - coin_quotes.fetched_at)
+
+        with self._lock:
+            for coin, coin_row in coin_quotes.coins.items():
+                quotes = self._quotes.setdefault(coin, {})
+                for quote, quote_row in coin_row.quotes.items():
+                    quotes[quote] = self._coins.setdefault(quote, {})[coin] = (
+                        quote_row.quote,
+                        added_at,
+                    )
+
+    def convert(
+        self,
+        amount: int | float | Decimal,
+        from_coin: Symbol,
+        to_coin: Symbol,
+        now: float | None = None,
+    ) -> Decimal:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            path = self._find_path(from_coin, to_coin, now)
+        if path is None:
+            raise ConvertCoinException(
+                f'No rate from {from_coin} to {to_coin}'
+            )
+
+        result = Decimal(str(amount))
+        for price, multiply in path:
+            result = result * price if multiply else result / price
+        return result
+
+    def get_missing(
+        self,
+        conversions: list[tuple[Symbol, Symbol]],
+        now: float | None = None,
+    ) -> tuple[list[CoinSymbols], list[QuoteSymbols]]:
+        """
+        Coins and quotes to fetch (in one ``get_coin_quotes`` call) so-
+        that every ``(from_coin, to_coin)`` conversion has a rate.
+
+        The pivot of coin to coin and quote to quote conversions is a-
+        quote or coin that already has prices (or is already fetched for-
+        another conversion), ``PIVOT_QUOTE``/``PIVOT_COIN`` otherwise.
+        """
+        for from_coin, to_coin in conversions:
+            _check_conversion(from_coin, to_coin)
+
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return self._get_missing(conversions, now)
+
+    def _get_missing(
+        self, conversions: list[tuple[Symbol, Symbol]], now: float
+    ) -> tuple[list[CoinSymbols], list[QuoteSymbols]]:
+        coins: dict[CoinSymbols, None] = {}
+        quotes_in: dict[QuoteSymbols, None] = {}
+
+        for from_coin, to_coin in conversions:
+            if self._find_path(from_coin, to_coin, now) is not None:
+                continue
+
+            if isinstance(from_coin, CoinSymbols) and isinstance(
+                to_coin, QuoteSymbols
+            ):
+                coins[from_coin] = quotes_in[to_coin] = None
+
+            elif isinstance(from_coin, QuoteSymbols) and isinstance(
+                to_coin, CoinSymbols
+            ):
+                coins[to_coin] = quotes_in[from_coin] = None
+
+            elif isinstance(from_coin, CoinSymbols):
+                pivot = self._get_pivot_quote(
+                    from_coin, to_coin, quotes_in, now
+                )
+                coins[from_coin] = coins[to_coin] = quotes_in[pivot] = None
+
+            else:
+                pivot = self._get_pivot_coin(from_coin, to_coin, coins, now)
+                coins[pivot] = quotes_in[from_coin] = quotes_in[to_coin] = None
+
+        return list(coins), list(quotes_in)
+
+    def _get_pivot_quote(
+        self,
+        from_coin: CoinSymbols,
+        to_coin: CoinSymbols,
+        planned: dict[QuoteSymbols, None],
+        now: float,
+    ) -> QuoteSymbols:
+        priced = [
+            quote
+            for coin in (from_coin, to_coin)
+            for quote, (_, added_at) in self._quotes.get(coin, {}).items()
+            if self._is_fresh(added_at, now)
+        ]
+        if PIVOT_QUOTE in priced:
+            return PIVOT_QUOTE
+        return next(iter(priced), next(iter(planned), PIVOT_QUOTE))
+
+    def _get_pivot_coin(
+        self,
+        from_coin: QuoteSymbols,
+        to_coin: QuoteSymbols,
+        planned: dict[CoinSymbols, None],
+        now: float,
+    ) -> CoinSymbols:
+        priced = [
+            coin
+            for quote in (from_coin, to_coin)
+            for coin, (_, added_at) in self._coins.get(quote, {}).items()
+            if self._is_fresh(added_at, now)
+        ]
+        if PIVOT_COIN in priced:
+            return PIVOT_COIN
+        return next(iter(priced), next(iter(planned), PIVOT_COIN))
+
+    def _find_path(
+        self, from_coin: Symbol, to_coin: Symbol, now: float
+    ) -> _Path | None:
+        """
+        Breadth-first search (fewest prices, least rounding), under-
+        ``_lock``
+        """
+        if from_coin == to_coin:
+            return []
+
+        previous: dict[Symbol, tuple[Symbol, Decimal, bool] | None] = {
+            from_coin: None
+        }
+        queue = deque([from_coin])
+        while queue:
+            symbol = queue.popleft()
+            if isinstance(symbol, CoinSymbols):
+                # coin -> quote multiplies by the price of the coin
+                edges, multiply = self._quotes.get(symbol, {}), True
+            else:
+                edges, multiply = self._coins.get(symbol, {}), False
+
+            for neighbour, (price, added_at) in edges.items():
+                if neighbour in previous or not self._is_fresh(added_at, now):
+                    continue
+
+                previous[neighbour] = (symbol, price, multiply)
+                if neighbour == to_coin:
+                    return self._build_path(previous, to_coin)
+                queue.append(neighbour)
+
+        return None
+
+    @staticmethod
+    def _build_path(
+        previous: dict[Symbol, tuple[Symbol, Decimal, bool] | None],
+        to_coin: Symbol,
+    ) -> _Path:
+        path = []
+        step = previous[to_coin]
+        while step is not None:
+            symbol, price, multiply = step
+            path.append((price, multiply))
+            step = previous[symbol]
+        path.reverse()
+        return path
+
+    def _is_fresh(self, added_at: float, now: float) -> bool:
+        return self._max_age is None or now - added_at <= self._max_age
+
+
+def _check_conversion(from_coin: Symbol, to_coin: Symbol) -> None:
+    if not (
+        isinstance(from_coin, (CoinSymbols, QuoteSymbols))
+        and isinstance(to_coin, (CoinSymbols, QuoteSymbols))
+    ):
+        raise ConvertCoinException(
+            f'Invalid conversion from {from_coin} to {to_coin}'
+        )
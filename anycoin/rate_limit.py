@@ -0,0 +1,138 @@
+import threading
+import time
+from dataclasses import dataclass
+
+import anyio
+
+from .exeptions import RateLimited as RateLimitedException
+
+
+@dataclass
+class RateLimit:
+    """
+    ``requests`` per ``period`` seconds (e.g. ``RateLimit(30, 60)`` for-
+    30 requests per minute), spaced evenly unless ``burst`` allows that-
+    many requests back to back.
+    """
+
+    requests: float
+    period: float = 60
+    burst: int = 1
+
+    @property
+    def interval(self) -> float:
+        return self.period / self.requests
+
+
+class RateLimiter:
+    """
+    Token-bucket scheduler of the requests of a service (or of several-
+    services sharing an API key): each request waits, in arrival order,-
+    until every limit allows it, so a burst of calls is paced instead of-
+    being answered with HTTP 429.
+
+    A 429 response pauses the requests for its ``Retry-After`` seconds.
+
+    ``queue_depth`` is the number of requests waiting; with ``max_queue``-
+    set, a request arriving at a full queue raises ``RateLimited`` (a-
+    ``GetCoinQuotes`` error, so ``AnyCoin`` fails over to the next-
+    service) instead of waiting.
+
+    The state is kept with a thread lock and no awaits, so one limiter-
+    can be used from several event loops (``AnyCoin`` portals).
+    """
+
+    def __init__(
+        self, limits: list[RateLimit], max_queue: int | None = None
+    ) -> None:
+        if not limits:
+            raise ValueError('At least one rate limit is required')
+
+        self._limits = limits
+        self._max_queue = max_queue
+        self._lock = threading.Lock()
+        # Theoretical arrival time of the next request of each limit (GCRA)
+        self._next_at = [float('-inf')] * len(limits)
+        self._paused_until = float('-inf')
+        self._queue_depth = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Requests waiting for their turn"""
+        return self._queue_depth
+
+    def get_delay(self) -> float:
+        """Seconds a request made now would wait"""
+        with self._lock:
+            now = time.monotonic()
+            return max(0.0, self._get_slot(now) - now)
+
+    async def acquire(self) -> float:
+        """Wait for the turn of a request; returns the seconds waited"""
+        start = time.monotonic()
+        with self._lock:
+            next_at = list(self._next_at)
+            delay = self._reserve(start)
+            if delay:
+                if (
+                    self._max_queue is not None
+                    and self._queue_depth >= self._max_queue
+                ):
+                    self._next_at = next_at  # Give the slot back
+                    raise RateLimitedException(
+                        f'Rate limiter queue is full ({self._max_queue})'
+                    )
+                self._queue_depth += 1
+
+        if not delay:
+            return 0.0
+
+        try:
+            while delay:
+                await anyio.sleep(delay)
+                # A 429 may have paused the requests in the meantime: wait
+                # for its end, keeping the slot already reserved
+                with self._lock:
+                    delay = max(0.0, self._paused_until - time.monotonic())
+        except BaseException:
+            # Cancelled (or failed) before the request: give the slot back
+            with self._lock:
+                self._release()
+            raise
+        finally:
+            with self._lock:
+                self._queue_depth -= 1
+
+        return time.monotonic() - start
+
+    def pause(self, retry_after: float | None) -> None:
+        """
+        Pause the requests for ``retry_after`` seconds (one interval of-
+        the shortest limit if the API did not say)
+        """
+        if retry_after is None:
+            retry_after = min(limit.interval for limit in self._limits)
+
+        with self._lock:
+            self._paused_until = max(
+                self._paused_until, time.monotonic() + retry_after
+            )
+
+    def _get_slot(self, now: float) -> float:
+        slot = max(now, self._paused_until)
+        for limit, next_at in zip(self._limits, self._next_at):
+            slot = max(slot, next_at - (limit.burst - 1) * limit.interval)
+        return slot
+
+    def _reserve(self, now: float) -> float:
+        slot = self._get_slot(now)
+        for index, limit in enumerate(self._limits):
+            self._next_at[index] = (
+                max(self._next_at[index], slot) + limit.interval
+            )
+        return max(0.0, slot - now)
+
+    def _release(self) -> None:
+        """Give back the last slot of every limit (under ``_lock``)"""
+        for index, limit in enumerate(self._limits):
+            self._next_at[index] -= limit.interval
@@ -1,9 +1,24 @@
+import importlib
+import json
+from datetime import datetime
 from decimal import Decimal
-from typing import Literal
+from typing import Any, Iterable, Literal, Mapping
 
 from pydantic import BaseModel, Field
 
 from ._enums import CoinSymbols, QuoteSymbols
+from .exeptions import (
+    CoinNotSupportedCGK as CoinNotSupportedCGKException,
+)
+from .exeptions import (
+    CoinNotSupportedCMC as CoinNotSupportedCMCException,
+)
+from .exeptions import (
+    QuoteCoinNotSupportedCGK as QuoteCoinNotSupportedCGKException,
+)
+from .exeptions import (
+    QuoteCoinNotSupportedCMC as QuoteCoinNotSupportedCMCException,
+)
 
 
 class QuoteRow(BaseModel):
@@ -20,89 +35,653 @@ class CoinQuotes(BaseModel):
         description='API Service Name'
     )
     raw_data: dict = Field(description='Raw API response data')
+    # Not dumped: it describes this copy of the prices, not the prices
+    fetched_at: float | None = Field(
+        default=None,
+        description='Unix time the prices were fetched from the API',
+        exclude=True,
+    )
 
     @staticmethod
     async def from_cmc_raw_data(raw_data: dict) -> 'CoinQuotes':
-        from anycoin.services.coinmarketcap import (  # noqa: PLC0415
-            CoinMarketCapService,
-        )
-
-        async def get_coin_quotes(coin_id) -> dict[CoinSymbols, QuoteRow]:
-            quotes: dict[CoinSymbols, QuoteRow] = {}
-            for quote_coin_id, quote_data in raw_data['data'][coin_id][
-                'quote'
-            ].items():
-                quote_coin_symbol: QuoteSymbols = (
-                    await CoinMarketCapService.get_quote_symbol_by_id(
-                        quote_id=str(quote_coin_id)
-                    )
-                )
-                quotes[quote_coin_symbol] = QuoteRow(
-                    quote=Decimal(str(quote_data['price'])),
+        return _build_coin_quotes(
+            rows=(
+                (
+                    coin_id,
+                    (
+                        (quote_id, quote_data['price'])
+                        for quote_id, quote_data in coin_data['quote'].items()
+                    ),
                 )
+                for coin_id, coin_data in raw_data['data'].items()
+            ),
+            coin_symbols=CoinSymbols.get_provider_index('coinmarketcap'),
+            quote_symbols=QuoteSymbols.get_provider_index('coinmarketcap'),
+            coin_not_supported=CoinNotSupportedCMCException,
+            quote_not_supported=QuoteCoinNotSupportedCMCException,
+            api_service='coinmarketcap',
+            raw_data=raw_data,
+        )
 
-            return quotes
+    @staticmethod
+    async def from_cgk_raw_data(raw_data: dict) -> 'CoinQuotes':
+        return _build_coin_quotes(
+            rows=(
+                (coin_id, coin_data.items())
+                for coin_id, coin_data in raw_data.items()
+            ),
+            coin_symbols=CoinSymbols.get_provider_index('coingecko'),
+            quote_symbols=QuoteSymbols.get_provider_index('coingecko'),
+            coin_not_supported=CoinNotSupportedCGKException,
+            quote_not_supported=QuoteCoinNotSupportedCGKException,
+            api_service='coingecko',
+            raw_data=raw_data,
+        )
+
+    def subset(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> 'CoinQuotes':
+        """
+        Only the given coins and quotes (those present in this result).
 
+        ``raw_data`` and ``fetched_at`` are kept as is.
+        """
         coins_data: dict[CoinSymbols, CoinRow] = {}
-        for coin_id, coin_data in raw_data['data'].items():
-            coin_symbol: CoinSymbols = (
-                await CoinMarketCapService.get_coin_symbol_by_id(
-                    coin_id=str(coin_id)
-                )
-            )
-            quotes: dict[CoinSymbols, QuoteRow] = await get_coin_quotes(
-                coin_id
+        for coin in coins:
+            if coin not in self.coins:
+                continue
+
+            coin_quotes = self.coins[coin].quotes
+            coins_data[coin] = CoinRow(
+                quotes={
+                    quote: coin_quotes[quote]
+                    for quote in quotes_in
+                    if quote in coin_quotes
+                }
             )
-            coins_data[coin_symbol] = CoinRow(quotes=quotes)
 
         return CoinQuotes(
             coins=coins_data,
-            api_service='coinmarketcap',
-            raw_data=raw_data,
+            api_service=self.api_service,
+            raw_data=self.raw_data,
+            fetched_at=self.fetched_at,
         )
 
-    @staticmethod
-    async def from_cgk_raw_data(raw_data: dict) -> 'CoinQuotes':
-        from anycoin.services.coingecko import (  # noqa: PLC0415
-            CoinGeckoService,
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    def __repr__(self) -> str:
+        return (
+            f"CoinQuotes(coins={self.coins}, api_service='{self.api_service}')"
         )
 
-        async def get_coin_quotes(coin_id) -> dict[CoinSymbols, QuoteRow]:
-            quotes: dict[CoinSymbols, QuoteRow] = {}
-            for quote_coin_id, quote_value in raw_data[coin_id].items():
-                quote_coin_symbol: QuoteSymbols = (
-                    await CoinGeckoService.get_quote_symbol_by_id(
-                        quote_id=str(quote_coin_id)
-                    )
-                )
-                quotes[quote_coin_symbol] = QuoteRow(
-                    quote=Decimal(str(quote_value)),
-                )
 
-            return quotes
+def _build_coin_quotes(
+    rows: Iterable[tuple[str, Iterable[tuple[str, Any]]]],
+    coin_symbols: Mapping[str, CoinSymbols],
+    quote_symbols: Mapping[str, QuoteSymbols],
+    coin_not_supported: type[Exception],
+    quote_not_supported: type[Exception],
+    api_service: Literal['coinmarketcap', 'coingecko'],
+    raw_data: dict,
+) -> CoinQuotes:
+    """
+    Normalize an API response in one synchronous pass.
 
-        coins_data: dict[CoinSymbols, CoinRow] = {}
-        for coin_id, coin_data in raw_data.items():
-            coin_symbol: CoinSymbols = (
-                await CoinGeckoService.get_coin_symbol_by_id(
-                    coin_id=str(coin_id)
-                )
+    ``rows`` yields ``(coin_id, [(quote_id, price), ...])``. All the ids-
+    are resolved against the ``coin_symbols``/``quote_symbols`` (id ->-
+    symbol) tables of the symbol registry with one lookup each, and the-
+    plain dicts built here are validated by a single ``model_validate``-
+    (cheaper than one ``model_construct`` per row).
+    """
+    coins_data: dict[CoinSymbols, dict] = {}
+    for coin_id, quotes_data in rows:
+        try:
+            coin_symbol = coin_symbols[str(coin_id)]
+        except KeyError:
+            raise coin_not_supported(
+                f'Coin with id {coin_id} not supported'
+            ) from None
+
+        quotes: dict[QuoteSymbols, dict] = {}
+        for quote_id, price in quotes_data:
+            try:
+                quote_symbol = quote_symbols[str(quote_id)]
+            except KeyError:
+                raise quote_not_supported(
+                    f'Quote with id {quote_id} not supported'
+                ) from None
+
+            quotes[quote_symbol] = {'quote': Decimal(str(price))}
+
+        coins_data[coin_symbol] = {'quotes': quotes}
+
+    return CoinQuotes.model_validate({
+        'coins': coins_data,
+        'api_service': api_service,
+        'raw_data': raw_data,
+    })
+
+
+class CompactCoinQuotes:
+    """
+    Compact, read-only alternative to ``CoinQuotes``.
+
+    The prices are kept in a dense coin x quote matrix (a flat tuple with-
+    one row per coin, ``None`` for a missing price) and looked up in O(1)-
+    through enum indexes, without one pydantic model per price.
+
+    It is a view built from a ``CoinQuotes`` (the pydantic models are-
+    still created once): it pays off for results that are kept or read-
+    many times, not for one-off calls.
+
+    It converts losslessly to and from ``CoinQuotes``:
+
+    >>> compact = CompactCoinQuotes.from_coin_quotes(coin_quotes)
+    >>> compact[CoinSymbols.btc, QuoteSymbols.usd]
+    Decimal('100811')
+    >>> compact.to_coin_quotes() == coin_quotes
+    True
+    """
+
+    __slots__ = (
+        'coins',
+        'quotes_in',
+        'api_service',
+        'raw_data',
+        '_prices',
+        '_coin_index',
+        '_quote_index',
+    )
+
+    def __init__(
+        self,
+        coins: tuple[CoinSymbols, ...],
+        quotes_in: tuple[QuoteSymbols, ...],
+        prices: tuple[Decimal | None, ...],
+        api_service: Literal['coinmarketcap', 'coingecko'],
+        raw_data: dict | None = None,
+    ) -> None:
+        if len(prices) != len(coins) * len(quotes_in):
+            raise ValueError(
+                f'Expected {len(coins) * len(quotes_in)} prices, '
+                f'got {len(prices)}'
             )
-            quotes: dict[CoinSymbols, QuoteRow] = await get_coin_quotes(
-                coin_id
+
+        self.coins = tuple(coins)
+        self.quotes_in = tuple(quotes_in)
+        self.api_service = api_service
+        self.raw_data = raw_data
+        self._prices = tuple(prices)
+        self._coin_index = {coin: i for i, coin in enumerate(self.coins)}
+        self._quote_index = {
+            quote: i for i, quote in enumerate(self.quotes_in)
+        }
+
+    def get(self, coin: CoinSymbols, quote: QuoteSymbols) -> Decimal | None:
+        """Price of ``coin`` in ``quote`` or None if missing"""
+        coin_index = self._coin_index.get(coin)
+        quote_index = self._quote_index.get(quote)
+        if coin_index is None or quote_index is None:
+            return None
+        return self._prices[coin_index * len(self.quotes_in) + quote_index]
+
+    def __getitem__(self, key: tuple[CoinSymbols, QuoteSymbols]) -> Decimal:
+        price = self.get(*key)
+        if price is None:
+            raise KeyError(key)
+        return price
+
+    def __contains__(self, key: tuple[CoinSymbols, QuoteSymbols]) -> bool:
+        return self.get(*key) is not None
+
+    @classmethod
+    def from_coin_quotes(cls, coin_quotes: CoinQuotes) -> 'CompactCoinQuotes':
+        coins = tuple(coin_quotes.coins)
+        quotes_in = tuple({
+            quote: None
+            for coin_row in coin_quotes.coins.values()
+            for quote in coin_row.quotes
+        })
+
+        prices: list[Decimal | None] = []
+        for coin_row in coin_quotes.coins.values():
+            for quote in quotes_in:
+                quote_row = coin_row.quotes.get(quote)
+                prices.append(None if quote_row is None else quote_row.quote)
+
+        return cls(
+            coins=coins,
+            quotes_in=quotes_in,
+            prices=tuple(prices),
+            api_service=coin_quotes.api_service,
+            raw_data=coin_quotes.raw_data,
+        )
+
+    def to_coin_quotes(self) -> CoinQuotes:
+        n_quotes = len(self.quotes_in)
+        coins_data: dict[CoinSymbols, CoinRow] = {}
+        for coin_index, coin in enumerate(self.coins):
+            row = self._prices[
+                coin_index * n_quotes : (coin_index + 1) * n_quotes
+            ]
+            coins_data[coin] = CoinRow(
+                quotes={
+                    quote: QuoteRow(quote=price)
+                    for quote, price in zip(self.quotes_in, row)
+                    if price is not None
+                }
             )
-            coins_data[coin_symbol] = CoinRow(quotes=quotes)
 
         return CoinQuotes(
             coins=coins_data,
+            api_service=self.api_service,
+            raw_data=self.raw_data if self.raw_data is not None else {},
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompactCoinQuotes):
+            return NotImplemented
+        return (
+            self.coins == other.coins
+            and self.quotes_in == other.quotes_in
+            and self._prices == other._prices
+            and self.api_service == other.api_service
+            and self.raw_data == other.raw_data
+        )
+
+    __hash__ = None
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    def __repr__(self) -> str:
+        return (
+            f'CompactCoinQuotes(coins={self.coins}, '
+            f"quotes_in={self.quotes_in}, api_service='{self.api_service}')"
+        )
+
+
+# Length of the candles of each ``get_ohlcv`` interval, in seconds
+OHLCV_INTERVALS = {'daily': 86_400, 'hourly': 3_600}
+
+_OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class OHLCV:
+    """
+    Price history of one coin in one quote, as columns: ``timestamps``-
+    (UTC unix seconds of the candle open, ascending) and one tuple of-
+    ``Decimal`` per ``open``/``high``/``low``/``close``/``volume`` (a-
+    ``volume`` is None when the API does not return it).
+
+    ``to_numpy()``/``to_arrow()`` give float64 views of the columns-
+    (they need ``numpy``/``pyarrow``, see the ``numpy`` and ``arrow``-
+    extras).
+    """
+
+    __slots__ = (
+        'coin',
+        'quote',
+        'timestamps',
+        'open',
+        'high',
+        'low',
+        'close',
+        'volume',
+    )
+
+    def __init__(
+        self,
+        coin: CoinSymbols,
+        quote: QuoteSymbols,
+        timestamps: tuple[int, ...],
+        open: tuple[Decimal, ...],
+        high: tuple[Decimal, ...],
+        low: tuple[Decimal, ...],
+        close: tuple[Decimal, ...],
+        volume: tuple[Decimal | None, ...],
+    ) -> None:
+        columns = (open, high, low, close, volume)
+        if any(len(column) != len(timestamps) for column in columns):
+            raise ValueError('All the columns must have the same length')
+
+        self.coin = coin
+        self.quote = quote
+        self.timestamps = tuple(timestamps)
+        self.open = tuple(open)
+        self.high = tuple(high)
+        self.low = tuple(low)
+        self.close = tuple(close)
+        self.volume = tuple(volume)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def to_numpy(self) -> dict[str, Any]:
+        """
+        ``timestamp`` (``datetime64[s]``) and float64 arrays of the-
+        columns (NaN for a missing volume)
+        """
+        np = _import_optional('numpy', extra='numpy')
+        arrays = {
+            'timestamp': np.array(self.timestamps, dtype='datetime64[s]')
+        }
+        for column in _OHLCV_COLUMNS:
+            arrays[column] = np.array(getattr(self, column), dtype=np.float64)
+        return arrays
+
+    def to_arrow(self) -> Any:
+        """``pyarrow.Table`` with a UTC timestamp and float64 columns"""
+        pa = _import_optional('pyarrow', extra='arrow')
+        return pa.table(_get_arrow_columns(pa, [self], with_symbols=False))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, OHLCV):
+            return NotImplemented
+        return all(
+            getattr(self, attr) == getattr(other, attr)
+            for attr in self.__slots__
+        )
+
+    __hash__ = None
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    def __repr__(self) -> str:
+        return f'OHLCV(coin={self.coin}, quote={self.quote}, rows={len(self)})'
+
+
+class HistoricalQuotes:
+    """
+    Result of ``get_ohlcv``: one ``OHLCV`` per coin/quote pair, looked-
+    up with ``historical_quotes[CoinSymbols.btc, QuoteSymbols.usd]``.
+
+    ``raw_data`` is the API response (empty when read from the cache).
+    """
+
+    __slots__ = ('series', 'api_service', 'interval', 'raw_data')
+
+    def __init__(
+        self,
+        series: dict[tuple[CoinSymbols, QuoteSymbols], OHLCV],
+        api_service: Literal['coinmarketcap', 'coingecko'],
+        interval: Literal['daily', 'hourly'],
+        raw_data: dict | None = None,
+    ) -> None:
+        self.series = series
+        self.api_service = api_service
+        self.interval = interval
+        self.raw_data = raw_data if raw_data is not None else {}
+
+    def get(self, coin: CoinSymbols, quote: QuoteSymbols) -> OHLCV | None:
+        return self.series.get((coin, quote))
+
+    def __getitem__(self, key: tuple[CoinSymbols, QuoteSymbols]) -> OHLCV:
+        return self.series[key]
+
+    def __contains__(self, key: tuple[CoinSymbols, QuoteSymbols]) -> bool:
+        return key in self.series
+
+    def __len__(self) -> int:
+        return len(self.series)
+
+    def to_arrow(self) -> Any:
+        """
+        All the series in one ``pyarrow.Table`` (long format, with-
+        ``coin`` and ``quote`` columns)
+        """
+        pa = _import_optional('pyarrow', extra='arrow')
+        return pa.table(
+            _get_arrow_columns(
+                pa, list(self.series.values()), with_symbols=True
+            )
+        )
+
+    @staticmethod
+    def from_cmc_raw_data(
+        raw_data: dict, interval: Literal['daily', 'hourly']
+    ) -> 'HistoricalQuotes':
+        """``/v2/cryptocurrency/ohlcv/historical`` response (by ids)"""
+        coin_symbols = CoinSymbols.get_provider_index('coinmarketcap')
+        quote_symbols = QuoteSymbols.get_provider_index('coinmarketcap')
+
+        rows: dict[tuple[CoinSymbols, QuoteSymbols], list[tuple]] = {}
+        for coin_id, coin_data in raw_data['data'].items():
+            coin = _get_symbol(
+                coin_symbols, coin_id, 'Coin', CoinNotSupportedCMCException
+            )
+            for candle in coin_data['quotes']:
+                timestamp = _parse_iso_timestamp(candle['time_open'])
+                for quote_id, values in candle['quote'].items():
+                    quote = _get_symbol(
+                        quote_symbols,
+                        quote_id,
+                        'Quote',
+                        QuoteCoinNotSupportedCMCException,
+                    )
+                    rows.setdefault((coin, quote), []).append((
+                        timestamp,
+                        values['open'],
+                        values['high'],
+                        values['low'],
+                        values['close'],
+                        values.get('volume'),
+                    ))
+
+        return HistoricalQuotes._from_rows(
+            rows,
+            api_service='coinmarketcap',
+            interval=interval,
+            raw_data=raw_data,
+        )
+
+    @staticmethod
+    def from_cgk_raw_data(
+        raw_data: dict, interval: Literal['daily', 'hourly']
+    ) -> 'HistoricalQuotes':
+        """
+        ``/coins/{id}/ohlc/range`` responses, as ``{coin_id: {quote_id:-
+        [[timestamp_ms, open, high, low, close], ...]}}``.
+
+        CoinGecko stamps a candle with its close time; it is moved to the-
+        open time like the CoinMarketCap candles.
+        """
+        coin_symbols = CoinSymbols.get_provider_index('coingecko')
+        quote_symbols = QuoteSymbols.get_provider_index('coingecko')
+        candle_seconds = OHLCV_INTERVALS[interval]
+
+        rows: dict[tuple[CoinSymbols, QuoteSymbols], list[tuple]] = {}
+        for coin_id, coin_data in raw_data.items():
+            coin = _get_symbol(
+                coin_symbols, coin_id, 'Coin', CoinNotSupportedCGKException
+            )
+            for quote_id, candles in coin_data.items():
+                quote = _get_symbol(
+                    quote_symbols,
+                    quote_id,
+                    'Quote',
+                    QuoteCoinNotSupportedCGKException,
+                )
+                rows[coin, quote] = [
+                    (
+                        int(candle[0]) // 1000 - candle_seconds,
+                        *candle[1:5],
+                        None,
+                    )
+                    for candle in candles
+                ]
+
+        return HistoricalQuotes._from_rows(
+            rows,
             api_service='coingecko',
+            interval=interval,
             raw_data=raw_data,
         )
 
+    @staticmethod
+    def _from_rows(
+        rows: dict[tuple[CoinSymbols, QuoteSymbols], list[tuple]],
+        api_service: Literal['coinmarketcap', 'coingecko'],
+        interval: Literal['daily', 'hourly'],
+        raw_data: dict,
+    ) -> 'HistoricalQuotes':
+        """``(timestamp, open, high, low, close, volume)`` rows per pair"""
+        series = {}
+        for (coin, quote), pair_rows in rows.items():
+            pair_rows.sort(key=lambda row: row[0])
+            timestamps, *columns = zip(*pair_rows) if pair_rows else ((),) * 6
+            series[coin, quote] = OHLCV(
+                coin,
+                quote,
+                timestamps,
+                *(
+                    tuple(
+                        None if value is None else Decimal(str(value))
+                        for value in column
+                    )
+                    for column in columns
+                ),
+            )
+
+        return HistoricalQuotes(
+            series=series,
+            api_service=api_service,
+            interval=interval,
+            raw_data=raw_data,
+        )
+
+    def to_json(self) -> str:
+        """JSON of the series (without ``raw_data``), e.g. for a cache"""
+        return json.dumps(
+            {
+                'api_service': self.api_service,
+                'interval': self.interval,
+                'series': [
+                    [
+                        ohlcv.coin.value,
+                        ohlcv.quote.value,
+                        ohlcv.timestamps,
+                        *(
+                            [
+                                None if value is None else str(value)
+                                for value in getattr(ohlcv, column)
+                            ]
+                            for column in _OHLCV_COLUMNS
+                        ),
+                    ]
+                    for ohlcv in self.series.values()
+                ],
+            },
+            separators=(',', ':'),
+        )
+
+    @classmethod
+    def from_json(cls, data: str | bytes) -> 'HistoricalQuotes':
+        decoded = json.loads(data)
+        series = {}
+        for coin_value, quote_value, timestamps, *columns in decoded['series']:
+            coin, quote = CoinSymbols(coin_value), QuoteSymbols(quote_value)
+            series[coin, quote] = OHLCV(
+                coin,
+                quote,
+                tuple(timestamps),
+                *(
+                    tuple(
+                        None if value is None else Decimal(value)
+                        for value in column
+                    )
+                    for column in columns
+                ),
+            )
+
+        return cls(
+            series=series,
+            api_service=decoded['api_service'],
+            interval=decoded['interval'],
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, HistoricalQuotes):
+            return NotImplemented
+        return (
+            self.series == other.series
+            and self.api_service == other.api_service
+            and self.interval == other.interval
+            and self.raw_data == other.raw_data
+        )
+
+    __hash__ = None
+
     def __str__(self) -> str:
         return self.__repr__()
 
     def __repr__(self) -> str:
         return (
-            f"CoinQuotes(coins={self.coins}, api_service='{self.api_service}')"
+            f'HistoricalQuotes(series={list(self.series.values())}, '
+            f"api_service='{self.api_service}', interval='{self.interval}')"
         )
+
+
+def _get_symbol(
+    symbols: Mapping[str, Any],
+    provider_id: Any,
+    kind: str,
+    not_supported: type[Exception],
+) -> Any:
+    try:
+        return symbols[str(provider_id)]
+    except KeyError:
+        raise not_supported(
+            f'{kind} with id {provider_id} not supported'
+        ) from None
+
+
+def _parse_iso_timestamp(value: str) -> int:
+    """Unix seconds of an ISO 8601 time like ``2024-12-10T00:00:00.000Z``"""
+    return int(
+        datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    )
+
+
+def _get_arrow_columns(
+    pa: Any, series: list[OHLCV], with_symbols: bool
+) -> dict[str, Any]:
+    columns = {}
+    if with_symbols:
+        columns['coin'] = pa.array(
+            [ohlcv.coin.value for ohlcv in series for _ in ohlcv.timestamps],
+            pa.string(),
+        )
+        columns['quote'] = pa.array(
+            [ohlcv.quote.value for ohlcv in series for _ in ohlcv.timestamps],
+            pa.string(),
+        )
+
+    columns['timestamp'] = pa.array(
+        [timestamp for ohlcv in series for timestamp in ohlcv.timestamps],
+        pa.timestamp('s', tz='UTC'),
+    )
+    for column in _OHLCV_COLUMNS:
+        columns[column] = pa.array(
+            [
+                None if value is None else float(value)
+                for ohlcv in series
+                for value in getattr(ohlcv, column)
+            ],
+            pa.float64(),
+        )
+    return columns
+
+
+def _import_optional(module_name: str, extra: str) -> Any:
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        raise ImportError(
+            f'{module_name} is required for this, install it with '
+            f"pip install 'anycoin[{extra}]'"
+        ) from None
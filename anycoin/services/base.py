@@ -1,17 +1,376 @@
+import asyncio
+import base64
+import time
+import traceback
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from email.utils import parsedate_to_datetime
+from functools import partial
+from http import HTTPStatus
+from typing import Any, AsyncIterator, Awaitable, Callable, Literal
+
+import anyio
+import httpx
+from aiocache import SimpleMemoryCache
+
 from .._enums import CoinSymbols, QuoteSymbols
 from ..abc import APIService
-from ..response_models import CoinQuotes
+from ..cache import (
+    Cache,
+    _get_cache_key_for_coin_quote,
+    _get_cache_key_for_get_coin_quotes_method_params,
+    _get_cache_key_for_ohlcv,
+    _LoopLocalRedLock,
+)
+from ..codecs import CacheCodec, JSONCacheCodec
+from ..exeptions import GetOHLCV as GetOHLCVException
+from ..exeptions import NotSupported as NotSupportedException
+from ..instrumentation import Instrumentation
+from ..rate_limit import RateLimiter
+from ..response_models import (
+    OHLCV_INTERVALS,
+    CoinQuotes,
+    CoinRow,
+    HistoricalQuotes,
+    QuoteRow,
+)
+
+DEFAULT_HTTP_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=30,
+)
+DEFAULT_HTTP_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+# Seconds a "refresh in progress" marker outlives a refresh that died
+_REFRESH_MARKER_TTL = 20
+
+
+@dataclass
+class CacheOptions:
+    """
+    How an API service caches the coin quotes (see ``BaseAPIService``).
+
+    With ``granular=True`` each coin/quote price is cached in its own-
+    entry, so overlapping requests share cached prices and only the-
+    missing coins are requested from the API.
+
+    Stale-while-revalidate: with ``stale_ttl`` a value older than the-
+    ``cache_ttl`` is still returned for ``stale_ttl`` more seconds while-
+    one background task refreshes it. With ``refresh_ratio`` (e.g.-
+    ``0.8``) the background refresh starts once a value is older than-
+    ``cache_ttl * refresh_ratio``, so hot keys are refreshed before they-
+    expire. A refresh runs once per key in a process, and across the-
+    processes sharing the cache through a "refresh in progress" marker-
+    entry added (atomically) to the cache.
+
+    ``codec`` sets how the coin quotes are stored in the cache-
+    (``JSONCacheCodec`` by default). ``CompactCacheCodec`` stores only-
+    the normalized prices in a compact binary format.
+    """
+
+    granular: bool = False
+    stale_ttl: int = 0
+    refresh_ratio: float | None = None
+    codec: CacheCodec | None = None
+
+
+@dataclass
+class HTTPOptions:
+    """
+    HTTP client of an API service. If ``client`` is passed it is used as-
+    is and the caller is responsible for closing it. Otherwise a client-
+    is created with ``limits`` and ``timeout`` (see ``BaseAPIService``).
+    """
+
+    client: httpx.AsyncClient | None = None
+    limits: httpx.Limits = field(default_factory=lambda: DEFAULT_HTTP_LIMITS)
+    timeout: httpx.Timeout | float = field(
+        default_factory=lambda: DEFAULT_HTTP_TIMEOUT
+    )
+
+
+@dataclass
+class RequestOptions:
+    """
+    Scheduling of the API requests of a service.
+
+    With ``rate_limiter`` the requests are queued and paced to the-
+    plan's quotas, and a 429 response pauses them for its-
+    ``Retry-After`` (see ``RateLimiter``).
+
+    Requests for more coins or quotes than the API takes in one call are-
+    split into chunks, fetched ``max_concurrent_requests`` at a time and-
+    merged into one result.
+    """
+
+    rate_limiter: RateLimiter | None = None
+    max_concurrent_requests: int = 4
+
+
+def _get_running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Seconds of a ``Retry-After`` header (delay-seconds or HTTP-date)"""
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def _get_chunks(items: list, size: int | None) -> list[list]:
+    if size is None or len(items) <= size:
+        return [items]
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _merge_raw_data(target: dict, source: dict) -> None:
+    """Deep merge of API responses (e.g. the quotes of the same coin)"""
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge_raw_data(target[key], value)
+        else:
+            target[key] = value
+
+
+def _merge_coin_quotes(
+    results: list[CoinQuotes], api_service: str | None
+) -> CoinQuotes:
+    quotes: dict[CoinSymbols, dict[QuoteSymbols, QuoteRow]] = {}
+    raw_data: dict = {}
+    for coin_quotes in results:
+        for coin, coin_row in coin_quotes.coins.items():
+            quotes.setdefault(coin, {}).update(coin_row.quotes)
+        _merge_raw_data(raw_data, coin_quotes.raw_data)
+
+    return CoinQuotes(
+        coins={
+            coin: CoinRow(quotes=coin_quotes)
+            for coin, coin_quotes in quotes.items()
+        },
+        api_service=api_service,
+        raw_data=raw_data,
+    )
+
+
+def _merge_historical_quotes(
+    results: list[HistoricalQuotes],
+    api_service: str | None,
+    interval: Literal['daily', 'hourly'],
+) -> HistoricalQuotes:
+    series = {}
+    raw_data: dict = {}
+    for historical_quotes in results:
+        series.update(historical_quotes.series)
+        _merge_raw_data(raw_data, historical_quotes.raw_data)
+
+    return HistoricalQuotes(
+        series=series,
+        api_service=api_service,
+        interval=interval,
+        raw_data=raw_data,
+    )
+
+
+def _get_unix_seconds(value: datetime) -> int:
+    """Unix seconds of a datetime (naive datetimes are taken as UTC)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
 
 
 class BaseAPIService(APIService):
     """Base class for api services."""
 
+    _api_service_name: str | None = None
+    # Largest number of ids the API takes in one request (None: no limit)
+    _max_coins_per_request: int | None = None
+    _max_quotes_per_request: int | None = None
+    # Same for the historical OHLCV endpoint
+    _max_ohlcv_coins_per_request: int | None = None
+    _max_ohlcv_quotes_per_request: int | None = None
+
+    def __init__(
+        self,
+        cache: Cache | None = None,
+        cache_ttl: int = 300,
+        *,
+        cache_options: CacheOptions | None = None,
+        http_options: HTTPOptions | None = None,
+        request_options: RequestOptions | None = None,
+        instrumentation: Instrumentation | None = None,
+    ) -> None:
+        """
+        The service keeps one long-lived ``httpx.AsyncClient`` (see-
+        ``http_options``) so that connections (DNS, TCP and TLS) are-
+        reused between requests. A client it creates is closed by-
+        ``aclose()``. The service can be used from several event loops-
+        (e.g. ``AnyCoin`` with ``portals``): each loop then gets its own-
+        client, and ``aclose()`` closes the client of the running loop.
+
+        ``cache_options`` set the cache mode and codec (see-
+        ``CacheOptions``) and ``request_options`` the rate limiting and-
+        concurrency of the API requests (see ``RequestOptions``).
+
+        ``instrumentation`` receives the HTTP request, cache hit/miss,-
+        lock wait and (de)serialization metrics of the service.
+        """
+        cache_options = cache_options or CacheOptions()
+        http_options = http_options or HTTPOptions()
+        request_options = request_options or RequestOptions()
+
+        self._cache = cache
+        self._cache_ttl = cache_ttl
+        self._cache_granular = cache_options.granular
+        self._cache_stale_ttl = cache_options.stale_ttl
+        self._cache_refresh_ratio = cache_options.refresh_ratio
+        self._cache_swr = bool(self._cache_stale_ttl) or (
+            self._cache_refresh_ratio is not None
+        )
+        self._refresh_tasks: dict[str, asyncio.Task] = {}
+        self._cache_codec: CacheCodec = cache_options.codec or JSONCacheCodec()
+
+        if self._cache_swr and self._cache_granular:
+            raise RuntimeError(
+                'Stale-while-revalidate is not supported with granular caching'
+            )
+
+        self._http_client = http_options.client  # Injected client
+        self._http_clients: dict[
+            asyncio.AbstractEventLoop | None, httpx.AsyncClient
+        ] = {}
+        self._http_limits = http_options.limits
+        self._http_timeout = http_options.timeout
+        self._instrumentation = instrumentation
+        self._rate_limiter = request_options.rate_limiter
+        self._max_concurrent_requests = request_options.max_concurrent_requests
+
+    @property
+    def rate_limiter(self) -> RateLimiter | None:
+        """Rate limiter of the service (e.g. to read its queue depth)"""
+        return self._rate_limiter
+
     async def get_coin_quotes(
         self,
         coins: list[CoinSymbols],
-        quotes_in: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
     ) -> CoinQuotes:
-        """..."""
+        if self._cache is None:
+            return await self._fetch_coin_quotes(
+                coins=coins, quotes_in=quotes_in
+            )
+
+        if self._cache_granular:
+            return await self._get_coin_quotes_granular(
+                coins=coins, quotes_in=quotes_in
+            )
+
+        cache_key: str = _get_cache_key_for_get_coin_quotes_method_params(
+            coins=coins, quotes_in=quotes_in, codec=self._cache_codec.name
+        )
+
+        # Lock-free read: cache hits never wait on the lock
+        cached = await self._get_cache_value(cache_key)
+        if self._instrumentation is not None:
+            self._report_cache_lookup(cache_key, hit=cached is not None)
+
+        if cached:
+            coin_quotes, fetched_at = cached
+            if self._cache_swr and self._needs_refresh(fetched_at):
+                self._refresh_in_background(
+                    cache_key, coins=coins, quotes_in=quotes_in
+                )
+            return coin_quotes
+
+        # The lock is scoped to the cache key, so only concurrent misses-
+        # for the same coins/quotes wait on a single upstream request
+        async with self._lock(cache_key):
+            # The value may have been cached while waiting for the lock
+            if cached := await self._get_cache_value(cache_key):
+                return cached[0]
+
+            return await self._fetch_and_cache(
+                cache_key, coins=coins, quotes_in=quotes_in
+            )
+
+    async def get_ohlcv(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+        start: datetime,
+        end: datetime,
+        interval: Literal['daily', 'hourly'] = 'daily',
+    ) -> HistoricalQuotes:
+        """
+        OHLCV candles of every coin in every quote from ``start`` to-
+        ``end`` (naive datetimes are taken as UTC), as columns.
+
+        The requests are split and fetched concurrently like-
+        ``get_coin_quotes`` and, with a cache, the result is cached for-
+        ``cache_ttl`` seconds under a key of the call's arguments.
+        """
+        if interval not in OHLCV_INTERVALS:
+            raise ValueError(
+                f'interval must be one of {list(OHLCV_INTERVALS)}'
+            )
+        start_ts, end_ts = _get_unix_seconds(start), _get_unix_seconds(end)
+        if start_ts >= end_ts:
+            raise ValueError('start must be before end')
+
+        if self._cache is None:
+            return await self._fetch_ohlcv(
+                coins=coins,
+                quotes_in=quotes_in,
+                start=start_ts,
+                end=end_ts,
+                interval=interval,
+            )
+
+        cache_key = _get_cache_key_for_ohlcv(
+            self._api_service_name,
+            coins=coins,
+            quotes_in=quotes_in,
+            start=start_ts,
+            end=end_ts,
+            interval=interval,
+        )
+        cached = await self._cache.get(cache_key)
+        if self._instrumentation is not None:
+            self._report_cache_lookup(cache_key, hit=cached is not None)
+        if cached:
+            return HistoricalQuotes.from_json(cached)
+
+        async with self._lock(cache_key):
+            if cached := await self._cache.get(cache_key):
+                return HistoricalQuotes.from_json(cached)
+
+            historical_quotes = await self._fetch_ohlcv(
+                coins=coins,
+                quotes_in=quotes_in,
+                start=start_ts,
+                end=end_ts,
+                interval=interval,
+            )
+            await self._cache.set(
+                cache_key, historical_quotes.to_json(), ttl=self._cache_ttl
+            )
+            return historical_quotes
 
     @staticmethod
     async def get_coin_id_by_symbol(coin_symbol: CoinSymbols) -> str:
@@ -33,6 +392,503 @@ class BaseAPIService(APIService):
     ) -> QuoteSymbols:
         """..."""
 
+    async def _get_coin_quotes(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> CoinQuotes:
+        """Get the coin quotes from the API (without cache)"""
+
+    async def _fetch_coin_quotes(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> CoinQuotes:
+        """
+        ``_get_coin_quotes`` in chunks of at most-
+        ``_max_coins_per_request`` coins and ``_max_quotes_per_request``-
+        quotes, ``max_concurrent_requests`` at a time, merged into one-
+        result (with ``fetched_at`` set). If a chunk fails the whole call-
+        fails.
+        """
+        coins_chunks = _get_chunks(coins, self._max_coins_per_request)
+        quotes_chunks = _get_chunks(quotes_in, self._max_quotes_per_request)
+        if len(coins_chunks) == len(quotes_chunks) == 1:
+            coin_quotes = await self._get_coin_quotes(
+                coins=coins, quotes_in=quotes_in
+            )
+            coin_quotes.fetched_at = time.time()
+            return coin_quotes
+
+        results: list[CoinQuotes] = await self._gather([
+            partial(
+                self._get_coin_quotes,
+                coins=coins_chunk,
+                quotes_in=quotes_chunk,
+            )
+            for coins_chunk in coins_chunks
+            for quotes_chunk in quotes_chunks
+        ])
+        coin_quotes = _merge_coin_quotes(
+            results, api_service=self._api_service_name
+        )
+        coin_quotes.fetched_at = time.time()
+        return coin_quotes
+
+    async def _get_ohlcv(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+        start: int,
+        end: int,
+        interval: Literal['daily', 'hourly'],
+    ) -> HistoricalQuotes:
+        """Get the OHLCV candles from the API (without cache)"""
+        message = f'{self.__class__.__name__} does not support OHLCV'
+        raise GetOHLCVException(message) from NotSupportedException(message)
+
+    async def _fetch_ohlcv(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+        start: int,
+        end: int,
+        interval: Literal['daily', 'hourly'],
+    ) -> HistoricalQuotes:
+        """``_get_ohlcv`` in chunks, like ``_fetch_coin_quotes``"""
+        results: list[HistoricalQuotes] = await self._gather([
+            partial(
+                self._get_ohlcv,
+                coins=coins_chunk,
+                quotes_in=quotes_chunk,
+                start=start,
+                end=end,
+                interval=interval,
+            )
+            for coins_chunk in _get_chunks(
+                coins, self._max_ohlcv_coins_per_request
+            )
+            for quotes_chunk in _get_chunks(
+                quotes_in, self._max_ohlcv_quotes_per_request
+            )
+        ])
+        if len(results) == 1:
+            return results[0]
+
+        return _merge_historical_quotes(
+            results, api_service=self._api_service_name, interval=interval
+        )
+
+    async def _gather(self, calls: list[Callable[[], Awaitable]]) -> list:
+        """
+        Results of ``calls``, run ``max_concurrent_requests`` at a time.-
+        If a call fails, the others are cancelled and its error is raised.
+        """
+        if len(calls) == 1:
+            return [await calls[0]()]
+
+        results: list[Any] = [None] * len(calls)
+        error: Exception | None = None
+        limiter = anyio.CapacityLimiter(self._max_concurrent_requests)
+
+        async def run(index: int) -> None:
+            nonlocal error
+            async with limiter:
+                try:
+                    results[index] = await calls[index]()
+                except Exception as expt:
+                    error = expt
+                    task_group.cancel_scope.cancel()
+
+        async with anyio.create_task_group() as task_group:
+            for index in range(len(calls)):
+                task_group.start_soon(run, index)
+
+        if error is not None:
+            raise error
+
+        return results
+
+    async def _fetch_and_cache(
+        self,
+        cache_key: str,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> CoinQuotes:
+        coin_quotes: CoinQuotes = await self._fetch_coin_quotes(
+            coins=coins, quotes_in=quotes_in
+        )
+        await self._set_cache_value(cache_key, coin_quotes)
+        return coin_quotes
+
+    async def _get_cache_value(
+        self, cache_key: str
+    ) -> tuple[CoinQuotes, float | None] | None:
+        """Cached coin quotes and the time they were fetched (if known)"""
+        if self._cache_codec.binary and self._cache_keeps_bytes():
+            cached_value = await self._cache.get(
+                cache_key, loads_fn=lambda value: value
+            )
+        else:
+            cached_value = await self._cache.get(cache_key)
+
+        if not cached_value:
+            return None
+
+        start = time.perf_counter()
+        try:
+            if self._cache_codec.binary and isinstance(cached_value, str):
+                cached_value = base64.b64decode(cached_value)
+            coin_quotes, fetched_at = self._cache_codec.decode(cached_value)
+        except Exception as expt:  # e.g. written by another codec: a miss
+            if self._instrumentation is not None:
+                self._instrumentation.on_deserialize_error(
+                    self.__class__.__name__, cache_key, expt
+                )
+            return None
+
+        if self._instrumentation is not None:
+            self._instrumentation.on_deserialize(
+                self.__class__.__name__, time.perf_counter() - start
+            )
+        if fetched_at is not None:
+            coin_quotes.fetched_at = fetched_at
+        return coin_quotes, fetched_at
+
+    async def _set_cache_value(
+        self, cache_key: str, coin_quotes: CoinQuotes
+    ) -> None:
+        # Stale-while-revalidate needs to know the age of the value
+        fetched_at = coin_quotes.fetched_at
+        if fetched_at is None and self._cache_swr:
+            fetched_at = time.time()
+        start = time.perf_counter()
+        value = self._cache_codec.encode(coin_quotes, fetched_at=fetched_at)
+        if self._instrumentation is not None:
+            self._instrumentation.on_serialize(
+                self.__class__.__name__,
+                time.perf_counter() - start,
+                len(value),
+            )
+        ttl = self._cache_ttl + self._cache_stale_ttl
+
+        if not self._cache_codec.binary:
+            await self._cache.set(cache_key, value, ttl=ttl)
+        elif self._cache_keeps_bytes():
+            await self._cache.set(
+                cache_key, value, ttl=ttl, dumps_fn=lambda value: value
+            )
+        else:
+            await self._cache.set(
+                cache_key, base64.b64encode(value).decode('ascii'), ttl=ttl
+            )
+
+    def _cache_keeps_bytes(self) -> bool:
+        """
+        Whether bytes can be stored in the cache as is. Backends that-
+        decode the values they read (``serializer.encoding`` is set) get-
+        binary values base64 encoded.
+        """
+        return (
+            isinstance(self._cache, SimpleMemoryCache)
+            or self._cache.serializer.encoding is None
+        )
+
+    def _needs_refresh(self, fetched_at: float | None) -> bool:
+        if fetched_at is None:
+            return False
+
+        refresh_after = self._cache_ttl * (self._cache_refresh_ratio or 1.0)
+        return time.time() - fetched_at >= refresh_after
+
+    def _refresh_in_background(
+        self,
+        cache_key: str,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> None:
+        if cache_key in self._refresh_tasks:
+            return  # Already being refreshed
+
+        task = asyncio.create_task(
+            self._refresh_cache(cache_key, coins=coins, quotes_in=quotes_in)
+        )
+        self._refresh_tasks[cache_key] = task
+        task.add_done_callback(
+            lambda _: self._refresh_tasks.pop(cache_key, None)
+        )
+
+    async def _refresh_cache(
+        self,
+        cache_key: str,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> None:
+        # ``RedLock`` does not make the waiters of other processes wait, so-
+        # the processes agree on who refreshes through ``add`` (which fails-
+        # if the key exists)
+        marker_key = f'{cache_key}-refresh'
+        try:
+            await self._cache.add(marker_key, '1', ttl=_REFRESH_MARKER_TTL)
+        except ValueError:
+            return  # Being refreshed by another process
+        except Exception:
+            traceback.print_exc()
+            return
+
+        try:
+            # Another process may have refreshed the value already
+            cached = await self._get_cache_value(cache_key)
+            if cached is None or self._needs_refresh(cached[1]):
+                await self._fetch_and_cache(
+                    cache_key, coins=coins, quotes_in=quotes_in
+                )
+        except Exception:  # The stale value keeps being served
+            traceback.print_exc()
+        finally:
+            with anyio.CancelScope(shield=True):
+                await self._cache.delete(marker_key)
+
+    async def _get_coin_quotes_granular(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> CoinQuotes:
+        """
+        Granular cache mode: one cache entry per coin/quote price.
+
+        Cached prices are read with a single bulk get and only the coins-
+        with a missing price are requested from the API. The returned-
+        ``raw_data`` holds the API response for those coins only (empty-
+        on a full cache hit).
+        """
+        coins = list(dict.fromkeys(coins))
+        quotes_in = list(dict.fromkeys(quotes_in))
+
+        prices = await self._get_cached_prices(
+            coins=coins, quotes_in=quotes_in
+        )
+        if self._instrumentation is not None:
+            for coin in coins:
+                for quote in quotes_in:
+                    self._report_cache_lookup(
+                        _get_cache_key_for_coin_quote(
+                            self._api_service_name, coin, quote
+                        ),
+                        hit=(coin, quote) in prices,
+                    )
+        missing_coins = self._get_coins_missing_prices(
+            prices=prices, coins=coins, quotes_in=quotes_in
+        )
+
+        raw_data = {}
+        # Unknown if some prices were read from the cache
+        fetched_at = None
+        if missing_coins:
+            lock_key: str = _get_cache_key_for_get_coin_quotes_method_params(
+                coins=missing_coins, quotes_in=quotes_in
+            )
+            async with self._lock(lock_key):
+                # Prices may have been cached while waiting for the lock
+                prices.update(
+                    await self._get_cached_prices(
+                        coins=missing_coins, quotes_in=quotes_in
+                    )
+                )
+                missing_coins = self._get_coins_missing_prices(
+                    prices=prices, coins=missing_coins, quotes_in=quotes_in
+                )
+                if missing_coins:
+                    coin_quotes: CoinQuotes = await self._fetch_coin_quotes(
+                        coins=missing_coins, quotes_in=quotes_in
+                    )
+                    raw_data = coin_quotes.raw_data
+                    if len(missing_coins) == len(coins):
+                        fetched_at = coin_quotes.fetched_at
+
+                    fetched_prices = {
+                        (coin, quote): quote_row.quote
+                        for coin, coin_row in coin_quotes.coins.items()
+                        for quote, quote_row in coin_row.quotes.items()
+                    }
+                    await self._cache.multi_set(
+                        [
+                            (
+                                _get_cache_key_for_coin_quote(
+                                    self._api_service_name, coin, quote
+                                ),
+                                str(price),
+                            )
+                            for (coin, quote), price in fetched_prices.items()
+                        ],
+                        ttl=self._cache_ttl,
+                    )
+                    prices.update(fetched_prices)
+
+        coins_data: dict[CoinSymbols, CoinRow] = {}
+        for coin in coins:
+            quotes: dict[QuoteSymbols, QuoteRow] = {
+                quote: QuoteRow(quote=prices[coin, quote])
+                for quote in quotes_in
+                if (coin, quote) in prices
+            }
+            if quotes:
+                coins_data[coin] = CoinRow(quotes=quotes)
+
+        return CoinQuotes(
+            coins=coins_data,
+            api_service=self._api_service_name,
+            raw_data=raw_data,
+            fetched_at=fetched_at,
+        )
+
+    async def _get_cached_prices(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> dict[tuple[CoinSymbols, QuoteSymbols], Decimal]:
+        pairs = [(coin, quote) for coin in coins for quote in quotes_in]
+        values = await self._cache.multi_get([
+            _get_cache_key_for_coin_quote(self._api_service_name, coin, quote)
+            for coin, quote in pairs
+        ])
+        return {
+            pair: Decimal(value)
+            for pair, value in zip(pairs, values)
+            if value is not None
+        }
+
+    @staticmethod
+    def _get_coins_missing_prices(
+        prices: dict[tuple[CoinSymbols, QuoteSymbols], Decimal],
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> list[CoinSymbols]:
+        return [
+            coin
+            for coin in coins
+            if any((coin, quote) not in prices for quote in quotes_in)
+        ]
+
+    @asynccontextmanager
+    async def _lock(self, cache_key: str) -> AsyncIterator[None]:
+        """``RedLock`` of a cache key (reporting the time waited for it)"""
+        start = time.perf_counter()
+        async with _LoopLocalRedLock(self._cache, key=cache_key, lease=20):
+            if self._instrumentation is not None:
+                self._instrumentation.on_lock_wait(
+                    self.__class__.__name__,
+                    cache_key,
+                    time.perf_counter() - start,
+                )
+            yield
+
+    def _report_cache_lookup(self, cache_key: str, hit: bool) -> None:
+        if hit:
+            self._instrumentation.on_cache_hit(
+                self.__class__.__name__, cache_key
+            )
+        else:
+            self._instrumentation.on_cache_miss(
+                self.__class__.__name__, cache_key
+            )
+
+    async def _http_request(
+        self,
+        method: str,
+        url: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+    ) -> httpx.Response:
+        """
+        Send a request with the pooled client, after waiting for its turn-
+        in the rate limiter (reporting the latency and the wait)
+        """
+        if self._rate_limiter is not None:
+            waited = await self._rate_limiter.acquire()
+            if self._instrumentation is not None:
+                self._instrumentation.on_rate_limit_wait(
+                    self.__class__.__name__, waited
+                )
+
+        client: httpx.AsyncClient = self._get_http_client()
+        if self._instrumentation is None:
+            response = await client.request(
+                method=method, url=url, params=params, headers=headers
+            )
+        else:
+            start = time.perf_counter()
+            status_code = None
+            try:
+                response = await client.request(
+                    method=method, url=url, params=params, headers=headers
+                )
+                status_code = response.status_code
+            finally:
+                self._instrumentation.on_http_request(
+                    self.__class__.__name__,
+                    time.perf_counter() - start,
+                    status_code,
+                )
+
+        if (
+            self._rate_limiter is not None
+            and response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+        ):
+            self._rate_limiter.pause(
+                _parse_retry_after(response.headers.get('Retry-After'))
+            )
+        return response
+
+    async def aclose(self) -> None:
+        """
+        Cancel the background cache refreshes and close the HTTP client-
+        owned by the service
+        """
+        loop = _get_running_loop()
+        tasks = [
+            task
+            for task in self._refresh_tasks.values()
+            if task.get_loop() is loop
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        http_client = self._http_clients.pop(loop, None)
+        if http_client is not None:
+            await http_client.aclose()
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """
+        Pooled HTTP client, created on first use. The connections of a-
+        client are bound to an event loop, so there is one per loop.
+
+        The clients of closed loops (e.g. of past ``asyncio.run()`` calls)-
+        are dropped when a client is created: they cannot be closed from-
+        another loop, so their connections are released by the garbage-
+        collector.
+        """
+        if self._http_client is not None:
+            return self._http_client
+
+        loop = _get_running_loop()
+        http_client = self._http_clients.get(loop)
+        if http_client is None:
+            for closed_loop in [
+                other_loop
+                for other_loop in self._http_clients
+                if other_loop is not None and other_loop.is_closed()
+            ]:
+                del self._http_clients[closed_loop]
+
+            http_client = self._http_clients[loop] = httpx.AsyncClient(
+                limits=self._http_limits,
+                timeout=self._http_timeout,
+            )
+
+        return http_client
+
     def __str__(self):
         return repr(self)
 
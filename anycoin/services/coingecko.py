@@ -1,79 +1,71 @@
 import json
 from http import HTTPStatus
+from typing import Literal
 
 import httpx
-from aiocache.lock import RedLock
 
 from .._enums import CoinSymbols, QuoteSymbols
-from .._mapped_ids import get_cgk_coin_ids as _get_cgk_coin_ids
-from .._mapped_ids import get_cgk_quotes_ids as _get_cgk_quotes_ids
-from ..cache import Cache, _get_cache_key_for_get_coin_quotes_method_params
+from ..cache import Cache
 from ..exeptions import (
     CoinNotSupportedCGK as CoinNotSupportedCGKException,
 )
 from ..exeptions import GetCoinQuotes as GetCoinQuotesException
+from ..exeptions import GetOHLCV as GetOHLCVException
 from ..exeptions import (
     QuoteCoinNotSupportedCGK as QuoteCoinNotSupportedCGKException,
 )
-from ..response_models import CoinQuotes
-from .base import BaseAPIService
+from ..instrumentation import Instrumentation
+from ..response_models import CoinQuotes, HistoricalQuotes
+from .base import (
+    BaseAPIService,
+    CacheOptions,
+    HTTPOptions,
+    RequestOptions,
+)
+
+BASE_URL = 'https://pro-api.coingecko.com/api/v3'
 
 
 class CoinGeckoService(BaseAPIService):
+    _api_service_name = 'coingecko'
+    # Keeps the query string of /simple/price within URL length limits
+    _max_coins_per_request = 250
+    # /coins/{id}/ohlc/range takes one coin and one currency
+    _max_ohlcv_coins_per_request = 1
+    _max_ohlcv_quotes_per_request = 1
+
     def __init__(
         self,
         api_key: str,
         cache: Cache | None = None,
         cache_ttl: int = 300,
+        *,
+        cache_options: CacheOptions | None = None,
+        http_options: HTTPOptions | None = None,
+        request_options: RequestOptions | None = None,
+        instrumentation: Instrumentation | None = None,
+        base_url: str = BASE_URL,
     ) -> None:
+        """
+        See ``BaseAPIService`` for the options. ``base_url`` is the API-
+        root the requests are sent to (e.g. a local stand-in server for-
+        load tests).
+        """
+        super().__init__(
+            cache=cache,
+            cache_ttl=cache_ttl,
+            cache_options=cache_options,
+            http_options=http_options,
+            request_options=request_options,
+            instrumentation=instrumentation,
+        )
         self._api_key = api_key
-        self._cache = cache
-        self._cache_ttl = cache_ttl
-
-        self._cache_lock = None
-        if self._cache is not None:
-            self._cache_lock = RedLock(
-                self._cache,
-                key='get_coin_quotes',
-                lease=20,
-            )
-
-    async def get_coin_quotes(
-        self,
-        coins: list[CoinSymbols],
-        quotes_in: list[QuoteSymbols],
-    ) -> CoinQuotes:
-        if self._cache is None:
-            coin_quotes: CoinQuotes = await self._get_coin_quotes(
-                coins=coins, quotes_in=quotes_in
-            )
-        else:
-            async with self._cache_lock:
-                cache_key: str = (
-                    _get_cache_key_for_get_coin_quotes_method_params(
-                        coins=coins, quotes_in=quotes_in
-                    )
-                )
-
-                if cached_value := await self._cache.get(cache_key):
-                    coin_quotes = CoinQuotes.model_validate_json(cached_value)
-                else:
-                    coin_quotes: CoinQuotes = await self._get_coin_quotes(
-                        coins=coins, quotes_in=quotes_in
-                    )
-                    await self._cache.set(
-                        cache_key,
-                        coin_quotes.model_dump_json(),
-                        ttl=self._cache_ttl,
-                    )
-
-        return coin_quotes
+        self._base_url = base_url.rstrip('/')
 
     @staticmethod
     async def get_coin_id_by_symbol(coin_symbol: CoinSymbols) -> str:
-        coin_ids = await _get_cgk_coin_ids()
         try:
-            return coin_ids[coin_symbol.value]
+            return CoinSymbols.get_provider_ids('coingecko')[coin_symbol.value]
         except KeyError:
             raise CoinNotSupportedCGKException(
                 f'Coin {coin_symbol} not supported'
@@ -81,23 +73,21 @@ class CoinGeckoService(BaseAPIService):
 
     @staticmethod
     async def get_coin_symbol_by_id(coin_id: str) -> CoinSymbols:
-        coin_ids = await _get_cgk_coin_ids()
-        coins = list(filter(lambda item: item[1] == coin_id, coin_ids.items()))
-        if not coins:
+        try:
+            return CoinSymbols.from_provider_id('coingecko', coin_id)
+        except KeyError:
             raise CoinNotSupportedCGKException(
                 f'Coin with id {coin_id} not supported'
-            )
-
-        coin_symbol_str = coins[0][0]
-        return CoinSymbols(coin_symbol_str)
+            ) from None
 
     @staticmethod
     async def get_quote_id_by_symbol(
         quote_symbol: QuoteSymbols,
     ) -> str:
-        quote_ids = await _get_cgk_quotes_ids()
         try:
-            return quote_ids[quote_symbol.value]
+            return QuoteSymbols.get_provider_ids('coingecko')[
+                quote_symbol.value
+            ]
         except KeyError:
             raise QuoteCoinNotSupportedCGKException(
                 f'Quote {quote_symbol} not supported'
@@ -107,20 +97,12 @@ class CoinGeckoService(BaseAPIService):
     async def get_quote_symbol_by_id(
         quote_id: str,
     ) -> QuoteSymbols:
-        quote_ids = await _get_cgk_quotes_ids()
-        coins = list(
-            filter(
-                lambda item: item[1] == quote_id,
-                quote_ids.items(),
-            )
-        )
-        if not coins:
+        try:
+            return QuoteSymbols.from_provider_id('coingecko', quote_id)
+        except KeyError:
             raise QuoteCoinNotSupportedCGKException(
                 f'Quote with id {quote_id} not supported'
-            )
-
-        coin_symbol_str = coins[0][0]
-        return QuoteSymbols(coin_symbol_str)
+            ) from None
 
     async def _get_coin_quotes(
         self,
@@ -151,12 +133,65 @@ class CoinGeckoService(BaseAPIService):
         )
         return await CoinQuotes.from_cgk_raw_data(raw_data=raw_data)
 
+    async def _get_ohlcv(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+        start: int,
+        end: int,
+        interval: Literal['daily', 'hourly'],
+    ) -> HistoricalQuotes:
+        try:
+            coin_ids: list[str] = [
+                await self.get_coin_id_by_symbol(coin) for coin in coins
+            ]
+            convert_ids: list[str] = [
+                await self.get_quote_id_by_symbol(quote) for quote in quotes_in
+            ]
+        except CoinNotSupportedCGKException as expt:
+            raise GetOHLCVException(str(expt)) from expt
+
+        except QuoteCoinNotSupportedCGKException as expt:
+            raise GetOHLCVException(str(expt)) from expt
+
+        raw_data: dict[str, dict[str, list]] = {}
+        for coin_id in coin_ids:
+            for convert_id in convert_ids:
+                candles = await self._send_request(
+                    path=f'/coins/{coin_id}/ohlc/range',
+                    method='get',
+                    params={
+                        'vs_currency': convert_id,
+                        'from': start,
+                        'to': end,
+                        'interval': interval,
+                    },
+                    error_class=GetOHLCVException,
+                )
+                raw_data.setdefault(coin_id, {})[convert_id] = candles
+
+        return HistoricalQuotes.from_cgk_raw_data(
+            raw_data=raw_data, interval=interval
+        )
+
     async def _send_request(
         self,
         path: str,
         method: str,
         params: dict | None = None,
-    ) -> dict:
+        error_class: type[
+            GetCoinQuotesException | GetOHLCVException
+        ] = GetCoinQuotesException,
+    ) -> dict | list:
+        """
+        JSON response of the API; errors raise ``error_class`` (e.g.-
+        ``GetOHLCV`` for the OHLCV endpoint)
+        """
+        error_message = (
+            'Error retrieving OHLCV'
+            if issubclass(error_class, GetOHLCVException)
+            else 'Error retrieving coin quotes'
+        )
         if not path.startswith('/'):
             path = '/' + path  # Add leading slash to path
 
@@ -165,30 +200,23 @@ class CoinGeckoService(BaseAPIService):
             'x-cg-pro-api-key': self._api_key,
         }
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.request(
-                    method=method,
-                    url=(f'https://pro-api.coingecko.com/api/v3{path}'),
-                    params=params,
-                    headers=headers,
-                )
-                json_data = response.json()
+        try:
+            response = await self._http_request(
+                method=method,
+                url=f'{self._base_url}{path}',
+                params=params,
+                headers=headers,
+            )
+            json_data = response.json()
 
-                if response.status_code == HTTPStatus.OK:  # Success
-                    return json_data
+            if response.status_code == HTTPStatus.OK:  # Success
+                return json_data
 
-                raise GetCoinQuotesException(
-                    f'Error retrieving coin quotes. API response: {json_data}'
-                )
-            except httpx.RequestError as expt:
-                raise GetCoinQuotesException(
-                    'Error retrieving coin quotes'
-                ) from expt
-            except json.JSONDecodeError as expt:
-                raise GetCoinQuotesException(
-                    'Error retrieving coin quotes'
-                ) from expt
+            raise error_class(f'{error_message}. API response: {json_data}')
+        except httpx.RequestError as expt:
+            raise error_class(error_message) from expt
+        except json.JSONDecodeError as expt:
+            raise error_class(error_message) from expt
 
     def __repr__(self):
         return f"{self.__class__.__name__}(api_key='***')"
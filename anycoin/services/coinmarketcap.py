@@ -1,79 +1,81 @@
 import json
+import math
 from http import HTTPStatus
+from typing import Literal
 
 import httpx
-from aiocache.lock import RedLock
 
 from .._enums import CoinSymbols, QuoteSymbols
-from .._mapped_ids import get_cmc_coins_ids as _get_cmc_coins_ids
-from .._mapped_ids import get_cmc_quotes_ids as _get_cmc_quotes_ids
-from ..cache import Cache, _get_cache_key_for_get_coin_quotes_method_params
+from ..cache import Cache
 from ..exeptions import (
     CoinNotSupportedCMC as CoinNotSupportedCMCException,
 )
 from ..exeptions import GetCoinQuotes as GetCoinQuotesException
+from ..exeptions import GetOHLCV as GetOHLCVException
 from ..exeptions import (
     QuoteCoinNotSupportedCMC as QuoteCoinNotSupportedCMCException,
 )
-from ..response_models import CoinQuotes
-from .base import BaseAPIService
+from ..instrumentation import Instrumentation
+from ..response_models import (
+    OHLCV_INTERVALS,
+    CoinQuotes,
+    HistoricalQuotes,
+)
+from .base import (
+    BaseAPIService,
+    CacheOptions,
+    HTTPOptions,
+    RequestOptions,
+)
+
+BASE_URL = 'https://pro-api.coinmarketcap.com/v2'
 
 
 class CoinMarketCapService(BaseAPIService):
+    _api_service_name = 'coinmarketcap'
+    # One credit per 100 coins; up to 120 convert options per call
+    _max_coins_per_request = 100
+    _max_quotes_per_request = 120
+    # /ohlcv/historical takes up to 3 convert options per call
+    _max_ohlcv_coins_per_request = 100
+    _max_ohlcv_quotes_per_request = 3
+    # Most time periods returned by /ohlcv/historical in one call
+    _max_ohlcv_count = 10_000
+
     def __init__(
         self,
         api_key: str,
         cache: Cache | None = None,
         cache_ttl: int = 300,
+        *,
+        cache_options: CacheOptions | None = None,
+        http_options: HTTPOptions | None = None,
+        request_options: RequestOptions | None = None,
+        instrumentation: Instrumentation | None = None,
+        base_url: str = BASE_URL,
     ) -> None:
+        """
+        See ``BaseAPIService`` for the options. ``base_url`` is the API-
+        root the requests are sent to (e.g. a local stand-in server for-
+        load tests).
+        """
+        super().__init__(
+            cache=cache,
+            cache_ttl=cache_ttl,
+            cache_options=cache_options,
+            http_options=http_options,
+            request_options=request_options,
+            instrumentation=instrumentation,
+        )
         self._api_key = api_key
-        self._cache = cache
-        self._cache_ttl = cache_ttl
-
-        self._cache_lock = None
-        if self._cache is not None:
-            self._cache_lock = RedLock(
-                self._cache,
-                key='get_coin_quotes',
-                lease=20,
-            )
-
-    async def get_coin_quotes(
-        self,
-        coins: list[CoinSymbols],
-        quotes_in: list[QuoteSymbols],
-    ) -> CoinQuotes:
-        if self._cache is None:
-            coin_quotes: CoinQuotes = await self._get_coin_quotes(
-                coins=coins, quotes_in=quotes_in
-            )
-        else:
-            async with self._cache_lock:
-                cache_key: str = (
-                    _get_cache_key_for_get_coin_quotes_method_params(
-                        coins=coins, quotes_in=quotes_in
-                    )
-                )
-
-                if cached_value := await self._cache.get(cache_key):
-                    coin_quotes = CoinQuotes.model_validate_json(cached_value)
-                else:
-                    coin_quotes: CoinQuotes = await self._get_coin_quotes(
-                        coins=coins, quotes_in=quotes_in
-                    )
-                    await self._cache.set(
-                        cache_key,
-                        coin_quotes.model_dump_json(),
-                        ttl=self._cache_ttl,
-                    )
-
-        return coin_quotes
+        self._base_url = base_url.rstrip('/')
 
     @staticmethod
     async def get_coin_id_by_symbol(coin_symbol: CoinSymbols) -> str:
-        coin_ids = await _get_cmc_coins_ids()
         try:
-            return coin_ids[coin_symbol.value]
+            return CoinSymbols.get_provider_ids('coinmarketcap')[
+                coin_symbol.value
+            ]
         except KeyError:
             raise CoinNotSupportedCMCException(
                 f'Coin {coin_symbol} not supported'
@@ -81,23 +83,21 @@ class CoinMarketCapService(BaseAPIService):
 
     @staticmethod
     async def get_coin_symbol_by_id(coin_id: str) -> CoinSymbols:
-        coin_ids = await _get_cmc_coins_ids()
-        coins = list(filter(lambda item: item[1] == coin_id, coin_ids.items()))
-        if not coins:
+        try:
+            return CoinSymbols.from_provider_id('coinmarketcap', coin_id)
+        except KeyError:
             raise CoinNotSupportedCMCException(
                 f'Coin with id {coin_id} not supported'
-            )
-
-        coin_symbol_str = coins[0][0]
-        return CoinSymbols(coin_symbol_str)
+            ) from None
 
     @staticmethod
     async def get_quote_id_by_symbol(
         quote_symbol: QuoteSymbols,
     ) -> str:
-        quote_ids = await _get_cmc_quotes_ids()
         try:
-            return quote_ids[quote_symbol.value]
+            return QuoteSymbols.get_provider_ids('coinmarketcap')[
+                quote_symbol.value
+            ]
         except KeyError:
             raise QuoteCoinNotSupportedCMCException(
                 f'Quote {quote_symbol} not supported'
@@ -107,20 +107,12 @@ class CoinMarketCapService(BaseAPIService):
     async def get_quote_symbol_by_id(
         quote_id: str,
     ) -> QuoteSymbols:
-        quote_ids = await _get_cmc_quotes_ids()
-        coins = list(
-            filter(
-                lambda item: item[1] == quote_id,
-                quote_ids.items(),
-            )
-        )
-        if not coins:
+        try:
+            return QuoteSymbols.from_provider_id('coinmarketcap', quote_id)
+        except KeyError:
             raise QuoteCoinNotSupportedCMCException(
                 f'Quote with id {quote_id} not supported'
-            )
-
-        coin_symbol_str = coins[0][0]
-        return QuoteSymbols(coin_symbol_str)
+            ) from None
 
     async def _get_coin_quotes(
         self,
@@ -150,12 +142,70 @@ class CoinMarketCapService(BaseAPIService):
         )
         return await CoinQuotes.from_cmc_raw_data(raw_data=raw_data)
 
+    async def _get_ohlcv(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+        start: int,
+        end: int,
+        interval: Literal['daily', 'hourly'],
+    ) -> HistoricalQuotes:
+        try:
+            coin_ids: list[str] = [
+                await self.get_coin_id_by_symbol(coin) for coin in coins
+            ]
+            convert_ids: list[str] = [
+                await self.get_quote_id_by_symbol(quote) for quote in quotes_in
+            ]
+        except CoinNotSupportedCMCException as expt:
+            raise GetOHLCVException(str(expt)) from expt
+
+        except QuoteCoinNotSupportedCMCException as expt:
+            raise GetOHLCVException(str(expt)) from expt
+
+        # Without ``count`` the API returns only 10 time periods
+        count = min(
+            math.ceil((end - start) / OHLCV_INTERVALS[interval]),
+            self._max_ohlcv_count,
+        )
+        params = {
+            'id': ','.join(coin_ids),
+            'convert_id': ','.join(convert_ids),
+            'time_start': start,
+            'time_end': end,
+            'time_period': interval,
+            'interval': interval,
+            'count': count,
+        }
+
+        raw_data = await self._send_request(
+            path='/cryptocurrency/ohlcv/historical',
+            method='get',
+            params=params,
+            error_class=GetOHLCVException,
+        )
+        return HistoricalQuotes.from_cmc_raw_data(
+            raw_data=raw_data, interval=interval
+        )
+
     async def _send_request(
         self,
         path: str,
         method: str,
         params: dict | None = None,
+        error_class: type[
+            GetCoinQuotesException | GetOHLCVException
+        ] = GetCoinQuotesException,
     ) -> dict:
+        """
+        JSON response of the API; errors raise ``error_class`` (e.g.-
+        ``GetOHLCV`` for the OHLCV endpoint)
+        """
+        error_message = (
+            'Error retrieving OHLCV'
+            if issubclass(error_class, GetOHLCVException)
+            else 'Error retrieving coin quotes'
+        )
         if not path.startswith('/'):
             path = '/' + path  # Add leading slash to path
 
@@ -164,34 +214,27 @@ class CoinMarketCapService(BaseAPIService):
             'X-CMC_PRO_API_KEY': self._api_key,
         }
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.request(
-                    method=method,
-                    url=(f'https://pro-api.coinmarketcap.com/v2{path}'),
-                    params=params,
-                    headers=headers,
-                )
-                json_data = response.json()
-
-                CMC_NO_ERROR_CODE = 0
-                if (
-                    response.status_code == HTTPStatus.OK
-                    and json_data['status']['error_code'] == CMC_NO_ERROR_CODE
-                ):  # Success
-                    return json_data
-
-                raise GetCoinQuotesException(
-                    f'Error retrieving coin quotes. API response: {json_data}'
-                )
-            except httpx.RequestError as expt:
-                raise GetCoinQuotesException(
-                    'Error retrieving coin quotes'
-                ) from expt
-            except json.JSONDecodeError as expt:
-                raise GetCoinQuotesException(
-                    'Error retrieving coin quotes'
-                ) from expt
+        try:
+            response = await self._http_request(
+                method=method,
+                url=f'{self._base_url}{path}',
+                params=params,
+                headers=headers,
+            )
+            json_data = response.json()
+
+            CMC_NO_ERROR_CODE = 0
+            if (
+                response.status_code == HTTPStatus.OK
+                and json_data['status']['error_code'] == CMC_NO_ERROR_CODE
+            ):  # Success
+                return json_data
+
+            raise error_class(f'{error_message}. API response: {json_data}')
+        except httpx.RequestError as expt:
+            raise error_class(error_message) from expt
+        except json.JSONDecodeError as expt:
+            raise error_class(error_message) from expt
 
     def __repr__(self):
         return f"{self.__class__.__name__}(api_key='***')"
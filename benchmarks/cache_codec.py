@@ -0,0 +1,103 @@
+# ruff: noqa: PLC2701
+
+"""
+Microbenchmark of the cache codecs.
+
+Compares the payload size and the encode/decode time of ``JSONCacheCodec``-
+(the default, ``raw_data`` included) with ``CompactCacheCodec`` with and-
+without ``raw_data``, for a CoinMarketCap-like response of every supported-
+coin in every supported quote.
+
+Usage:
+    python -m benchmarks.cache_codec --repeat 2000
+"""
+
+import argparse
+import asyncio
+import time
+
+from anycoin import CoinSymbols, QuoteSymbols
+from anycoin._mapped_ids import get_cmc_coins_ids, get_cmc_quotes_ids
+from anycoin.codecs import CacheCodec, CompactCacheCodec, JSONCacheCodec
+from anycoin.response_models import CoinQuotes
+
+
+async def _get_coin_quotes() -> CoinQuotes:
+    """Same fields as a ``/v2/cryptocurrency/quotes/latest`` response"""
+    coin_ids = get_cmc_coins_ids()
+    quote_ids = get_cmc_quotes_ids()
+
+    raw_data = {
+        'status': {'error_code': 0, 'error_message': None, 'credit_count': 1},
+        'data': {
+            coin_ids[coin.value]: {
+                'id': int(coin_ids[coin.value]),
+                'name': coin.name,
+                'symbol': coin.value.upper(),
+                'slug': coin.name,
+                'circulating_supply': 19_800_000 + i,
+                'total_supply': 21_000_000,
+                'last_updated': '2024-12-10T14:19:00.000Z',
+                'quote': {
+                    quote_ids[quote.value]: {
+                        'price': 100811.12345678 / (i + 1) + j,
+                        'volume_24h': 40_938_383_924.123 + j,
+                        'percent_change_1h': -0.2313123,
+                        'percent_change_24h': 1.8811238,
+                        'market_cap': 1_996_321_124_312.2312,
+                        'last_updated': '2024-12-10T14:19:00.000Z',
+                    }
+                    for j, quote in enumerate(QuoteSymbols)
+                },
+            }
+            for i, coin in enumerate(CoinSymbols)
+        },
+    }
+    return await CoinQuotes.from_cmc_raw_data(raw_data)
+
+
+def _time(func, repeat: int) -> float:
+    """Best time of ``repeat`` runs, in microseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1_000_000
+
+
+def _run(name: str, codec: CacheCodec, coin_quotes, repeat: int) -> None:
+    data = codec.encode(coin_quotes, fetched_at=time.time())
+    size = len(data) if isinstance(data, bytes) else len(data.encode())
+
+    encode_us = _time(
+        lambda: codec.encode(coin_quotes, fetched_at=1.0), repeat
+    )
+    decode_us = _time(lambda: codec.decode(data), repeat)
+    print(
+        f'{name:<24} {size:>8} bytes  encode {encode_us:8.1f} us  '
+        f'decode {decode_us:8.1f} us'
+    )
+
+
+async def main(repeat: int) -> None:
+    coin_quotes = await _get_coin_quotes()
+    print(
+        f'{len(CoinSymbols)} coins x {len(QuoteSymbols)} quotes, '
+        f'best of {repeat}'
+    )
+
+    for name, codec in (
+        ('json', JSONCacheCodec()),
+        ('compact', CompactCacheCodec()),
+        ('compact+raw_data', CompactCacheCodec(include_raw_data=True)),
+    ):
+        _run(name, codec, coin_quotes, repeat)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.repeat))
@@ -0,0 +1,149 @@
+"""
+Cache hit-rate benchmark for the ``get_coin_quotes`` cache keys.
+
+Replays a synthetic but realistic request mix against a TTL cache-
+simulated in memory (no network, no cache backend) and compares the-
+hit rate and the number of upstream API calls of:
+
+- legacy: the order-sensitive cache key used before canonicalization
+- canonical: the canonical cache key from ``anycoin.cache``
+- granular: one cache entry per coin/quote price (``cache_granular``)
+
+The mix models a population of watchlists: popular coins are requested-
+more often (Zipf-like weights), each caller sends the coins and quotes-
+in its own order and some callers repeat a coin.
+
+Usage:
+    python -m benchmarks.cache_hit_rate --requests 100000 --ttl 300
+"""
+
+import argparse
+import random
+from typing import Callable
+
+from anycoin import CoinSymbols, QuoteSymbols
+from anycoin.cache import (
+    _get_cache_key_for_get_coin_quotes_method_params,  # noqa: PLC2701
+)
+
+
+def _legacy_cache_key(
+    coins: list[CoinSymbols], quotes_in: list[QuoteSymbols]
+) -> str:
+    """Cache key used before canonicalization (caller order, duplicates)"""
+    return (
+        'coins:'
+        + ','.join(coin.value for coin in coins)
+        + ';quotes_in:'
+        + ','.join(quote.value for quote in quotes_in)
+    )
+
+
+def _build_request_mix(
+    n_requests: int, seed: int
+) -> list[tuple[list[CoinSymbols], list[QuoteSymbols]]]:
+    rnd = random.Random(seed)
+    coins = list(CoinSymbols)
+    quotes = list(QuoteSymbols)
+    coin_weights = [1 / (rank + 1) for rank in range(len(coins))]
+    quote_weights = [1 / (rank + 1) ** 2 for rank in range(len(quotes))]
+
+    requests = []
+    for _ in range(n_requests):
+        n_coins = rnd.choice([1, 1, 1, 2, 2, 3, 5])
+        n_quotes = rnd.choice([1, 1, 1, 2, 3])
+        request_coins = list({
+            coin: None for coin in rnd.choices(coins, coin_weights, k=n_coins)
+        })
+        request_quotes = list({
+            quote: None
+            for quote in rnd.choices(quotes, quote_weights, k=n_quotes)
+        })
+        rnd.shuffle(request_coins)
+        rnd.shuffle(request_quotes)
+        if rnd.random() < 0.05:  # noqa: PLR2004
+            request_coins.append(rnd.choice(request_coins))  # Duplicate
+        requests.append((request_coins, request_quotes))
+
+    return requests
+
+
+def simulate_hit_rate(
+    requests: list[tuple[list[CoinSymbols], list[QuoteSymbols]]],
+    cache_key_func: Callable[[list, list], str],
+    ttl: float,
+    requests_per_second: float,
+) -> float:
+    expires_at: dict[str, float] = {}
+    hits = 0
+    for index, (coins, quotes_in) in enumerate(requests):
+        now = index / requests_per_second
+        cache_key = cache_key_func(coins, quotes_in)
+        if expires_at.get(cache_key, -1) > now:
+            hits += 1
+        else:
+            expires_at[cache_key] = now + ttl
+
+    return hits / len(requests)
+
+
+def simulate_granular_hit_rate(
+    requests: list[tuple[list[CoinSymbols], list[QuoteSymbols]]],
+    ttl: float,
+    requests_per_second: float,
+) -> float:
+    """Same as ``simulate_hit_rate`` with one cache entry per price"""
+    expires_at: dict[tuple[CoinSymbols, QuoteSymbols], float] = {}
+    hits = 0
+    for index, (coins, quotes_in) in enumerate(requests):
+        now = index / requests_per_second
+        missing_coins = [
+            coin
+            for coin in coins
+            if any(expires_at.get((coin, q), -1) <= now for q in quotes_in)
+        ]
+        if not missing_coins:
+            hits += 1
+        for coin in missing_coins:
+            for quote in quotes_in:
+                expires_at[coin, quote] = now + ttl
+
+    return hits / len(requests)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--requests', type=int, default=100_000)
+    parser.add_argument('--ttl', type=float, default=300)
+    parser.add_argument('--rps', type=float, default=5, help='requests/s')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    requests = _build_request_mix(args.requests, args.seed)
+
+    for name, cache_key_func in (
+        ('legacy', _legacy_cache_key),
+        ('canonical', _get_cache_key_for_get_coin_quotes_method_params),
+    ):
+        hit_rate = simulate_hit_rate(
+            requests,
+            cache_key_func,
+            ttl=args.ttl,
+            requests_per_second=args.rps,
+        )
+        print(
+            f'{name:>10}: hit rate {hit_rate:.2%}, '
+            f'upstream calls {round((1 - hit_rate) * len(requests))}'
+        )
+
+    hit_rate = simulate_granular_hit_rate(
+        requests, ttl=args.ttl, requests_per_second=args.rps
+    )
+    print(
+        f'{"granular":>10}: hit rate {hit_rate:.2%}, '
+        f'upstream calls {round((1 - hit_rate) * len(requests))}'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+# ruff: noqa: PLC2701
+
+"""
+Cold start and lookup cost of the mapped id tables.
+
+Compares the current tables, read synchronously once into read-only-
+dicts, with the legacy loader, which read the files through ``anyio``-
+and went through ``aiocache.cached`` (key building and an ``await``) on-
+every lookup.
+
+Cold start is the time from a fresh interpreter (``anycoin`` already-
+imported) to the first id, measured in a subprocess ``--runs`` times.
+
+Usage:
+    python -m benchmarks.mapped_ids --runs 20 --number 100000
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+import aiocache
+from anyio import Path, open_file
+
+import anycoin
+from anycoin import CoinSymbols
+from anycoin._mapped_ids import get_cmc_coins_ids
+
+_COLD_START_LEGACY = """
+import asyncio, time
+import benchmarks.mapped_ids as bench
+start = time.perf_counter()
+asyncio.run(bench._legacy_get_cmc_coins_ids())
+print(time.perf_counter() - start)
+"""
+
+_COLD_START_CURRENT = """
+import time
+import benchmarks.mapped_ids
+from anycoin._mapped_ids import get_cmc_coins_ids
+start = time.perf_counter()
+get_cmc_coins_ids()
+print(time.perf_counter() - start)
+"""
+
+
+@aiocache.cached(ttl=None, cache=aiocache.Cache.MEMORY)
+async def _legacy_get_json_data(file_name: str) -> dict:
+    path_resolved = await Path(anycoin.__file__).resolve()
+    file_path = path_resolved.parent.joinpath('_data', file_name)
+    async with await open_file(file_path, encoding='utf-8') as file:
+        return json.loads(await file.read())
+
+
+async def _legacy_get_cmc_coins_ids() -> dict[str, str]:
+    return await _legacy_get_json_data('mapped_cmc_coin_ids.json')
+
+
+def _cold_start_ms(code: str, runs: int) -> float:
+    """Median of ``runs`` fresh interpreters, in milliseconds"""
+    timings = [
+        float(
+            subprocess.run(
+                [sys.executable, '-c', code],
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(runs)
+    ]
+    return statistics.median(timings) * 1000
+
+
+async def _legacy_lookup_ns(number: int) -> float:
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(number):
+            (await _legacy_get_cmc_coins_ids())['btc']
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings) * 1e9
+
+
+def _lookup_ns(func, number: int) -> float:
+    """Best time per call of 5 runs of ``number`` calls, in nanoseconds"""
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings) * 1e9
+
+
+def main(runs: int, number: int) -> None:
+    legacy_ms = _cold_start_ms(_COLD_START_LEGACY, runs)
+    current_ms = _cold_start_ms(_COLD_START_CURRENT, runs)
+    print(
+        f'cold start      legacy {legacy_ms:8.3f} ms, '
+        f'current {current_ms:8.3f} ms ({legacy_ms / current_ms:.1f}x)'
+    )
+
+    legacy_ns = asyncio.run(_legacy_lookup_ns(number))
+    current_ns = _lookup_ns(lambda: get_cmc_coins_ids()['btc'], number)
+    registry_ns = _lookup_ns(
+        lambda: CoinSymbols.btc.get_provider_id('coinmarketcap'), number
+    )
+    print(
+        f'lookup          legacy {legacy_ns:8.1f} ns, '
+        f'current {current_ns:8.1f} ns ({legacy_ns / current_ns:.1f}x), '
+        f'registry {registry_ns:8.1f} ns'
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--number', type=int, default=100_000)
+    args = parser.parse_args()
+    main(args.runs, args.number)
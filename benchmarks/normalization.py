@@ -0,0 +1,142 @@
+# ruff: noqa: PLC2701
+
+"""
+Microbenchmark of ``CoinQuotes.from_cmc_raw_data``/``from_cgk_raw_data``.
+
+Compares the current builders, which resolve every id against the-
+preloaded id tables in one synchronous pass, with the legacy builders-
+that awaited ``get_coin_symbol_by_id``/``get_quote_symbol_by_id`` for-
+every coin and every coin x quote cell.
+
+The mapped ids only cover a few coins, so the synthetic responses use-
+extra coins added to the symbol registry with ``CoinSymbols.register``.
+
+Usage:
+    python -m benchmarks.normalization --coins 1000 5000
+"""
+
+import argparse
+import asyncio
+import time
+from decimal import Decimal
+
+from anycoin import CoinSymbols
+from anycoin.response_models import CoinQuotes, CoinRow, QuoteRow
+from anycoin.services.coingecko import CoinGeckoService
+from anycoin.services.coinmarketcap import CoinMarketCapService
+
+CMC_QUOTE_IDS = ['2781', '2790', '2783', '2806', '3530']
+CGK_QUOTE_IDS = ['usd', 'eur', 'brl', 'rub', 'bdt']
+
+
+async def _legacy_from_cmc_raw_data(raw_data: dict) -> CoinQuotes:
+    coins_data = {}
+    for coin_id, coin_data in raw_data['data'].items():
+        coin_symbol = await CoinMarketCapService.get_coin_symbol_by_id(
+            coin_id=str(coin_id)
+        )
+        quotes = {}
+        for quote_id, quote_data in coin_data['quote'].items():
+            quote_symbol = await CoinMarketCapService.get_quote_symbol_by_id(
+                quote_id=str(quote_id)
+            )
+            quotes[quote_symbol] = QuoteRow(
+                quote=Decimal(str(quote_data['price']))
+            )
+        coins_data[coin_symbol] = CoinRow(quotes=quotes)
+
+    return CoinQuotes(
+        coins=coins_data, api_service='coinmarketcap', raw_data=raw_data
+    )
+
+
+async def _legacy_from_cgk_raw_data(raw_data: dict) -> CoinQuotes:
+    coins_data = {}
+    for coin_id, coin_data in raw_data.items():
+        coin_symbol = await CoinGeckoService.get_coin_symbol_by_id(
+            coin_id=str(coin_id)
+        )
+        quotes = {}
+        for quote_id, quote_value in coin_data.items():
+            quote_symbol = await CoinGeckoService.get_quote_symbol_by_id(
+                quote_id=str(quote_id)
+            )
+            quotes[quote_symbol] = QuoteRow(quote=Decimal(str(quote_value)))
+        coins_data[coin_symbol] = CoinRow(quotes=quotes)
+
+    return CoinQuotes(
+        coins=coins_data, api_service='coingecko', raw_data=raw_data
+    )
+
+
+async def _add_synthetic_ids(n_coins: int) -> tuple[list[str], list[str]]:
+    cmc_ids = [str(10_000_000 + i) for i in range(n_coins)]
+    cgk_ids = [f'synthetic-coin-{i}' for i in range(n_coins)]
+    for i, (cmc_id, cgk_id) in enumerate(zip(cmc_ids, cgk_ids)):
+        CoinSymbols.register(
+            f'synthetic{i}',
+            provider_ids={'coinmarketcap': cmc_id, 'coingecko': cgk_id},
+        )
+    return cmc_ids, cgk_ids
+
+
+async def _time(func, raw_data: dict, repeat: int) -> float:
+    """Best time of ``repeat`` runs, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func(raw_data)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+async def main(coin_counts: list[int], repeat: int) -> None:
+    cmc_ids, cgk_ids = await _add_synthetic_ids(max(coin_counts))
+
+    for n_coins in coin_counts:
+        cmc_raw_data = {
+            'data': {
+                coin_id: {
+                    'quote': {
+                        quote_id: {'price': 1234.5678 + i}
+                        for quote_id in CMC_QUOTE_IDS
+                    }
+                }
+                for i, coin_id in enumerate(cmc_ids[:n_coins])
+            }
+        }
+        cgk_raw_data = {
+            coin_id: {quote_id: 1234.5678 + i for quote_id in CGK_QUOTE_IDS}
+            for i, coin_id in enumerate(cgk_ids[:n_coins])
+        }
+
+        for name, legacy, current, raw_data in (
+            (
+                'cmc',
+                _legacy_from_cmc_raw_data,
+                CoinQuotes.from_cmc_raw_data,
+                cmc_raw_data,
+            ),
+            (
+                'cgk',
+                _legacy_from_cgk_raw_data,
+                CoinQuotes.from_cgk_raw_data,
+                cgk_raw_data,
+            ),
+        ):
+            legacy_ms = await _time(legacy, raw_data, repeat)
+            current_ms = await _time(current, raw_data, repeat)
+            print(
+                f'{name} {n_coins:>6} coins x {len(CMC_QUOTE_IDS)} quotes: '
+                f'legacy {legacy_ms:8.2f} ms, current {current_ms:8.2f} ms '
+                f'({legacy_ms / current_ms:.1f}x)'
+            )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--coins', type=int, nargs='+', default=[1000, 5000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.coins, args.repeat))
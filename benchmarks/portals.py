@@ -0,0 +1,51 @@
+"""
+Throughput of the sync ``AnyCoin`` facade with a pool of portals.
+
+Runs ``loadtest.run_sync`` against the local stand-in provider at 1, 8 and-
+64 calling threads, with a single portal (one event loop thread, the-
+default) and with a pool of portals.
+
+Usage:
+    python -m benchmarks.portals --duration 3 --latency 0.005 --pool 8
+"""
+
+import argparse
+import contextlib
+import io
+
+from anycoin.loadtest import StubProviderConfig, StubProviderServer, run_sync
+from anycoin.services.coinmarketcap import CoinMarketCapService
+
+THREADS = [1, 8, 64]
+
+
+def main(duration: float, latency: float, pool: int) -> None:
+    config = StubProviderConfig(latency=latency, seed=0)
+    with StubProviderServer(config) as server:
+        print(f'{"threads":>8} {"portals":>8} {"req/s":>10} {"p99 ms":>10}')
+        for threads in THREADS:
+            for portals in (1, pool):
+                service = CoinMarketCapService(
+                    api_key='test', base_url=server.cmc_base_url
+                )
+                with contextlib.redirect_stderr(io.StringIO()):
+                    result = run_sync(
+                        [service],
+                        users=threads,
+                        duration=duration,
+                        portals=portals,
+                    )
+                print(
+                    f'{threads:>8} {portals:>8} {result.throughput:>10.1f} '
+                    f'{result.percentile(99) * 1000:>10.2f}'
+                )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--duration', type=float, default=3.0)
+    parser.add_argument('--latency', type=float, default=0.005)
+    parser.add_argument('--pool', type=int, default=8)
+    args = parser.parse_args()
+
+    main(args.duration, args.latency, args.pool)
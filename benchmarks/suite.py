@@ -0,0 +1,400 @@
+# ruff: noqa: PLC2701
+
+"""
+Offline microbenchmark suite of the anycoin hot paths.
+
+Each stage is timed on its own, HTTP is served by an ``httpx.MockTransport``
+and the cache is the memory backend, so no network is needed:
+
+- cache_key: ``_get_cache_key_for_get_coin_quotes_method_params``
+- id_mapping: symbol <-> id lookups of both services
+- builder: ``from_cmc_raw_data``/``from_cgk_raw_data`` at several sizes
+- service: ``get_coin_quotes`` cache hit and cache miss (memory cache),-
+  and the cache hit with an ``InMemoryCollector``
+- convert_coin: the four conversion branches (cache hit)
+- portal: ``AnyCoin`` (sync portal) against ``AsyncAnyCoin``
+
+Results are written as JSON (``--output``) and can be compared with a-
+saved run (``--baseline``); the exit code is 1 when a stage is slower than-
+the baseline by more than ``--threshold``.
+
+Usage:
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --baseline baseline.json --threshold 0.25
+    python -m benchmarks.suite --filter builder convert_coin
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from decimal import Decimal
+from typing import Awaitable, Callable
+
+import httpx
+from aiocache import Cache
+
+from anycoin import AnyCoin, AsyncAnyCoin, CoinSymbols, QuoteSymbols
+from anycoin.cache import _get_cache_key_for_get_coin_quotes_method_params
+from anycoin.instrumentation import InMemoryCollector, Instrumentation
+from anycoin.response_models import CoinQuotes
+from anycoin.services.base import HTTPOptions
+from anycoin.services.coingecko import CoinGeckoService
+from anycoin.services.coinmarketcap import CoinMarketCapService
+
+from .normalization import CGK_QUOTE_IDS, CMC_QUOTE_IDS, _add_synthetic_ids
+
+BUILDER_SIZES = [10, 100, 1000]
+
+Results = dict[str, dict[str, float | int]]
+
+
+def _summary(timings: list[float], number: int) -> dict[str, float | int]:
+    """Per-call timings, in microseconds"""
+    per_call = [timing / number * 1_000_000 for timing in timings]
+    return {
+        'min_us': round(min(per_call), 3),
+        'median_us': round(statistics.median(per_call), 3),
+        'number': number,
+        'repeat': len(timings),
+    }
+
+
+def _measure(func: Callable[[], object], number: int, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append(time.perf_counter() - start)
+    return _summary(timings, number)
+
+
+async def _ameasure(
+    func: Callable[[], Awaitable[object]],
+    number: int,
+    repeat: int,
+    setup: Callable[[], Awaitable[object]] | None = None,
+) -> dict:
+    """``setup`` runs (untimed) before every round of ``number`` calls"""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            await setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            await func()
+        timings.append(time.perf_counter() - start)
+    return _summary(timings, number)
+
+
+def _cmc_handler(request: httpx.Request) -> httpx.Response:
+    """``/v2/cryptocurrency/quotes/latest`` with a price for every pair"""
+    coin_ids = request.url.params['id'].split(',')
+    convert_ids = request.url.params['convert_id'].split(',')
+    return httpx.Response(
+        200,
+        json={
+            'status': {'error_code': 0},
+            'data': {
+                coin_id: {
+                    'quote': {
+                        convert_id: {'price': 1234.5678 + i}
+                        for convert_id in convert_ids
+                    }
+                }
+                for i, coin_id in enumerate(coin_ids)
+            },
+        },
+    )
+
+
+def _get_service(
+    cache: Cache | None = None,
+    instrumentation: Instrumentation | None = None,
+) -> CoinMarketCapService:
+    return CoinMarketCapService(
+        api_key='benchmark',
+        cache=cache,
+        http_options=HTTPOptions(
+            client=httpx.AsyncClient(
+                transport=httpx.MockTransport(_cmc_handler)
+            )
+        ),
+        instrumentation=instrumentation,
+    )
+
+
+def bench_cache_key(results: Results, number: int, repeat: int) -> None:
+    for n_coins in (1, 19):
+        coins = list(CoinSymbols)[:n_coins]
+        results[f'cache_key.coins_{n_coins}'] = _measure(
+            lambda coins=coins: (
+                _get_cache_key_for_get_coin_quotes_method_params(
+                    coins=coins, quotes_in=list(QuoteSymbols)
+                )
+            ),
+            number=number,
+            repeat=repeat,
+        )
+
+
+async def bench_id_mapping(results: Results, number: int, repeat: int) -> None:
+    for name, func, arg in (
+        (
+            'cmc.coin_id_by_symbol',
+            CoinMarketCapService.get_coin_id_by_symbol,
+            CoinSymbols.btc,
+        ),
+        (
+            'cmc.coin_symbol_by_id',
+            CoinMarketCapService.get_coin_symbol_by_id,
+            '1',
+        ),
+        (
+            'cgk.coin_id_by_symbol',
+            CoinGeckoService.get_coin_id_by_symbol,
+            CoinSymbols.btc,
+        ),
+        (
+            'cgk.coin_symbol_by_id',
+            CoinGeckoService.get_coin_symbol_by_id,
+            'bitcoin',
+        ),
+    ):
+        await func(arg)  # Load the id tables
+        results[f'id_mapping.{name}'] = await _ameasure(
+            lambda func=func, arg=arg: func(arg), number=number, repeat=repeat
+        )
+
+
+async def bench_builder(results: Results, number: int, repeat: int) -> None:
+    cmc_ids, cgk_ids = await _add_synthetic_ids(max(BUILDER_SIZES))
+
+    for n_coins in BUILDER_SIZES:
+        cmc_raw_data = {
+            'data': {
+                coin_id: {
+                    'quote': {
+                        quote_id: {'price': 1234.5678 + i}
+                        for quote_id in CMC_QUOTE_IDS
+                    }
+                }
+                for i, coin_id in enumerate(cmc_ids[:n_coins])
+            }
+        }
+        cgk_raw_data = {
+            coin_id: {quote_id: 1234.5678 + i for quote_id in CGK_QUOTE_IDS}
+            for i, coin_id in enumerate(cgk_ids[:n_coins])
+        }
+
+        # Fewer calls for the large responses
+        calls = max(1, number * 10 // n_coins)
+        results[f'builder.cmc.coins_{n_coins}'] = await _ameasure(
+            lambda raw_data=cmc_raw_data: CoinQuotes.from_cmc_raw_data(
+                raw_data
+            ),
+            number=calls,
+            repeat=repeat,
+        )
+        results[f'builder.cgk.coins_{n_coins}'] = await _ameasure(
+            lambda raw_data=cgk_raw_data: CoinQuotes.from_cgk_raw_data(
+                raw_data
+            ),
+            number=calls,
+            repeat=repeat,
+        )
+
+
+async def bench_service(results: Results, number: int, repeat: int) -> None:
+    cache = Cache(Cache.MEMORY)
+    service = _get_service(cache=cache)
+    coins = [CoinSymbols.btc, CoinSymbols.eth, CoinSymbols.ltc]
+    quotes_in = [QuoteSymbols.usd, QuoteSymbols.eur]
+
+    async def get_coin_quotes() -> CoinQuotes:
+        return await service.get_coin_quotes(coins=coins, quotes_in=quotes_in)
+
+    # The miss includes the (mocked) HTTP request and the normalization
+    results['service.cache_miss'] = await _ameasure(
+        get_coin_quotes, number=1, repeat=repeat * 10, setup=cache.clear
+    )
+
+    await get_coin_quotes()
+    results['service.cache_hit'] = await _ameasure(
+        get_coin_quotes, number=number, repeat=repeat
+    )
+    await service.aclose()
+
+    # Same cache hit reporting to an in-memory collector
+    service = _get_service(
+        cache=Cache(Cache.MEMORY), instrumentation=InMemoryCollector()
+    )
+    await get_coin_quotes()
+    results['service.cache_hit_instrumented'] = await _ameasure(
+        get_coin_quotes, number=number, repeat=repeat
+    )
+    await service.aclose()
+
+
+CONVERSIONS = {
+    'coin_to_quote': (CoinSymbols.btc, QuoteSymbols.usd),
+    'coin_to_coin': (CoinSymbols.btc, CoinSymbols.eth),
+    'quote_to_coin': (QuoteSymbols.usd, CoinSymbols.btc),
+    'quote_to_quote': (QuoteSymbols.usd, QuoteSymbols.eur),
+}
+
+
+async def bench_convert_coin(
+    results: Results, number: int, repeat: int
+) -> None:
+    async with AsyncAnyCoin(
+        api_services=[_get_service(cache=Cache(Cache.MEMORY))]
+    ) as anycoin:
+        for name, (from_coin, to_coin) in CONVERSIONS.items():
+
+            async def convert(from_coin=from_coin, to_coin=to_coin):
+                return await anycoin.convert_coin(
+                    Decimal('1.5'), from_coin=from_coin, to_coin=to_coin
+                )
+
+            await convert()  # Cache the rates
+            results[f'convert_coin.{name}'] = await _ameasure(
+                convert, number=number, repeat=repeat
+            )
+
+
+async def _bench_portal_async(number: int, repeat: int) -> dict:
+    async with AsyncAnyCoin(
+        api_services=[_get_service(cache=Cache(Cache.MEMORY))]
+    ) as anycoin:
+
+        async def get_coin_quotes():
+            return await anycoin.get_coin_quotes(
+                coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+            )
+
+        await get_coin_quotes()
+        return await _ameasure(get_coin_quotes, number=number, repeat=repeat)
+
+
+def bench_portal(results: Results, number: int, repeat: int) -> None:
+    """Same cache hit through ``AsyncAnyCoin`` and through ``AnyCoin``"""
+    results['portal.async'] = asyncio.run(_bench_portal_async(number, repeat))
+
+    with AnyCoin(
+        api_services=[_get_service(cache=Cache(Cache.MEMORY))]
+    ) as anycoin:
+
+        def get_coin_quotes():
+            return anycoin.get_coin_quotes(
+                coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+            )
+
+        get_coin_quotes()
+        results['portal.sync'] = _measure(
+            get_coin_quotes, number=number, repeat=repeat
+        )
+
+
+async def _run_async_stages(
+    stages: list[str], results: Results, number: int, repeat: int
+) -> None:
+    for stage, bench in (
+        ('id_mapping', bench_id_mapping),
+        ('builder', bench_builder),
+        ('service', bench_service),
+        ('convert_coin', bench_convert_coin),
+    ):
+        if stage in stages:
+            await bench(results, number=number, repeat=repeat)
+
+
+def run(stages: list[str], number: int, repeat: int) -> Results:
+    results: Results = {}
+    if 'cache_key' in stages:
+        bench_cache_key(results, number=number, repeat=repeat)
+
+    asyncio.run(_run_async_stages(stages, results, number, repeat))
+
+    if 'portal' in stages:
+        bench_portal(results, number=number, repeat=repeat)
+
+    return results
+
+
+def compare(
+    results: Results, baseline: Results, threshold: float
+) -> list[str]:
+    """Print each stage against the baseline and return the regressions"""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            print(f'{name:<36} {result["median_us"]:>12.3f} us  (new)')
+            continue
+
+        ratio = result['median_us'] / baseline[name]['median_us']
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(
+            f'{name:<36} {result["median_us"]:>12.3f} us  '
+            f'baseline {baseline[name]["median_us"]:>12.3f} us  '
+            f'{ratio:6.2f}x{flag}'
+        )
+    return regressions
+
+
+STAGES = [
+    'cache_key',
+    'id_mapping',
+    'builder',
+    'service',
+    'convert_coin',
+    'portal',
+]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--filter', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--number', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--output', help='Write the results to this file')
+    parser.add_argument('--baseline', help='Compare with a saved run')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.25,
+        help='Allowed slowdown against the baseline (0.25 = 25%%)',
+    )
+    args = parser.parse_args()
+
+    results = run(args.filter, number=args.number, repeat=args.repeat)
+    report = {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+
+    if not args.baseline:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as file:
+        baseline: Results = json.load(file)['results']
+
+    regressions = compare(results, baseline, args.threshold)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# ruff: noqa: PLC2701
+
+"""
+Memory and lookup cost of the symbol registry at 10k+ assets.
+
+Registers ``--assets`` synthetic coins (with CoinMarketCap and CoinGecko-
+ids) and compares the registry with an ``Enum`` of the same size (what-
+``CoinSymbols`` used to be): memory per symbol, lookup by value, lookup-
+by provider id and pydantic validation of a ``dict[CoinSymbols, ...]``.
+
+Usage:
+    python -m benchmarks.symbols --assets 10000 50000
+"""
+
+import argparse
+import enum
+import time
+import tracemalloc
+
+from pydantic import TypeAdapter
+
+from anycoin import CoinSymbols
+
+
+def _time(func, number: int) -> float:
+    """Best time per call of 5 runs of ``number`` calls, in nanoseconds"""
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings) * 1e9
+
+
+def _register(start: int, n_assets: int) -> list[str]:
+    values = [f'asset{i}' for i in range(start, start + n_assets)]
+    for i, value in enumerate(values, start):
+        CoinSymbols.register(
+            value,
+            provider_ids={
+                'coinmarketcap': str(20_000_000 + i),
+                'coingecko': f'asset-{i}',
+            },
+        )
+    return values
+
+
+def main(asset_counts: list[int]) -> None:
+    registered = 0
+    for n_assets in asset_counts:
+        tracemalloc.start()
+        values = _register(registered, n_assets)
+        registry_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        enum_class = enum.Enum('EnumSymbols', {v: v for v in values})
+        enum_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        registered += n_assets
+
+        value = values[n_assets // 2]
+        cmc_id = str(20_000_000 + registered - n_assets + n_assets // 2)
+        members = [CoinSymbols(v) for v in values[:1000]]
+        registry_adapter = TypeAdapter(dict[CoinSymbols, int])
+        enum_adapter = TypeAdapter(dict[enum_class, int])
+        registry_keys = dict.fromkeys(values[:1000], 1)
+
+        print(f'{n_assets} assets (registry size {len(CoinSymbols)})')
+        print(
+            f'  memory per symbol: registry {registry_bytes / n_assets:.0f} B '
+            f'(with 2 provider ids), enum {enum_bytes / n_assets:.0f} B'
+        )
+        print(
+            f'  lookup by value:   registry '
+            f'{_time(lambda: CoinSymbols(value), 100_000):.0f} ns, enum '
+            f'{_time(lambda: enum_class(value), 100_000):.0f} ns'
+        )
+        print(
+            '  by provider id:    registry '
+            f'{_time(lambda: CoinSymbols.from_provider_id("coinmarketcap", cmc_id), 100_000):.0f} ns'  # noqa: E501
+        )
+        print(
+            '  validate 1000 keys: registry '
+            f'{_time(lambda: registry_adapter.validate_python(registry_keys), 20) / 1000:.0f} us, '  # noqa: E501
+            f'enum {_time(lambda: enum_adapter.validate_python(registry_keys), 20) / 1000:.0f} us'  # noqa: E501
+        )
+        del members
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument(
+        '--assets', type=int, nargs='+', default=[10_000, 50_000]
+    )
+    args = parser.parse_args()
+
+    main(args.assets)
@@ -24,16 +24,16 @@ api_services = [
 
 
 async def main() -> None:
-    anycoin = AsyncAnyCoin(api_services=api_services)
-
-    result: CoinQuotes = await anycoin.get_coin_quotes(
-        coins=[
-            CoinSymbols.btc,
-            CoinSymbols('trx'),  # A string can be passed
-        ],
-        quotes_in=[QuoteSymbols.usd, QuoteSymbols.eur, QuoteSymbols.brl],
-    )
-    print(result)
+    # Closing AsyncAnyCoin closes the HTTP connection pool of each service
+    async with AsyncAnyCoin(api_services=api_services) as anycoin:
+        result: CoinQuotes = await anycoin.get_coin_quotes(
+            coins=[
+                CoinSymbols.btc,
+                CoinSymbols('trx'),  # A string can be passed
+            ],
+            quotes_in=[QuoteSymbols.usd, QuoteSymbols.eur, QuoteSymbols.brl],
+        )
+        print(result)
 
 
 if __name__ == '__main__':
@@ -1,19 +1,76 @@
+import asyncio
+import threading
+import time
+from datetime import datetime
 from decimal import Decimal
 from http import HTTPStatus
 
+import anyio
 import httpx
 import pytest
 import respx
 
 from anycoin import AsyncAnyCoin, CoinSymbols, QuoteSymbols
+from anycoin.circuit_breaker import CircuitBreakerPolicy, CircuitState
 from anycoin.exeptions import ConvertCoin as ConvertCoinException
 from anycoin.exeptions import GetCoinQuotes as GetCoinQuotesException
-from anycoin.response_models import CoinQuotes
+from anycoin.exeptions import GetOHLCV as GetOHLCVException
+from anycoin.exeptions import NotSupported as NotSupportedException
+from anycoin.instrumentation import InMemoryCollector
+from anycoin.quote_store import QuoteStore
+from anycoin.rate_limit import RateLimit, RateLimiter
+from anycoin.response_models import (
+    CoinQuotes,
+    CoinRow,
+    QuoteRow,
+)
+from anycoin.services.base import BaseAPIService, RequestOptions
 from anycoin.services.coingecko import CoinGeckoService
 
 pytestmark: pytest.MarkDecorator = pytest.mark.asyncio(loop_scope='session')
 
 
+class FakeAPIService(BaseAPIService):
+    def __init__(self, name: str, delay: float = 0, fail: bool = False):
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.requests = []
+        self.cancelled = False
+
+    async def get_coin_quotes(self, coins, quotes_in) -> CoinQuotes:
+        self.calls += 1
+        self.requests.append((coins, quotes_in))
+        try:
+            await anyio.sleep(self.delay)
+        except anyio.get_cancelled_exc_class():
+            self.cancelled = True
+            raise
+
+        if CoinSymbols.not_ in coins:
+            raise GetCoinQuotesException('fake error') from (
+                NotSupportedException('coin not supported')
+            )
+        if self.fail:
+            raise GetCoinQuotesException('fake error')
+
+        return CoinQuotes(
+            coins={
+                coin: CoinRow(
+                    quotes={
+                        quote: QuoteRow(quote=Decimal(index + 1))
+                        for quote in quotes_in
+                    }
+                )
+                for index, coin in enumerate(coins)
+            },
+            api_service='coingecko',
+            raw_data={'name': self.name},
+        )
+
+
 def test_asyncanycoin_api_services_empty():
     with pytest.raises(RuntimeError, match='At least one service is required'):
         AsyncAnyCoin(api_services=[])
@@ -198,3 +255,691 @@ async def test_convert_coin_conversion_error():
             from_coin='invalid-type',
             to_coin=QuoteSymbols.brl,
         )
+
+
+@respx.mock
+async def test_aclose():
+    EXAMPLE_RESPONSE = {'bitcoin': {'usd': 100811}}
+
+    # Mock api request
+    respx.get('https://pro-api.coingecko.com/api/v3/simple/price').mock(
+        httpx.Response(
+            status_code=200,
+            json=EXAMPLE_RESPONSE,
+        )
+    )
+
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>',
+    )
+
+    async with AsyncAnyCoin(api_services=[cgk_service]) as anyc:
+        await anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+        client = cgk_service._get_http_client()
+        assert not client.is_closed
+
+    assert client.is_closed
+
+
+async def test_get_coin_quotes_failover_is_sequential_by_default():
+    slow_service = FakeAPIService('slow', delay=0.2)
+    fast_service = FakeAPIService('fast')
+
+    anyc = AsyncAnyCoin(api_services=[slow_service, fast_service])
+    result: CoinQuotes = await anyc.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+
+    assert result.raw_data == {'name': 'slow'}
+    assert fast_service.calls == 0
+
+
+async def test_get_coin_quotes_hedged_slow_service():
+    slow_service = FakeAPIService('slow', delay=5)
+    fast_service = FakeAPIService('fast')
+
+    anyc = AsyncAnyCoin(
+        api_services=[slow_service, fast_service], hedge_delay=0.05
+    )
+    start = time.monotonic()
+    result: CoinQuotes = await anyc.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+
+    assert time.monotonic() - start < 1
+    assert result.raw_data == {'name': 'fast'}
+    assert slow_service.cancelled  # The losing call is cancelled
+
+
+async def test_get_coin_quotes_hedged_first_service_wins():
+    first_service = FakeAPIService('first')
+    second_service = FakeAPIService('second')
+
+    anyc = AsyncAnyCoin(
+        api_services=[first_service, second_service], hedge_delay=0.5
+    )
+    result: CoinQuotes = await anyc.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+
+    assert result.raw_data == {'name': 'first'}
+    assert second_service.calls == 0
+
+
+async def test_get_coin_quotes_hedged_failure_starts_next_service():
+    failing_service = FakeAPIService('failing', fail=True)
+    service = FakeAPIService('ok')
+
+    anyc = AsyncAnyCoin(
+        api_services=[failing_service, service], hedge_delay=10
+    )
+    with anyio.fail_after(1):  # Does not wait for hedge_delay
+        result: CoinQuotes = await anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+
+    assert result.raw_data == {'name': 'ok'}
+
+
+async def test_get_coin_quotes_race_all_services():
+    services = [
+        FakeAPIService('a', delay=0.3),
+        FakeAPIService('b', delay=0.1),
+        FakeAPIService('c', delay=0.2),
+    ]
+
+    anyc = AsyncAnyCoin(api_services=services, hedge_delay=0)
+    result: CoinQuotes = await anyc.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+
+    assert result.raw_data == {'name': 'b'}
+    assert all(service.calls == 1 for service in services)
+    assert services[0].cancelled
+    assert services[2].cancelled
+
+
+async def test_get_coin_quotes_hedged_all_services_fail():
+    anyc = AsyncAnyCoin(
+        api_services=[
+            FakeAPIService('a', fail=True),
+            FakeAPIService('b', fail=True),
+        ],
+        hedge_delay=0,
+    )
+
+    with pytest.raises(
+        GetCoinQuotesException, match='Unable to get quote through services'
+    ):
+        await anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+
+
+async def test_get_coin_quotes_circuit_breaker_skips_open_service():
+    failing_service = FakeAPIService('failing', fail=True)
+    service = FakeAPIService('ok')
+
+    anyc = AsyncAnyCoin(
+        api_services=[failing_service, service],
+        circuit_breaker_policy=CircuitBreakerPolicy(minimum_calls=2),
+    )
+    for _ in range(5):
+        result: CoinQuotes = await anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+        assert result.raw_data == {'name': 'ok'}
+
+    assert failing_service.calls == 2  # noqa: PLR2004
+    assert service.calls == 5  # noqa: PLR2004
+
+    breakers = anyc.circuit_breakers
+    assert breakers[failing_service].state is CircuitState.open
+    assert breakers[service].state is CircuitState.closed
+    assert breakers[service].health_score == 1.0
+
+
+async def test_get_coin_quotes_hedged_circuit_breaker_skips_open_service():
+    failing_service = FakeAPIService('failing', fail=True)
+    service = FakeAPIService('ok')
+
+    anyc = AsyncAnyCoin(
+        api_services=[failing_service, service],
+        hedge_delay=10,
+        circuit_breaker_policy=CircuitBreakerPolicy(minimum_calls=1),
+    )
+    for _ in range(3):
+        with anyio.fail_after(1):
+            await anyc.get_coin_quotes(
+                coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+            )
+
+    assert failing_service.calls == 1
+
+
+async def test_get_coin_quotes_circuit_breaker_all_open():
+    anyc = AsyncAnyCoin(
+        api_services=[FakeAPIService('failing', fail=True)],
+        circuit_breaker_policy=CircuitBreakerPolicy(minimum_calls=1),
+    )
+    for _ in range(2):
+        with pytest.raises(
+            GetCoinQuotesException,
+            match='Unable to get quote through services',
+        ):
+            await anyc.get_coin_quotes(
+                coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+            )
+
+
+async def test_get_coin_quotes_hedged_cancelled_trial_call_is_released():
+    service = FakeAPIService('a', fail=True)
+    other_service = FakeAPIService('b', delay=0.05)
+
+    anyc = AsyncAnyCoin(
+        api_services=[service, other_service],
+        hedge_delay=0,
+        circuit_breaker_policy=CircuitBreakerPolicy(
+            minimum_calls=1, cool_down=0.05
+        ),
+    )
+    await anyc.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    breaker = anyc.circuit_breakers[service]
+    assert breaker.state is CircuitState.open
+
+    await anyio.sleep(0.1)
+    service.fail, service.delay = False, 1
+    result: CoinQuotes = await anyc.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    assert result.raw_data == {'name': 'b'}
+    assert service.cancelled  # The trial call lost the race
+
+    service.delay = 0
+    result: CoinQuotes = await anyc.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    assert result.raw_data == {'name': 'a'}
+    assert breaker.state is CircuitState.closed
+
+
+async def test_get_coin_quotes_coin_not_supported_does_not_open_circuit():
+    coin = CoinSymbols.register('not-supported-by-any-service')
+    service = CoinGeckoService(api_key='key')
+    other_service = FakeAPIService('ok')
+
+    anyc = AsyncAnyCoin(
+        api_services=[service, other_service],
+        circuit_breaker_policy=CircuitBreakerPolicy(minimum_calls=1),
+    )
+    for _ in range(5):
+        await anyc.get_coin_quotes(coins=[coin], quotes_in=[QuoteSymbols.usd])
+
+    assert anyc.circuit_breakers[service].state is CircuitState.closed
+    assert anyc.circuit_breakers[service].error_rate == 0.0
+
+
+def test_circuit_breakers_empty_without_policy():
+    anyc = AsyncAnyCoin(api_services=[FakeAPIService('a')])
+    assert anyc.circuit_breakers == {}
+
+
+async def test_get_coin_quotes_batched():
+    service = FakeAPIService('a')
+
+    anyc = AsyncAnyCoin(api_services=[service], batch_window=0.05)
+    btc_usd, eth_usd, btc_eur = await asyncio.gather(
+        anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        ),
+        anyc.get_coin_quotes(
+            coins=[CoinSymbols.eth], quotes_in=[QuoteSymbols.usd]
+        ),
+        anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.eur]
+        ),
+    )
+
+    assert service.requests == [
+        (
+            [CoinSymbols.btc, CoinSymbols.eth],
+            [QuoteSymbols.usd, QuoteSymbols.eur],
+        )
+    ]
+    assert btc_usd.model_dump()['coins'] == {
+        CoinSymbols.btc: {'quotes': {QuoteSymbols.usd: {'quote': 1}}}
+    }
+    assert eth_usd.model_dump()['coins'] == {
+        CoinSymbols.eth: {'quotes': {QuoteSymbols.usd: {'quote': 2}}}
+    }
+    assert btc_eur.model_dump()['coins'] == {
+        CoinSymbols.btc: {'quotes': {QuoteSymbols.eur: {'quote': 1}}}
+    }
+
+
+async def test_get_coin_quotes_batched_failure_is_isolated():
+    service = FakeAPIService('a')
+
+    anyc = AsyncAnyCoin(api_services=[service], batch_window=0.05)
+    results = await asyncio.gather(
+        anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        ),
+        anyc.get_coin_quotes(
+            coins=[CoinSymbols.not_], quotes_in=[QuoteSymbols.usd]
+        ),
+        return_exceptions=True,
+    )
+
+    assert list(results[0].coins) == [CoinSymbols.btc]
+    assert isinstance(results[1], GetCoinQuotesException)
+    assert service.requests[1:] == [
+        ([CoinSymbols.btc], [QuoteSymbols.usd]),
+        ([CoinSymbols.not_], [QuoteSymbols.usd]),
+    ]
+
+
+async def test_get_coin_quotes_batched_failure_is_shared():
+    service = FakeAPIService('a', fail=True)
+
+    anyc = AsyncAnyCoin(api_services=[service], batch_window=0.05)
+    results = await asyncio.gather(
+        *(
+            anyc.get_coin_quotes(coins=[coin], quotes_in=[QuoteSymbols.usd])
+            for coin in (CoinSymbols.btc, CoinSymbols.eth, CoinSymbols.sol)
+        ),
+        return_exceptions=True,
+    )
+
+    # The services are down: one request, not one more per caller
+    assert service.calls == 1
+    assert all(
+        isinstance(result, GetCoinQuotesException) for result in results
+    )
+
+
+async def test_get_coin_quotes_batched_single_call():
+    service = FakeAPIService('a', fail=True)
+
+    anyc = AsyncAnyCoin(api_services=[service], batch_window=0)
+    with pytest.raises(
+        GetCoinQuotesException, match='Unable to get quote through services'
+    ):
+        await anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+
+    assert service.calls == 1
+
+
+async def test_get_coin_quotes_instrumentation():
+    collector = InMemoryCollector()
+    anycoin = AsyncAnyCoin(
+        api_services=[
+            FakeAPIService('first', fail=True),
+            FakeAPIService('second'),
+        ],
+        instrumentation=collector,
+    )
+
+    await anycoin.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+
+    assert collector.failovers['FakeAPIService'] == 1
+    assert collector.service_errors['FakeAPIService'] == 1
+    assert len(collector.service_calls['FakeAPIService']) == 2  # noqa: PLR2004
+
+
+async def test_get_coin_quotes_many():
+    service = FakeAPIService('a')
+    anyc = AsyncAnyCoin(api_services=[service])
+
+    btc_usd, eth_eur = await anyc.get_coin_quotes_many(
+        requests=[
+            ([CoinSymbols.btc], [QuoteSymbols.usd]),
+            ([CoinSymbols.eth], [QuoteSymbols.eur]),
+        ],
+    )
+
+    assert service.requests == [
+        (
+            [CoinSymbols.btc, CoinSymbols.eth],
+            [QuoteSymbols.usd, QuoteSymbols.eur],
+        )
+    ]
+    assert btc_usd.model_dump()['coins'] == {
+        CoinSymbols.btc: {'quotes': {QuoteSymbols.usd: {'quote': 1}}}
+    }
+    assert eth_eur.model_dump()['coins'] == {
+        CoinSymbols.eth: {'quotes': {QuoteSymbols.eur: {'quote': 2}}}
+    }
+
+
+async def test_get_coin_quotes_many_empty():
+    service = FakeAPIService('a')
+    anyc = AsyncAnyCoin(api_services=[service])
+
+    assert await anyc.get_coin_quotes_many(requests=[]) == []
+    assert service.calls == 0
+
+
+async def test_convert_many():
+    service = FakeAPIService('a')
+    anyc = AsyncAnyCoin(api_services=[service])
+
+    results = await anyc.convert_many(
+        conversions=[
+            (2, CoinSymbols.btc, QuoteSymbols.usd),
+            (1, CoinSymbols.btc, CoinSymbols.eth),
+            (3, QuoteSymbols.usd, QuoteSymbols.eur),
+            (4, QuoteSymbols.usd, CoinSymbols.eth),
+        ]
+    )
+
+    # btc and eth are 1 and 2; btc is also the usd to eur pivot
+    assert results == [Decimal(2), Decimal('0.5'), Decimal(3), Decimal(2)]
+    assert service.requests == [
+        (
+            [CoinSymbols.btc, CoinSymbols.eth],
+            [QuoteSymbols.usd, QuoteSymbols.eur],
+        )
+    ]
+
+
+async def test_convert_coin_rates_max_age_reuses_prices():
+    service = FakeAPIService('a')
+    anyc = AsyncAnyCoin(api_services=[service], rates_max_age=60)
+
+    btc_eth = await anyc.convert_coin(1, CoinSymbols.btc, CoinSymbols.eth)
+    eth_btc = await anyc.convert_coin(4, CoinSymbols.eth, CoinSymbols.btc)
+    eth_brl = await anyc.convert_coin(1, CoinSymbols.eth, QuoteSymbols.brl)
+
+    assert btc_eth == Decimal('0.5')
+    assert eth_btc == Decimal(8)
+    assert eth_brl == Decimal(1)
+    # eth to brl only fetches the missing price
+    assert service.requests == [
+        ([CoinSymbols.btc, CoinSymbols.eth], [QuoteSymbols.usd]),
+        ([CoinSymbols.eth], [QuoteSymbols.brl]),
+    ]
+
+
+async def test_convert_coin_rates_max_age_expired():
+    service = FakeAPIService('a')
+    anyc = AsyncAnyCoin(api_services=[service], rates_max_age=0.01)
+
+    await anyc.convert_coin(1, CoinSymbols.btc, QuoteSymbols.usd)
+    await asyncio.sleep(0.02)
+    await anyc.convert_coin(1, CoinSymbols.btc, QuoteSymbols.usd)
+
+    assert service.calls == 2  # noqa: PLR2004
+
+
+async def test_convert_coin_quote_to_quote_pivot_by_availability():
+    service = FakeAPIService('a')
+    anyc = AsyncAnyCoin(api_services=[service], rates_max_age=60)
+
+    await anyc.get_coin_quotes(
+        coins=[CoinSymbols.eth], quotes_in=[QuoteSymbols.usd]
+    )
+    result = await anyc.convert_coin(2, QuoteSymbols.usd, QuoteSymbols.eur)
+
+    assert result == Decimal(2)
+    # eth already has a usd price: no usdt
+    assert service.requests[1] == (
+        [CoinSymbols.eth],
+        [QuoteSymbols.usd, QuoteSymbols.eur],
+    )
+
+
+async def test_convert_many_conversion_error():
+    service = FakeAPIService('a')
+    anyc = AsyncAnyCoin(api_services=[service])
+
+    with pytest.raises(ConvertCoinException, match='Invalid conversion'):
+        await anyc.convert_many(
+            conversions=[
+                (1, CoinSymbols.btc, QuoteSymbols.usd),
+                (1, 'btc', 'usd'),
+            ]
+        )
+
+    assert service.calls == 0
+
+
+@respx.mock
+async def test_get_ohlcv_failover():
+    route = respx.get(
+        'https://pro-api.coingecko.com/api/v3/coins/bitcoin/ohlc/range'
+    ).mock(
+        return_value=httpx.Response(
+            200, json=[[1733875200000, 96000, 98000, 95000, 97000.5]]
+        )
+    )
+    collector = InMemoryCollector()
+    anyc = AsyncAnyCoin(
+        api_services=[
+            FakeAPIService('no-ohlcv'),  # Skipped: no ``_get_ohlcv``
+            CoinGeckoService(api_key='<api-key>'),
+        ],
+        instrumentation=collector,
+    )
+
+    result = await anyc.get_ohlcv(
+        coins=[CoinSymbols.btc],
+        quotes_in=[QuoteSymbols.usd],
+        start=datetime(2024, 12, 10),
+        end=datetime(2024, 12, 11),
+    )
+
+    assert route.call_count == 1
+    assert result.api_service == 'coingecko'
+    assert result[CoinSymbols.btc, QuoteSymbols.usd].close == (
+        Decimal('97000.5'),
+    )
+    assert 'FakeAPIService' not in collector.failovers
+
+
+@respx.mock
+async def test_get_ohlcv_failover_when_rate_limited():
+    respx.get(
+        'https://pro-api.coingecko.com/api/v3/coins/bitcoin/ohlc/range'
+    ).mock(
+        return_value=httpx.Response(
+            200, json=[[1733875200000, 96000, 98000, 95000, 97000.5]]
+        )
+    )
+    rate_limiter = RateLimiter([RateLimit(1, 60)], max_queue=0)
+    await rate_limiter.acquire()  # The next request would have to wait
+    collector = InMemoryCollector()
+    anyc = AsyncAnyCoin(
+        api_services=[
+            CoinGeckoService(
+                api_key='<api-key>',
+                request_options=RequestOptions(rate_limiter=rate_limiter),
+            ),
+            CoinGeckoService(api_key='<api-key>'),
+        ],
+        instrumentation=collector,
+    )
+
+    result = await anyc.get_ohlcv(
+        coins=[CoinSymbols.btc],
+        quotes_in=[QuoteSymbols.usd],
+        start=datetime(2024, 12, 10),
+        end=datetime(2024, 12, 11),
+    )
+
+    assert result.api_service == 'coingecko'
+    assert collector.failovers['CoinGeckoService'] == 1
+
+
+def test_get_ohlcv_error_is_not_a_get_coin_quotes_error():
+    assert not issubclass(GetOHLCVException, GetCoinQuotesException)
+
+
+async def test_get_ohlcv_skips_services_without_ohlcv():
+    service = FakeAPIService('no-ohlcv')
+    anyc = AsyncAnyCoin(
+        api_services=[service],
+        circuit_breaker_policy=CircuitBreakerPolicy(minimum_calls=1),
+    )
+
+    with pytest.raises(GetOHLCVException, match='Unable to get OHLCV'):
+        await anyc.get_ohlcv(
+            coins=[CoinSymbols.btc],
+            quotes_in=[QuoteSymbols.usd],
+            start=datetime(2024, 12, 10),
+            end=datetime(2024, 12, 11),
+        )
+
+    assert anyc.circuit_breakers[service].state is CircuitState.closed
+    assert anyc.circuit_breakers[service].error_rate == 0.0
+
+
+async def test_get_ohlcv_coin_not_supported_does_not_open_circuit():
+    coin = CoinSymbols.register('not-supported-by-any-service')
+    service = CoinGeckoService(api_key='key')
+    anyc = AsyncAnyCoin(
+        api_services=[service],
+        circuit_breaker_policy=CircuitBreakerPolicy(minimum_calls=1),
+    )
+
+    for _ in range(5):
+        with pytest.raises(GetOHLCVException):
+            await anyc.get_ohlcv(
+                coins=[coin],
+                quotes_in=[QuoteSymbols.usd],
+                start=datetime(2024, 12, 10),
+                end=datetime(2024, 12, 11),
+            )
+
+    assert anyc.circuit_breakers[service].state is CircuitState.closed
+    assert anyc.circuit_breakers[service].error_rate == 0.0
+
+
+async def test_get_ohlcv_all_services_fail():
+    anyc = AsyncAnyCoin(api_services=[FakeAPIService('a')])
+
+    with pytest.raises(
+        GetOHLCVException, match='Unable to get OHLCV through services'
+    ):
+        await anyc.get_ohlcv(
+            coins=[CoinSymbols.btc],
+            quotes_in=[QuoteSymbols.usd],
+            start=datetime(2024, 12, 10),
+            end=datetime(2024, 12, 11),
+        )
+
+
+async def test_get_coin_quotes_quote_store():
+    service = FakeAPIService('a')
+    with QuoteStore(max_age=60) as quote_store:
+        anyc = AsyncAnyCoin(api_services=[service], quote_store=quote_store)
+
+        first = await anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc, CoinSymbols.eth],
+            quotes_in=[QuoteSymbols.usd],
+        )
+        # Served from the store, subsets included
+        second = await anyc.get_coin_quotes(
+            coins=[CoinSymbols.eth], quotes_in=[QuoteSymbols.usd]
+        )
+        await anyc.get_coin_quotes(
+            coins=[CoinSymbols.sol], quotes_in=[QuoteSymbols.usd]
+        )
+        await anyc.aclose()
+
+        assert service.calls == 2  # noqa: PLR2004
+        assert (
+            second.coins
+            == first.subset(
+                coins=[CoinSymbols.eth], quotes_in=[QuoteSymbols.usd]
+            ).coins
+        )
+        assert (
+            len(
+                quote_store.get_prices(
+                    CoinSymbols.sol, QuoteSymbols.usd, start=0, end=time.time()
+                )
+            )
+            == 1
+        )
+
+
+async def test_get_coin_quotes_quote_store_records_fetch_time():
+    fetched_at = time.time() - 30  # e.g. a cached result
+
+    class CachedAPIService(FakeAPIService):
+        async def get_coin_quotes(self, coins, quotes_in) -> CoinQuotes:
+            coin_quotes = await super().get_coin_quotes(coins, quotes_in)
+            coin_quotes.fetched_at = fetched_at
+            return coin_quotes
+
+    with QuoteStore(max_age=60) as quote_store:
+        anyc = AsyncAnyCoin(
+            api_services=[CachedAPIService('a')], quote_store=quote_store
+        )
+        await anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+        await anyc.aclose()
+
+        (stored,) = quote_store.get_prices(
+            CoinSymbols.btc, QuoteSymbols.usd, start=0, end=time.time()
+        )
+        assert stored.time == fetched_at
+
+
+async def test_get_coin_quotes_quote_store_reads_database_in_thread(
+    tmp_path,
+):
+    path = tmp_path / 'quotes.sqlite3'
+    with QuoteStore(path) as quote_store:
+        quote_store.add(
+            await FakeAPIService('a').get_coin_quotes(
+                coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+            )
+        )
+
+    service = FakeAPIService('b')
+    with QuoteStore(path, max_age=60) as quote_store:
+        threads = []
+        get_latest = quote_store._get_latest
+
+        def _get_latest(*args):
+            threads.append(threading.current_thread())
+            return get_latest(*args)
+
+        quote_store._get_latest = _get_latest
+        anyc = AsyncAnyCoin(api_services=[service], quote_store=quote_store)
+
+        for _ in range(2):
+            await anyc.get_coin_quotes(
+                coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+            )
+
+    assert service.calls == 0
+    # Only the first lookup read the database, outside the event loop
+    assert threads[0] is not threading.main_thread()
+    assert threads[1] is threading.main_thread()
+
+
+async def test_get_coin_quotes_quote_store_closed():
+    service = FakeAPIService('a')
+    quote_store = QuoteStore(max_age=60)
+    quote_store.close()
+    anyc = AsyncAnyCoin(api_services=[service], quote_store=quote_store)
+
+    result = await anyc.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    await anyc.aclose()
+
+    assert service.calls == 1
+    assert result.coins[CoinSymbols.btc]
@@ -1,9 +1,13 @@
+import threading
+from datetime import datetime
 from decimal import Decimal
 from http import HTTPStatus
 
 import httpx
 import pytest
 import respx
+from aiocache import Cache
+from aiocache.base import BaseCache
 
 from anycoin import AnyCoin, CoinSymbols, QuoteSymbols
 from anycoin.exeptions import ConvertCoin as ConvertCoinException
@@ -196,3 +200,198 @@ def test_convert_coin_conversion_error():
             from_coin='invalid-type',
             to_coin=QuoteSymbols.brl,
         )
+
+
+@respx.mock
+def test_close():
+    EXAMPLE_RESPONSE = {'bitcoin': {'usd': 100811}}
+
+    # Mock api request
+    respx.get('https://pro-api.coingecko.com/api/v3/simple/price').mock(
+        httpx.Response(
+            status_code=200,
+            json=EXAMPLE_RESPONSE,
+        )
+    )
+
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>',
+    )
+
+    with AnyCoin(api_services=[cgk_service]) as anyc:
+        anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+        (client,) = cgk_service._http_clients.values()
+        assert not client.is_closed
+
+    assert client.is_closed
+
+
+@respx.mock
+def test_get_coin_quotes_hedged():
+    EXAMPLE_RESPONSE = {'bitcoin': {'usd': 100811}}
+
+    # Mock api request
+    respx.get('https://pro-api.coingecko.com/api/v3/simple/price').mock(
+        httpx.Response(
+            status_code=200,
+            json=EXAMPLE_RESPONSE,
+        )
+    )
+
+    anyc = AnyCoin(
+        api_services=[
+            CoinGeckoService(api_key='<api-key>'),
+            CoinGeckoService(api_key='<api-key>'),
+        ],
+        hedge_delay=0,
+    )
+
+    result: CoinQuotes = anyc.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    assert result.raw_data == EXAMPLE_RESPONSE
+
+
+def test_anycoin_portals_less_than_one():
+    with pytest.raises(ValueError, match='portals must be at least 1'):
+        AnyCoin(
+            api_services=[CoinGeckoService(api_key='<api-key>')], portals=0
+        )
+
+
+def test_anycoin_portals_with_loop_bound_cache():
+    cache = BaseCache()  # e.g. a Redis or Memcached cache
+    with pytest.raises(
+        RuntimeError, match='portals > 1 is only supported with the memory'
+    ):
+        AnyCoin(
+            api_services=[CoinGeckoService(api_key='<api-key>', cache=cache)],
+            portals=2,
+        )
+
+
+@respx.mock
+def test_get_coin_quotes_portals():
+    EXAMPLE_RESPONSE = {'bitcoin': {'usd': 100811}}
+
+    # Mock api request
+    respx.get('https://pro-api.coingecko.com/api/v3/simple/price').mock(
+        httpx.Response(
+            status_code=200,
+            json=EXAMPLE_RESPONSE,
+        )
+    )
+
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>', cache=Cache(Cache.MEMORY)
+    )
+    results = []
+
+    with AnyCoin(api_services=[cgk_service], portals=4) as anyc:
+
+        def call() -> None:
+            results.append(
+                anyc.get_coin_quotes(
+                    coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+                )
+            )
+
+        threads = [threading.Thread(target=call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(anyc._portals) == 4  # noqa: PLR2004
+        # One HTTP client per event loop
+        clients = list(cgk_service._http_clients.values())
+        assert len(clients) == 4  # noqa: PLR2004
+
+    assert len(results) == 8  # noqa: PLR2004
+    assert all(
+        result.coins[CoinSymbols.btc].quotes[QuoteSymbols.usd].quote
+        == Decimal('100811')
+        for result in results
+    )
+    assert all(client.is_closed for client in clients)
+
+
+@respx.mock
+def test_convert_many():
+    EXAMPLE_RESPONSE = {
+        'bitcoin': {'usd': 100000, 'eur': 95000},
+        'ethereum': {'usd': 4000, 'eur': 3800},
+    }
+
+    # Mock api request
+    route = respx.get('https://pro-api.coingecko.com/api/v3/simple/price')
+    route.mock(
+        httpx.Response(
+            status_code=200,
+            json=EXAMPLE_RESPONSE,
+        )
+    )
+
+    anyc = AnyCoin(api_services=[CoinGeckoService(api_key='<api-key>')])
+
+    results = anyc.convert_many(
+        conversions=[
+            (2, CoinSymbols.btc, QuoteSymbols.eur),
+            (1, CoinSymbols.btc, CoinSymbols.eth),
+        ]
+    )
+    assert results == [Decimal('190000'), Decimal('25')]
+    assert route.call_count == 1
+
+
+@respx.mock
+def test_get_coin_quotes_many():
+    EXAMPLE_RESPONSE = {'bitcoin': {'usd': 100811}, 'ethereum': {'usd': 4000}}
+
+    # Mock api request
+    route = respx.get('https://pro-api.coingecko.com/api/v3/simple/price')
+    route.mock(
+        httpx.Response(
+            status_code=200,
+            json=EXAMPLE_RESPONSE,
+        )
+    )
+
+    anyc = AnyCoin(api_services=[CoinGeckoService(api_key='<api-key>')])
+
+    btc, eth = anyc.get_coin_quotes_many(
+        requests=[
+            ([CoinSymbols.btc], [QuoteSymbols.usd]),
+            ([CoinSymbols.eth], [QuoteSymbols.usd]),
+        ]
+    )
+    assert list(btc.coins) == [CoinSymbols.btc]
+    assert eth.coins[CoinSymbols.eth].quotes[QuoteSymbols.usd].quote == (
+        Decimal('4000')
+    )
+    assert route.call_count == 1
+
+
+@respx.mock
+def test_get_ohlcv():
+    respx.get(
+        'https://pro-api.coingecko.com/api/v3/coins/bitcoin/ohlc/range'
+    ).mock(
+        return_value=httpx.Response(
+            200, json=[[1733875200000, 96000, 98000, 95000, 97000.5]]
+        )
+    )
+
+    anyc = AnyCoin(api_services=[CoinGeckoService(api_key='<api-key>')])
+
+    result = anyc.get_ohlcv(
+        coins=[CoinSymbols.btc],
+        quotes_in=[QuoteSymbols.usd],
+        start=datetime(2024, 12, 10),
+        end=datetime(2024, 12, 11),
+    )
+    assert result[CoinSymbols.btc, QuoteSymbols.usd].timestamps == (
+        1733788800,
+    )
@@ -0,0 +1,56 @@
+import pytest
+
+from anycoin.loadtest import (
+    LoadTestResult,
+    StubProviderConfig,
+    StubProviderServer,
+    run,
+)
+from anycoin.services.coinmarketcap import CoinMarketCapService
+
+
+@pytest.mark.parametrize('mode', ['async', 'sync'])
+def test_run(mode):
+    with StubProviderServer(StubProviderConfig(latency=0.001)) as server:
+        result = run(
+            mode,
+            services_factory=lambda: [
+                CoinMarketCapService(
+                    api_key='test', base_url=server.cmc_base_url
+                )
+            ],
+            users=4,
+            duration=0.2,
+        )
+
+    assert result.mode == mode
+    assert result.requests > 0
+    assert result.errors == 0
+    assert result.throughput > 0
+    assert sum(count for _, count in result.histogram()) == result.requests
+    assert server.stats.requests == result.requests
+
+
+def test_run_unknown_mode():
+    with pytest.raises(ValueError, match="Unknown mode 'threads'"):
+        run('threads', services_factory=list, users=1, duration=0)
+
+
+def test_load_test_result():
+    result = LoadTestResult(
+        mode='async',
+        users=2,
+        duration=2,
+        latencies=[0.0005, 0.003, 0.003, 0.04],
+        errors=1,
+    )
+
+    data = result.to_dict()
+
+    assert data['requests'] == 5  # noqa: PLR2004
+    assert data['throughput'] == 2  # noqa: PLR2004
+    assert data['latency_ms']['max'] == 40  # noqa: PLR2004
+    assert data['histogram']['<= 1 ms'] == 1
+    assert data['histogram']['<= 5 ms'] == 2  # noqa: PLR2004
+    assert data['histogram']['<= 50 ms'] == 1
+    assert '[async] 2 users' in result.format()
@@ -0,0 +1,84 @@
+import httpx
+import pytest
+
+from anycoin import CoinSymbols, QuoteSymbols
+from anycoin.exeptions import GetCoinQuotes as GetCoinQuotesException
+from anycoin.loadtest import StubProviderConfig, StubProviderServer
+from anycoin.response_models import CoinQuotes
+from anycoin.services.coingecko import CoinGeckoService
+from anycoin.services.coinmarketcap import CoinMarketCapService
+
+pytestmark: pytest.MarkDecorator = pytest.mark.asyncio(loop_scope='session')
+
+
+@pytest.fixture
+def server():
+    with StubProviderServer() as server:
+        yield server
+
+
+@pytest.mark.parametrize(
+    ('service_class', 'base_url_attr'),
+    [
+        (CoinMarketCapService, 'cmc_base_url'),
+        (CoinGeckoService, 'cgk_base_url'),
+    ],
+)
+async def test_services_against_stub_provider(
+    server, service_class, base_url_attr
+):
+    async with service_class(
+        api_key='test', base_url=getattr(server, base_url_attr)
+    ) as service:
+        coin_quotes: CoinQuotes = await service.get_coin_quotes(
+            coins=[CoinSymbols.btc, CoinSymbols.eth],
+            quotes_in=[QuoteSymbols.usd, QuoteSymbols.eur],
+        )
+
+    assert list(coin_quotes.coins) == [CoinSymbols.btc, CoinSymbols.eth]
+    assert list(coin_quotes.coins[CoinSymbols.eth].quotes) == [
+        QuoteSymbols.usd,
+        QuoteSymbols.eur,
+    ]
+    assert server.stats.requests == 1
+
+
+async def test_stub_provider_error_rate():
+    with StubProviderServer(StubProviderConfig(error_rate=1)) as server:
+        async with CoinGeckoService(
+            api_key='test', base_url=server.cgk_base_url
+        ) as service:
+            with pytest.raises(GetCoinQuotesException):
+                await service.get_coin_quotes(
+                    coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+                )
+
+    assert server.stats.errors == 1
+
+
+async def test_stub_provider_rate_limit():
+    config = StubProviderConfig(rate_limit=0.1, burst=2)
+    with StubProviderServer(config) as server:
+        async with httpx.AsyncClient(base_url=server.cgk_base_url) as client:
+            responses = [
+                await client.get(
+                    '/simple/price',
+                    params={'ids': 'bitcoin', 'vs_currencies': 'usd'},
+                )
+                for _ in range(3)
+            ]
+
+    assert [response.status_code for response in responses] == [
+        200,
+        200,
+        429,
+    ]
+    assert int(responses[2].headers['Retry-After']) >= 1
+    assert server.stats.rate_limited == 1
+
+
+async def test_stub_provider_not_found(server):
+    async with httpx.AsyncClient(base_url=server.url) as client:
+        response = await client.get('/unknown')
+
+    assert response.status_code == 404  # noqa: PLR2004
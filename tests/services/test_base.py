@@ -1,4 +1,34 @@
-from anycoin.services.base import BaseAPIService
+import asyncio
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import anyio
+import httpx
+import pytest
+
+from anycoin import CoinSymbols, QuoteSymbols
+from anycoin.cache import _get_cache_key_for_get_coin_quotes_method_params  # noqa: PLC2701
+from anycoin.codecs import CompactCacheCodec
+from anycoin.exeptions import GetCoinQuotes as GetCoinQuotesException
+from anycoin.exeptions import GetOHLCV as GetOHLCVException
+from anycoin.instrumentation import InMemoryCollector
+from anycoin.rate_limit import RateLimit, RateLimiter
+from anycoin.response_models import (
+    OHLCV,
+    CoinQuotes,
+    CoinRow,
+    HistoricalQuotes,
+    QuoteRow,
+)
+from anycoin.services.base import (
+    BaseAPIService,
+    CacheOptions,
+    HTTPOptions,
+    RequestOptions,
+    _parse_retry_after,  # noqa: PLC2701
+)
 
 
 def test__repr__():
@@ -9,3 +39,806 @@ def test__repr__():
 def test__str__():
     service = BaseAPIService()
     assert str(service) == ('BaseAPIService(***)')
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_http_client_is_reused():
+    service = BaseAPIService()
+
+    client = service._get_http_client()
+    assert isinstance(client, httpx.AsyncClient)
+    assert service._get_http_client() is client
+
+    await service.aclose()
+    assert client.is_closed
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_http_client_recreated_after_aclose():
+    service = BaseAPIService()
+
+    client = service._get_http_client()
+    await service.aclose()
+
+    new_client = service._get_http_client()
+    assert new_client is not client
+    assert not new_client.is_closed
+    await service.aclose()
+
+
+def test_http_clients_of_closed_loops_are_dropped():
+    service = BaseAPIService()
+
+    async def get_http_client() -> httpx.AsyncClient:
+        return service._get_http_client()
+
+    clients = [asyncio.run(get_http_client()) for _ in range(3)]
+
+    assert len(set(map(id, clients))) == 3  # noqa: PLR2004
+    # Only the client of the last loop is kept
+    assert list(service._http_clients.values()) == [clients[-1]]
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_http_client_injected_is_not_closed():
+    client = httpx.AsyncClient()
+    service = BaseAPIService(http_options=HTTPOptions(client=client))
+
+    assert service._get_http_client() is client
+
+    await service.aclose()
+    assert not client.is_closed
+    await client.aclose()
+
+
+def test_http_client_limits_and_timeout():
+    limits = httpx.Limits(max_connections=5, max_keepalive_connections=2)
+    timeout = httpx.Timeout(1.0)
+    service = BaseAPIService(
+        http_options=HTTPOptions(limits=limits, timeout=timeout)
+    )
+
+    client = service._get_http_client()
+    assert client.timeout == timeout
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_async_context_manager():
+    async with BaseAPIService() as service:
+        client = service._get_http_client()
+
+    assert client.is_closed
+
+
+class FakeAPIService(BaseAPIService):
+    _api_service_name = 'coingecko'
+
+    def __init__(self, delay: float = 0, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.calls: list[tuple[list, list]] = []
+
+    async def _get_coin_quotes(self, coins, quotes_in) -> CoinQuotes:
+        self.calls.append((coins, quotes_in))
+        await asyncio.sleep(self.delay)
+        return CoinQuotes(
+            coins={
+                coin: CoinRow(
+                    quotes={
+                        quote: QuoteRow(quote=Decimal('1'))
+                        for quote in quotes_in
+                    }
+                )
+                for coin in coins
+            },
+            api_service='coingecko',
+            raw_data={},
+        )
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_without_cache():
+    service = FakeAPIService()
+
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    assert len(service.calls) == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_concurrent_misses_same_key(any_aiocache):
+    service = FakeAPIService(delay=0.1, cache=any_aiocache)
+
+    results = await asyncio.gather(*[
+        service.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+        for _ in range(5)
+    ])
+
+    assert len(service.calls) == 1  # Single upstream request
+    assert all(result.coins == results[0].coins for result in results)
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_cache_hit_keeps_fetched_at(any_aiocache):
+    service = FakeAPIService(cache=any_aiocache)
+
+    fetched = await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    cached = await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+
+    assert len(service.calls) == 1
+    assert fetched.fetched_at is not None
+    assert cached.fetched_at == fetched.fetched_at
+    assert 'fetched_at' not in cached.model_dump()
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_different_keys_do_not_wait(any_aiocache):
+    slow_service = FakeAPIService(delay=1, cache=any_aiocache)
+    fast_service = FakeAPIService(cache=any_aiocache)
+
+    slow_task = asyncio.create_task(
+        slow_service.get_coin_quotes(
+            coins=[CoinSymbols.pepe], quotes_in=[QuoteSymbols.brl]
+        )
+    )
+    await asyncio.sleep(0.05)  # The slow request holds its lock
+
+    await asyncio.wait_for(
+        fast_service.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        ),
+        timeout=0.5,
+    )
+    assert not slow_task.done()
+    await slow_task
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_cache_hit_does_not_take_lock(any_aiocache):
+    service = FakeAPIService(cache=any_aiocache)
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+
+    with patch('anycoin.services.base._LoopLocalRedLock') as redlock_mock:
+        await service.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+
+    redlock_mock.assert_not_called()
+    assert len(service.calls) == 1
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_cancelled_holder_releases_lock(any_aiocache):
+    redlock_release = any_aiocache._redlock_release
+
+    async def slow_redlock_release(key, value):
+        await asyncio.sleep(0)  # Like a Redis/Memcached round trip
+        return await redlock_release(key, value)
+
+    slow_service = FakeAPIService(delay=10, cache=any_aiocache)
+    service = FakeAPIService(cache=any_aiocache)
+
+    with patch.object(any_aiocache, '_redlock_release', slow_redlock_release):
+        # Cancelled while holding the lock, like the losing hedged call
+        with anyio.move_on_after(0.05):
+            await slow_service.get_coin_quotes(
+                coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+            )
+
+        # The lock was released: the next miss does not wait for the lease
+        await asyncio.wait_for(
+            service.get_coin_quotes(
+                coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+            ),
+            timeout=1,
+        )
+    assert len(service.calls) == 1
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_granular_partial_hit(any_aiocache):
+    service = FakeAPIService(
+        cache=any_aiocache, cache_options=CacheOptions(granular=True)
+    )
+
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc, CoinSymbols.eth],
+        quotes_in=[QuoteSymbols.usd],
+    )
+    result: CoinQuotes = await service.get_coin_quotes(
+        coins=[CoinSymbols.btc, CoinSymbols.eth, CoinSymbols.sol],
+        quotes_in=[QuoteSymbols.usd],
+    )
+
+    assert service.calls == [
+        ([CoinSymbols.btc, CoinSymbols.eth], [QuoteSymbols.usd]),
+        ([CoinSymbols.sol], [QuoteSymbols.usd]),  # Only the missing coin
+    ]
+    assert list(result.coins) == [
+        CoinSymbols.btc,
+        CoinSymbols.eth,
+        CoinSymbols.sol,
+    ]
+    assert result.api_service == 'coingecko'
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_granular_missing_quote(any_aiocache):
+    service = FakeAPIService(
+        cache=any_aiocache, cache_options=CacheOptions(granular=True)
+    )
+
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc, CoinSymbols.eth],
+        quotes_in=[QuoteSymbols.usd],
+    )
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc, CoinSymbols.eth],
+        quotes_in=[QuoteSymbols.usd, QuoteSymbols.eur],
+    )
+
+    assert service.calls[1] == (
+        [CoinSymbols.btc, CoinSymbols.eth],
+        [QuoteSymbols.usd, QuoteSymbols.eur],
+    )
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_granular_full_hit(any_aiocache):
+    service = FakeAPIService(
+        cache=any_aiocache, cache_options=CacheOptions(granular=True)
+    )
+
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc, CoinSymbols.eth],
+        quotes_in=[QuoteSymbols.usd, QuoteSymbols.eur],
+    )
+    result: CoinQuotes = await service.get_coin_quotes(
+        coins=[CoinSymbols.eth, CoinSymbols.eth],
+        quotes_in=[QuoteSymbols.eur],
+    )
+
+    assert len(service.calls) == 1
+    assert result.raw_data == {}
+    assert result.model_dump()['coins'] == {
+        CoinSymbols.eth: {
+            'quotes': {QuoteSymbols.eur: {'quote': Decimal('1')}}
+        }
+    }
+    assert await any_aiocache.get('anycoin:v1:quote:coingecko:eth:eur') == '1'
+
+
+@pytest.fixture
+def advance_time(monkeypatch):
+    """Move ``time.time()`` forward by the given seconds"""
+    real_time = time.time
+
+    def advance(seconds: float) -> None:
+        monkeypatch.setattr(time, 'time', lambda: real_time() + seconds)
+
+    return advance
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_stale_while_revalidate(
+    any_aiocache, advance_time
+):
+    service = FakeAPIService(
+        cache=any_aiocache,
+        cache_ttl=300,
+        cache_options=CacheOptions(stale_ttl=60),
+    )
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+
+    advance_time(310)  # Stale but within cache_stale_ttl
+    results = await asyncio.gather(*[
+        service.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+        for _ in range(3)
+    ])
+    assert all(list(result.coins) == [CoinSymbols.btc] for result in results)
+
+    # The stale value was served, one background task refreshes it
+    assert len(service.calls) == 1
+    assert len(service._refresh_tasks) == 1
+    await asyncio.gather(*service._refresh_tasks.values())
+    assert len(service.calls) == 2  # noqa: PLR2004
+
+    # The refreshed value is fresh again
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    assert not service._refresh_tasks
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_refresh_in_progress_in_another_process(
+    any_aiocache, advance_time
+):
+    service = FakeAPIService(
+        cache=any_aiocache,
+        cache_ttl=300,
+        cache_options=CacheOptions(stale_ttl=60),
+    )
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    marker_key = (
+        _get_cache_key_for_get_coin_quotes_method_params(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+        + '-refresh'
+    )
+    await any_aiocache.add(marker_key, '1', ttl=20)  # Another process
+
+    advance_time(310)
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    await asyncio.gather(*service._refresh_tasks.values())
+    assert len(service.calls) == 1  # Left to the other process
+
+    # Once the other process is done, the marker is gone
+    await any_aiocache.delete(marker_key)
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    await asyncio.gather(*service._refresh_tasks.values())
+    assert len(service.calls) == 2  # noqa: PLR2004
+    assert not await any_aiocache.exists(marker_key)
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_early_refresh(any_aiocache, advance_time):
+    service = FakeAPIService(
+        cache=any_aiocache,
+        cache_ttl=300,
+        cache_options=CacheOptions(refresh_ratio=0.8),
+    )
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+
+    advance_time(100)
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    assert not service._refresh_tasks
+
+    advance_time(250)  # Older than cache_ttl * cache_refresh_ratio
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    await asyncio.gather(*service._refresh_tasks.values())
+    assert len(service.calls) == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_background_refresh_error(
+    any_aiocache, advance_time
+):
+    service = FakeAPIService(
+        cache=any_aiocache,
+        cache_ttl=300,
+        cache_options=CacheOptions(stale_ttl=60),
+    )
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+
+    service._get_coin_quotes = AsyncMock(
+        side_effect=GetCoinQuotesException('fake error')
+    )
+    advance_time(310)
+    result: CoinQuotes = await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    await asyncio.gather(*service._refresh_tasks.values())
+
+    assert list(result.coins) == [CoinSymbols.btc]
+    service._get_coin_quotes.assert_awaited_once()
+
+
+def test_stale_while_revalidate_with_cache_granular():
+    with pytest.raises(
+        RuntimeError,
+        match='Stale-while-revalidate is not supported with granular caching',
+    ):
+        BaseAPIService(cache_options=CacheOptions(granular=True, stale_ttl=60))
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_compact_cache_codec(any_aiocache):
+    service = FakeAPIService(
+        cache=any_aiocache,
+        cache_options=CacheOptions(codec=CompactCacheCodec()),
+    )
+
+    result: CoinQuotes = await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    cached_result: CoinQuotes = await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+
+    assert len(service.calls) == 1
+    assert cached_result == result
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_services_with_different_codecs(any_aiocache):
+    json_service = FakeAPIService(cache=any_aiocache)
+    compact_service = FakeAPIService(
+        cache=any_aiocache,
+        cache_options=CacheOptions(codec=CompactCacheCodec()),
+    )
+
+    for service in (json_service, compact_service, json_service):
+        result: CoinQuotes = await service.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+        assert result.coins[CoinSymbols.btc].quotes[QuoteSymbols.usd]
+
+    # Each codec reads its own entries
+    assert len(json_service.calls) == 1
+    assert len(compact_service.calls) == 1
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_undecodable_cache_value_is_a_miss(
+    any_aiocache, capsys
+):
+    collector = InMemoryCollector()
+    service = FakeAPIService(
+        cache=any_aiocache,
+        cache_options=CacheOptions(codec=CompactCacheCodec()),
+        instrumentation=collector,
+    )
+    await any_aiocache.set(
+        _get_cache_key_for_get_coin_quotes_method_params(
+            coins=[CoinSymbols.btc],
+            quotes_in=[QuoteSymbols.usd],
+            codec='compact',
+        ),
+        '{"not": "compact"}',
+    )
+
+    result: CoinQuotes = await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+
+    assert len(service.calls) == 1
+    assert result.coins[CoinSymbols.btc].quotes[QuoteSymbols.usd]
+    # Reported through the instrumentation, not printed
+    assert collector.deserialization_errors['FakeAPIService']
+    assert not capsys.readouterr().err
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_compact_cache_codec_stale_while_revalidate(
+    any_aiocache, advance_time
+):
+    service = FakeAPIService(
+        cache=any_aiocache,
+        cache_ttl=300,
+        cache_options=CacheOptions(stale_ttl=60, codec=CompactCacheCodec()),
+    )
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+
+    advance_time(310)
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    await asyncio.gather(*service._refresh_tasks.values())
+
+    assert len(service.calls) == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_instrumentation(any_aiocache):
+    collector = InMemoryCollector()
+    service = FakeAPIService(cache=any_aiocache, instrumentation=collector)
+
+    for _ in range(2):
+        await service.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+
+    assert collector.cache_misses['FakeAPIService'] == 1
+    assert collector.cache_hits['FakeAPIService'] == 1
+    assert len(collector.lock_waits['FakeAPIService']) == 1
+    assert len(collector.serializations['FakeAPIService']) == 1
+    assert len(collector.deserializations['FakeAPIService']) == 1
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_granular_instrumentation(any_aiocache):
+    collector = InMemoryCollector()
+    service = FakeAPIService(
+        cache=any_aiocache,
+        cache_options=CacheOptions(granular=True),
+        instrumentation=collector,
+    )
+
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc, CoinSymbols.eth], quotes_in=[QuoteSymbols.usd]
+    )
+
+    assert collector.cache_hits['FakeAPIService'] == 1
+    assert collector.cache_misses['FakeAPIService'] == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_http_request_instrumentation():
+    collector = InMemoryCollector()
+    service = BaseAPIService(
+        http_options=HTTPOptions(
+            client=httpx.AsyncClient(
+                transport=httpx.MockTransport(
+                    lambda request: httpx.Response(429)
+                )
+            )
+        ),
+        instrumentation=collector,
+    )
+
+    response = await service._http_request('get', 'https://example.com')
+
+    assert response.status_code == 429  # noqa: PLR2004
+    assert collector.http_statuses['BaseAPIService'] == {429: 1}
+    assert len(collector.http_requests['BaseAPIService']) == 1
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_http_request_rate_limiter_respects_retry_after():
+    collector = InMemoryCollector()
+    rate_limiter = RateLimiter([RateLimit(requests=1000, period=1)])
+    service = BaseAPIService(
+        http_options=HTTPOptions(
+            client=httpx.AsyncClient(
+                transport=httpx.MockTransport(
+                    lambda request: httpx.Response(
+                        429, headers={'Retry-After': '0.05'}
+                    )
+                )
+            )
+        ),
+        request_options=RequestOptions(rate_limiter=rate_limiter),
+        instrumentation=collector,
+    )
+
+    assert service.rate_limiter is rate_limiter
+    await service._http_request('get', 'https://example.com')
+    assert rate_limiter.get_delay() > 0.01  # noqa: PLR2004
+
+    start = time.monotonic()
+    await service._http_request('get', 'https://example.com')
+    assert time.monotonic() - start >= 0.04  # noqa: PLR2004
+    assert len(collector.rate_limit_waits['BaseAPIService']) == 2  # noqa: PLR2004
+
+
+@pytest.mark.parametrize(
+    ('value', 'expected'),
+    [
+        (None, None),
+        ('120', 120.0),
+        ('-1', 0.0),
+        ('Wed, 21 Oct 2015 07:28:00 GMT', 0.0),
+        ('soon', None),
+    ],
+)
+def test_parse_retry_after(value, expected):
+    assert _parse_retry_after(value) == expected
+
+
+class ChunkedFakeAPIService(FakeAPIService):
+    _max_coins_per_request = 2
+    _max_quotes_per_request = 1
+
+    async def _get_coin_quotes(self, coins, quotes_in) -> CoinQuotes:
+        self.running = getattr(self, 'running', 0) + 1
+        self.max_running = max(getattr(self, 'max_running', 0), self.running)
+        try:
+            coin_quotes = await super()._get_coin_quotes(coins, quotes_in)
+        finally:
+            self.running -= 1
+
+        if CoinSymbols.not_ in coins:
+            raise GetCoinQuotesException('fake error')
+
+        coin_quotes.raw_data = {
+            coin.value: {quote.value: 1 for quote in quotes_in}
+            for coin in coins
+        }
+        return coin_quotes
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_chunked():
+    service = ChunkedFakeAPIService(
+        delay=0.01,
+        request_options=RequestOptions(max_concurrent_requests=2),
+    )
+
+    coin_quotes = await service.get_coin_quotes(
+        coins=[CoinSymbols.btc, CoinSymbols.eth, CoinSymbols.sol],
+        quotes_in=[QuoteSymbols.usd, QuoteSymbols.eur],
+    )
+
+    assert {
+        (tuple(coins), tuple(quotes)) for coins, quotes in service.calls
+    } == {
+        ((CoinSymbols.btc, CoinSymbols.eth), (QuoteSymbols.usd,)),
+        ((CoinSymbols.btc, CoinSymbols.eth), (QuoteSymbols.eur,)),
+        ((CoinSymbols.sol,), (QuoteSymbols.usd,)),
+        ((CoinSymbols.sol,), (QuoteSymbols.eur,)),
+    }
+    assert service.max_running == 2  # noqa: PLR2004
+    assert list(coin_quotes.coins) == [
+        CoinSymbols.btc,
+        CoinSymbols.eth,
+        CoinSymbols.sol,
+    ]
+    assert list(coin_quotes.coins[CoinSymbols.sol].quotes) == [
+        QuoteSymbols.usd,
+        QuoteSymbols.eur,
+    ]
+    assert coin_quotes.raw_data == {
+        'btc': {'usd': 1, 'eur': 1},
+        'eth': {'usd': 1, 'eur': 1},
+        'sol': {'usd': 1, 'eur': 1},
+    }
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_chunk_failure():
+    service = ChunkedFakeAPIService()
+
+    with pytest.raises(GetCoinQuotesException, match='fake error'):
+        await service.get_coin_quotes(
+            coins=[CoinSymbols.btc, CoinSymbols.eth, CoinSymbols.not_],
+            quotes_in=[QuoteSymbols.usd],
+        )
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_coin_quotes_single_chunk_is_not_split():
+    service = ChunkedFakeAPIService()
+
+    await service.get_coin_quotes(
+        coins=[CoinSymbols.btc, CoinSymbols.eth],
+        quotes_in=[QuoteSymbols.usd],
+    )
+
+    assert service.calls == [
+        ([CoinSymbols.btc, CoinSymbols.eth], [QuoteSymbols.usd])
+    ]
+
+
+class OHLCVFakeAPIService(FakeAPIService):
+    _max_ohlcv_coins_per_request = 1
+
+    async def _get_ohlcv(
+        self, coins, quotes_in, start, end, interval
+    ) -> HistoricalQuotes:
+        self.calls.append((coins, quotes_in))
+        return HistoricalQuotes(
+            series={
+                (coin, quote): OHLCV(
+                    coin,
+                    quote,
+                    (start,),
+                    (Decimal(1),),
+                    (Decimal(2),),
+                    (Decimal(1),),
+                    (Decimal(2),),
+                    (None,),
+                )
+                for coin in coins
+                for quote in quotes_in
+            },
+            api_service='coingecko',
+            interval=interval,
+            raw_data={coin.value: {'start': start} for coin in coins},
+        )
+
+
+OHLCV_START = datetime(2024, 12, 10, tzinfo=timezone.utc)
+OHLCV_END = datetime(2024, 12, 11, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_ohlcv_chunked():
+    service = OHLCVFakeAPIService()
+
+    result = await service.get_ohlcv(
+        coins=[CoinSymbols.btc, CoinSymbols.eth],
+        quotes_in=[QuoteSymbols.usd, QuoteSymbols.eur],
+        start=OHLCV_START,
+        end=OHLCV_END,
+    )
+
+    assert {
+        (tuple(coins), tuple(quotes)) for coins, quotes in service.calls
+    } == {
+        ((CoinSymbols.btc,), (QuoteSymbols.usd, QuoteSymbols.eur)),
+        ((CoinSymbols.eth,), (QuoteSymbols.usd, QuoteSymbols.eur)),
+    }
+    assert len(result) == 4  # noqa: PLR2004
+    assert result[CoinSymbols.eth, QuoteSymbols.eur].timestamps == (
+        1733788800,
+    )
+    assert result.raw_data == {
+        'btc': {'start': 1733788800},
+        'eth': {'start': 1733788800},
+    }
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_ohlcv_with_cache(any_aiocache):
+    service = OHLCVFakeAPIService(cache=any_aiocache)
+
+    results = [
+        await service.get_ohlcv(
+            coins=[CoinSymbols.btc],
+            quotes_in=[QuoteSymbols.usd],
+            start=OHLCV_START,
+            end=OHLCV_END,
+        )
+        for _ in range(2)
+    ]
+
+    assert len(service.calls) == 1
+    assert results[0].series == results[1].series
+
+
+@pytest.mark.asyncio(loop_scope='session')
+@pytest.mark.parametrize(
+    ('kwargs', 'message'),
+    [
+        ({'interval': 'weekly'}, 'interval must be one of'),
+        ({'end': OHLCV_START}, 'start must be before end'),
+    ],
+)
+async def test_get_ohlcv_invalid_arguments(kwargs, message):
+    service = OHLCVFakeAPIService()
+
+    with pytest.raises(ValueError, match=message):
+        await service.get_ohlcv(**{
+            'coins': [CoinSymbols.btc],
+            'quotes_in': [QuoteSymbols.usd],
+            'start': OHLCV_START,
+            'end': OHLCV_END,
+            **kwargs,
+        })
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_ohlcv_not_supported():
+    with pytest.raises(GetOHLCVException, match='does not support OHLCV'):
+        await FakeAPIService().get_ohlcv(
+            coins=[CoinSymbols.btc],
+            quotes_in=[QuoteSymbols.usd],
+            start=OHLCV_START,
+            end=OHLCV_END,
+        )
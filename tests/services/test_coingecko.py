@@ -1,4 +1,5 @@
 import json
+from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 from http import HTTPStatus
@@ -15,10 +16,12 @@ from anycoin.exeptions import (
 from anycoin.exeptions import (
     GetCoinQuotes as GetCoinQuotesException,
 )
+from anycoin.exeptions import GetOHLCV as GetOHLCVException
 from anycoin.exeptions import (
     QuoteCoinNotSupportedCGK as QuoteCoinNotSupportedCGKException,
 )
-from anycoin.response_models import CoinQuotes
+from anycoin.response_models import CoinQuotes, HistoricalQuotes
+from anycoin.services.base import CacheOptions, HTTPOptions
 from anycoin.services.coingecko import CoinGeckoService
 
 pytestmark: pytest.MarkDecorator = pytest.mark.asyncio(loop_scope='session')
@@ -351,7 +354,9 @@ async def test_get_coin_quotes_with_cache_and_value_in_cache(any_aiocache):
         coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
     )
 
-    any_aiocache.get.assert_called_once_with('coins:btc;quotes_in:usd')
+    any_aiocache.get.assert_called_once_with(
+        'anycoin:v1:coins:btc;quotes_in:usd'
+    )
 
     assert isinstance(result, CoinQuotes)
     assert result.api_service == 'coingecko'
@@ -394,7 +399,7 @@ async def test_get_coin_quotes_with_cache_and_value_not_in_cache(any_aiocache):
         '}'
     )
     await any_aiocache.get(
-        'coins:btc;quotes_in:usd'
+        'anycoin:v1:coins:btc;quotes_in:usd'
     ) == EXPECTED_VALUE_IN_CACHE
     # End
 
@@ -409,6 +414,207 @@ async def test_get_coin_quotes_with_cache_and_value_not_in_cache(any_aiocache):
     }
 
 
+@respx.mock
+async def test_send_request_reuses_http_client():
+    EXAMPLE_RESPONSE = {'bitcoin': {'usd': 100811}}
+
+    # Mock api request
+    route = respx.get(
+        'https://pro-api.coingecko.com/api/v3/simple/price'
+    ).mock(
+        httpx.Response(
+            status_code=200,
+            json=EXAMPLE_RESPONSE,
+        )
+    )
+
+    cgk_service = CoinGeckoService(api_key='<api-key>')
+
+    await cgk_service._send_request(path='/simple/price', method='get')
+    client = cgk_service._get_http_client()
+    await cgk_service._send_request(path='/simple/price', method='get')
+
+    assert route.call_count == 2  # noqa: PLR2004
+    assert cgk_service._get_http_client() is client
+    await cgk_service.aclose()
+    assert client.is_closed
+
+
+@respx.mock
+async def test_send_request_with_http_client():
+    EXAMPLE_RESPONSE = {'bitcoin': {'usd': 100811}}
+
+    # Mock api request
+    respx.get('https://pro-api.coingecko.com/api/v3/simple/price').mock(
+        httpx.Response(
+            status_code=200,
+            json=EXAMPLE_RESPONSE,
+        )
+    )
+
+    async with httpx.AsyncClient() as client:
+        async with CoinGeckoService(
+            api_key='<api-key>', http_options=HTTPOptions(client=client)
+        ) as cgk_service:
+            result = await cgk_service._send_request(
+                path='/simple/price', method='get'
+            )
+            assert result == EXAMPLE_RESPONSE
+            assert cgk_service._http_client is client
+
+        assert not client.is_closed
+
+
+@respx.mock
+async def test_get_coin_quotes_with_cache_granular(any_aiocache):
+    # Mock api request
+    route = respx.get('https://pro-api.coingecko.com/api/v3/simple/price')
+    route.side_effect = [
+        httpx.Response(status_code=200, json={'bitcoin': {'usd': 100811}}),
+        httpx.Response(status_code=200, json={'ethereum': {'usd': 3000}}),
+    ]
+
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>',
+        cache=any_aiocache,
+        cache_options=CacheOptions(granular=True),
+    )
+
+    await cgk_service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    result: CoinQuotes = await cgk_service.get_coin_quotes(
+        coins=[CoinSymbols.btc, CoinSymbols.eth], quotes_in=[QuoteSymbols.usd]
+    )
+
+    assert route.calls.last.request.url.params['ids'] == 'ethereum'
+    assert result.api_service == 'coingecko'
+    assert result.raw_data == {'ethereum': {'usd': 3000}}
+    assert result.model_dump()['coins'] == {
+        CoinSymbols.btc: {
+            'quotes': {QuoteSymbols.usd: {'quote': Decimal('100811')}}
+        },
+        CoinSymbols.eth: {
+            'quotes': {QuoteSymbols.usd: {'quote': Decimal('3000')}}
+        },
+    }
+
+
 def test_repr():
     service = CoinGeckoService(api_key='<api-key>')
     assert repr(service) == ("CoinGeckoService(api_key='***')")
+
+
+@respx.mock
+async def test_send_request_base_url():
+    route = respx.get('http://127.0.0.1:8080/api/simple/price').mock(
+        httpx.Response(status_code=200, json={})
+    )
+
+    service = CoinGeckoService(
+        api_key='<api-key>', base_url='http://127.0.0.1:8080/api/'
+    )
+    await service._send_request(path='/simple/price', method='get')
+
+    assert route.called
+
+
+@respx.mock
+async def test_get_ohlcv():
+    bitcoin_route = respx.get(
+        'https://pro-api.coingecko.com/api/v3/coins/bitcoin/ohlc/range'
+    ).mock(
+        return_value=httpx.Response(
+            200, json=[[1733875200000, 96000, 98000, 95000, 97000.5]]
+        )
+    )
+    ethereum_route = respx.get(
+        'https://pro-api.coingecko.com/api/v3/coins/ethereum/ohlc/range'
+    ).mock(
+        return_value=httpx.Response(
+            200, json=[[1733875200000, 3600, 3800, 3500, 3700]]
+        )
+    )
+
+    cgk_service = CoinGeckoService(api_key='<api-key>')
+    result: HistoricalQuotes = await cgk_service.get_ohlcv(
+        coins=[CoinSymbols.btc, CoinSymbols.eth],
+        quotes_in=[QuoteSymbols.usd, QuoteSymbols.eur],
+        start=datetime(2024, 12, 10),  # Naive: UTC
+        end=datetime(2024, 12, 11),
+    )
+
+    # One request per coin and quote
+    assert bitcoin_route.call_count == ethereum_route.call_count == 2  # noqa: PLR2004
+    assert {
+        call.request.url.params['vs_currency'] for call in bitcoin_route.calls
+    } == {'usd', 'eur'}
+    params = bitcoin_route.calls[0].request.url.params
+    assert (params['from'], params['to'], params['interval']) == (
+        '1733788800',
+        '1733875200',
+        'daily',
+    )
+
+    assert len(result) == 4  # noqa: PLR2004
+    ohlcv = result[CoinSymbols.eth, QuoteSymbols.eur]
+    assert ohlcv.timestamps == (1733788800,)
+    assert ohlcv.close == (Decimal('3700'),)
+    assert result.raw_data == {
+        'bitcoin': {
+            'usd': [[1733875200000, 96000, 98000, 95000, 97000.5]],
+            'eur': [[1733875200000, 96000, 98000, 95000, 97000.5]],
+        },
+        'ethereum': {
+            'usd': [[1733875200000, 3600, 3800, 3500, 3700]],
+            'eur': [[1733875200000, 3600, 3800, 3500, 3700]],
+        },
+    }
+
+
+@respx.mock
+async def test_get_ohlcv_error():
+    respx.get(
+        'https://pro-api.coingecko.com/api/v3/coins/bitcoin/ohlc/range'
+    ).mock(
+        return_value=httpx.Response(
+            HTTPStatus.CONFLICT, json={'error': 'fake error'}
+        )
+    )
+    cgk_service = CoinGeckoService(api_key='<api-key>')
+
+    with pytest.raises(
+        GetOHLCVException, match='Error retrieving OHLCV. API response:'
+    ):
+        await cgk_service.get_ohlcv(
+            coins=[CoinSymbols.btc],
+            quotes_in=[QuoteSymbols.usd],
+            start=datetime(2024, 12, 10),
+            end=datetime(2024, 12, 11),
+        )
+
+
+@respx.mock
+async def test_get_ohlcv_with_cache(any_aiocache):
+    route = respx.get(
+        'https://pro-api.coingecko.com/api/v3/coins/bitcoin/ohlc/range'
+    ).mock(
+        return_value=httpx.Response(
+            200, json=[[1733875200000, 96000, 98000, 95000, 97000.5]]
+        )
+    )
+    cgk_service = CoinGeckoService(api_key='<api-key>', cache=any_aiocache)
+
+    results = [
+        await cgk_service.get_ohlcv(
+            coins=[CoinSymbols.btc],
+            quotes_in=[QuoteSymbols.usd],
+            start=datetime(2024, 12, 10),
+            end=datetime(2024, 12, 11),
+        )
+        for _ in range(2)
+    ]
+
+    assert route.call_count == 1
+    assert results[0].series == results[1].series
+    assert not results[1].raw_data  # Read from the cache
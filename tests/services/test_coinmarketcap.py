@@ -1,6 +1,8 @@
 import json
+from datetime import datetime, timezone
 from decimal import Decimal
 from enum import Enum
+from http import HTTPStatus
 from unittest.mock import AsyncMock
 
 import httpx
@@ -14,10 +16,12 @@ from anycoin.exeptions import (
 from anycoin.exeptions import (
     GetCoinQuotes as GetCoinQuotesException,
 )
+from anycoin.exeptions import GetOHLCV as GetOHLCVException
 from anycoin.exeptions import (
     QuoteCoinNotSupportedCMC as QuoteCoinNotSupportedCMCException,
 )
 from anycoin.response_models import CoinQuotes
+from anycoin.services.base import CacheOptions, HTTPOptions
 from anycoin.services.coinmarketcap import CoinMarketCapService
 
 pytestmark: pytest.MarkDecorator = pytest.mark.asyncio(loop_scope='session')
@@ -834,7 +838,9 @@ async def test_get_coin_quotes_with_cache_and_value_in_cache(any_aiocache):
         coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
     )
 
-    any_aiocache.get.assert_called_once_with('coins:btc;quotes_in:usd')
+    any_aiocache.get.assert_called_once_with(
+        'anycoin:v1:coins:btc;quotes_in:usd'
+    )
 
     assert isinstance(result, CoinQuotes)
     assert result.api_service == 'coinmarketcap'
@@ -924,7 +930,7 @@ async def test_get_coin_quotes_with_cache_and_value_not_in_cache(any_aiocache):
         '}'
     )
     await any_aiocache.get(
-        'coins:btc;quotes_in:usd'
+        'anycoin:v1:coins:btc;quotes_in:usd'
     ) == EXPECTED_VALUE_IN_CACHE
     # End
 
@@ -939,6 +945,217 @@ async def test_get_coin_quotes_with_cache_and_value_not_in_cache(any_aiocache):
     }
 
 
+@respx.mock
+async def test_send_request_reuses_http_client():
+    EXAMPLE_RESPONSE = {'data': {}, 'status': {'error_code': 0}}
+
+    # Mock api request
+    route = respx.get(
+        'https://pro-api.coinmarketcap.com/v2/cryptocurrency/quotes/latest'
+    ).mock(
+        httpx.Response(
+            status_code=200,
+            json=EXAMPLE_RESPONSE,
+        )
+    )
+
+    cmc_service = CoinMarketCapService(api_key='<api-key>')
+
+    await cmc_service._send_request(
+        path='/cryptocurrency/quotes/latest', method='get'
+    )
+    client = cmc_service._get_http_client()
+    await cmc_service._send_request(
+        path='/cryptocurrency/quotes/latest', method='get'
+    )
+
+    assert route.call_count == 2  # noqa: PLR2004
+    assert cmc_service._get_http_client() is client
+    await cmc_service.aclose()
+    assert client.is_closed
+
+
+@respx.mock
+async def test_send_request_with_http_client():
+    EXAMPLE_RESPONSE = {'data': {}, 'status': {'error_code': 0}}
+
+    # Mock api request
+    respx.get(
+        'https://pro-api.coinmarketcap.com/v2/cryptocurrency/quotes/latest'
+    ).mock(
+        httpx.Response(
+            status_code=200,
+            json=EXAMPLE_RESPONSE,
+        )
+    )
+
+    async with httpx.AsyncClient() as client:
+        async with CoinMarketCapService(
+            api_key='<api-key>', http_options=HTTPOptions(client=client)
+        ) as cmc_service:
+            result = await cmc_service._send_request(
+                path='/cryptocurrency/quotes/latest', method='get'
+            )
+            assert result == EXAMPLE_RESPONSE
+            assert cmc_service._http_client is client
+
+        assert not client.is_closed
+
+
+@respx.mock
+async def test_get_coin_quotes_with_cache_granular(any_aiocache):
+    def example_response(coin_id: str, price: float) -> dict:
+        return {
+            'data': {coin_id: {'quote': {'2781': {'price': price}}}},
+            'status': {'error_code': 0},
+        }
+
+    # Mock api request
+    route = respx.get(
+        'https://pro-api.coinmarketcap.com/v2/cryptocurrency/quotes/latest'
+    )
+    route.side_effect = [
+        httpx.Response(status_code=200, json=example_response('1', 100811)),
+        httpx.Response(status_code=200, json=example_response('1027', 3000)),
+    ]
+
+    cmc_service = CoinMarketCapService(
+        api_key='<api-key>',
+        cache=any_aiocache,
+        cache_options=CacheOptions(granular=True),
+    )
+
+    await cmc_service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    result: CoinQuotes = await cmc_service.get_coin_quotes(
+        coins=[CoinSymbols.btc, CoinSymbols.eth], quotes_in=[QuoteSymbols.usd]
+    )
+
+    assert route.calls.last.request.url.params['id'] == '1027'
+    assert result.api_service == 'coinmarketcap'
+    assert result.raw_data == example_response('1027', 3000)
+    assert result.model_dump()['coins'] == {
+        CoinSymbols.btc: {
+            'quotes': {QuoteSymbols.usd: {'quote': Decimal('100811')}}
+        },
+        CoinSymbols.eth: {
+            'quotes': {QuoteSymbols.usd: {'quote': Decimal('3000')}}
+        },
+    }
+
+
 def test_repr():
     service = CoinMarketCapService(api_key='<api-key>')
     assert repr(service) == ("CoinMarketCapService(api_key='***')")
+
+
+@respx.mock
+async def test_send_request_base_url():
+    route = respx.get(
+        'http://127.0.0.1:8080/api/cryptocurrency/quotes/latest'
+    ).mock(
+        httpx.Response(
+            status_code=200, json={'status': {'error_code': 0}, 'data': {}}
+        )
+    )
+
+    service = CoinMarketCapService(
+        api_key='<api-key>', base_url='http://127.0.0.1:8080/api/'
+    )
+    await service._send_request(
+        path='/cryptocurrency/quotes/latest', method='get'
+    )
+
+    assert route.called
+
+
+@respx.mock
+async def test_get_ohlcv():
+    EXAMPLE_RESPONSE = {
+        'status': {'error_code': 0},
+        'data': {
+            '1': {
+                'id': 1,
+                'symbol': 'BTC',
+                'quotes': [
+                    {
+                        'time_open': '2024-12-10T00:00:00.000Z',
+                        'quote': {
+                            '2781': {
+                                'open': 96000,
+                                'high': 98000,
+                                'low': 95000,
+                                'close': 97000.5,
+                                'volume': 100,
+                            }
+                        },
+                    }
+                ],
+            }
+        },
+    }
+    route = respx.get(
+        'https://pro-api.coinmarketcap.com/v2/cryptocurrency/ohlcv/historical'
+    ).mock(return_value=httpx.Response(200, json=EXAMPLE_RESPONSE))
+
+    cmc_service = CoinMarketCapService(api_key='<api-key>')
+    result = await cmc_service.get_ohlcv(
+        coins=[CoinSymbols.btc],
+        quotes_in=[QuoteSymbols.usd],
+        start=datetime(2024, 12, 10, tzinfo=timezone.utc),
+        end=datetime(2024, 12, 12, tzinfo=timezone.utc),
+    )
+
+    assert dict(route.calls.last.request.url.params) == {
+        'id': '1',
+        'convert_id': '2781',
+        'time_start': '1733788800',
+        'time_end': '1733961600',
+        'time_period': 'daily',
+        'interval': 'daily',
+        'count': '2',
+    }
+    assert result.api_service == 'coinmarketcap'
+    assert result.raw_data == EXAMPLE_RESPONSE
+    ohlcv = result[CoinSymbols.btc, QuoteSymbols.usd]
+    assert ohlcv.timestamps == (1733788800,)
+    assert ohlcv.close == (Decimal('97000.5'),)
+
+
+@respx.mock
+async def test_get_ohlcv_error():
+    respx.get(
+        'https://pro-api.coinmarketcap.com/v2/cryptocurrency/ohlcv/historical'
+    ).mock(
+        return_value=httpx.Response(
+            HTTPStatus.BAD_REQUEST,
+            json={'status': {'error_code': 400}},
+        )
+    )
+    cmc_service = CoinMarketCapService(api_key='<api-key>')
+
+    with pytest.raises(
+        GetOHLCVException, match='Error retrieving OHLCV. API response:'
+    ):
+        await cmc_service.get_ohlcv(
+            coins=[CoinSymbols.btc],
+            quotes_in=[QuoteSymbols.usd],
+            start=datetime(2024, 12, 10),
+            end=datetime(2024, 12, 11),
+        )
+
+
+async def test_get_ohlcv_coin_not_supported():
+    class FakeCoinSymbols(str, Enum):
+        invalid_member: str = 'invalid_member'
+
+    cmc_service = CoinMarketCapService(api_key='<api-key>')
+
+    with pytest.raises(GetOHLCVException, match='not supported'):
+        await cmc_service.get_ohlcv(
+            coins=[FakeCoinSymbols.invalid_member],
+            quotes_in=[QuoteSymbols.usd],
+            start=datetime(2024, 12, 10),
+            end=datetime(2024, 12, 12),
+        )
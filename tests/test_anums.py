@@ -1,4 +1,11 @@
+import copy
+import pickle
+
+import pytest
+from pydantic import TypeAdapter, ValidationError
+
 from anycoin import CoinSymbols, QuoteSymbols
+from anycoin.response_models import CoinQuotes
 
 
 def test_coin_symbols_enum():
@@ -25,3 +32,83 @@ def test_quote_symbols_enum():
     assert quote_symbol is QuoteSymbols.usd
     # Test ==
     assert quote_symbol == QuoteSymbols.usd
+
+
+def test_coin_symbols_lookup_by_value():
+    assert CoinSymbols('trx') is CoinSymbols.trx
+    assert CoinSymbols(CoinSymbols.trx) is CoinSymbols.trx
+    assert CoinSymbols['not_'] is CoinSymbols.not_
+    assert CoinSymbols['not'] is CoinSymbols.not_
+
+    with pytest.raises(ValueError, match="'xyz' is not a valid CoinSymbols"):
+        CoinSymbols('xyz')
+    with pytest.raises(ValueError, match='is not a valid CoinSymbols'):
+        CoinSymbols(QuoteSymbols.usd)
+
+
+def test_symbols_enum_compatibility():
+    assert list(CoinSymbols)[:2] == [CoinSymbols.btc, CoinSymbols.eth]
+    assert len(QuoteSymbols) == 5  # noqa: PLR2004
+    assert QuoteSymbols.eur in QuoteSymbols
+    assert repr(CoinSymbols.not_) == "<CoinSymbols.not_: 'not'>"
+    assert str(QuoteSymbols.usd) == 'QuoteSymbols.usd'
+    assert pickle.loads(pickle.dumps(CoinSymbols.btc)) is CoinSymbols.btc
+    assert copy.deepcopy(CoinSymbols.btc) is CoinSymbols.btc
+
+    with pytest.raises(AttributeError, match='read-only'):
+        CoinSymbols.btc.value = 'eth'
+
+
+def test_symbols_provider_ids():
+    assert CoinSymbols.btc.get_provider_id('coinmarketcap') == '1'
+    assert CoinSymbols.from_provider_id('coingecko', 'tron') is (
+        CoinSymbols.trx
+    )
+    assert QuoteSymbols.get_provider_ids('coingecko')['eur'] == 'eur'
+    assert QuoteSymbols.get_provider_index('coingecko')['eur'] is (
+        QuoteSymbols.eur
+    )
+
+    with pytest.raises(KeyError):
+        CoinSymbols.from_provider_id('coingecko', 'unknown-coin')
+
+
+def test_coin_symbols_register():
+    symbol = CoinSymbols.register(
+        'registry-test',
+        'Registry Test',
+        provider_ids={'coingecko': 'registry-test-coin'},
+    )
+
+    assert CoinSymbols('registry-test') is symbol
+    assert symbol.name == 'Registry Test'
+    assert symbol in list(CoinSymbols)
+    assert CoinSymbols.from_provider_id('coingecko', 'registry-test-coin') is (
+        symbol
+    )
+    # Registering again returns the same (interned) symbol
+    assert CoinSymbols.register('registry-test') is symbol
+
+
+def test_symbols_pydantic_validation():
+    coin_quotes = CoinQuotes.model_validate({
+        'coins': {'btc': {'quotes': {'usd': {'quote': '1'}}}},
+        'api_service': 'coingecko',
+        'raw_data': {},
+    })
+
+    assert list(coin_quotes.coins) == [CoinSymbols.btc]
+    assert coin_quotes.model_dump(mode='json')['coins'] == {
+        'btc': {'quotes': {'usd': {'quote': '1'}}}
+    }
+    with pytest.raises(ValidationError, match='is not a valid CoinSymbols'):
+        CoinQuotes.model_validate({
+            'coins': {'xyz': {'quotes': {}}},
+            'api_service': 'coingecko',
+            'raw_data': {},
+        })
+
+
+def test_symbols_pydantic_json_schema():
+    assert TypeAdapter(CoinSymbols).json_schema() == {'type': 'string'}
+    assert TypeAdapter(QuoteSymbols).json_schema() == {'type': 'string'}
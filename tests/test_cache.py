@@ -1,6 +1,10 @@
+from enum import Enum
+
 from anycoin import CoinSymbols, QuoteSymbols
 from anycoin.cache import (
+    _MAX_CACHE_KEY_LENGTH,  # noqa: PLC2701
     _get_cache_key_for_get_coin_quotes_method_params,  # noqa: PLC2701
+    _get_cache_key_for_ohlcv,  # noqa: PLC2701
 )
 
 
@@ -11,7 +15,7 @@ def test_get_cache_key_for_get_coin_quotes_method_params_one_coin_and_one_quote(
             QuoteSymbols.usd,
         ],
     )
-    assert result == 'coins:btc;quotes_in:usd'
+    assert result == 'anycoin:v1:coins:btc;quotes_in:usd'
 
 
 def test_get_cache_key_for_get_coin_quotes_method_params_multi_coin_and_one_quote():  # noqa: E501
@@ -21,7 +25,7 @@ def test_get_cache_key_for_get_coin_quotes_method_params_multi_coin_and_one_quot
             QuoteSymbols.usd,
         ],
     )
-    assert result == 'coins:btc,ltc;quotes_in:usd'
+    assert result == 'anycoin:v1:coins:btc,ltc;quotes_in:usd'
 
 
 def test_get_cache_key_for_get_coin_quotes_method_params_multi_coin_and_multi_quote():  # noqa: E501
@@ -29,7 +33,7 @@ def test_get_cache_key_for_get_coin_quotes_method_params_multi_coin_and_multi_qu
         coins=[CoinSymbols.btc, CoinSymbols.ltc],
         quotes_in=[QuoteSymbols.usd, QuoteSymbols.eur],
     )
-    assert result == 'coins:btc,ltc;quotes_in:usd,eur'
+    assert result == 'anycoin:v1:coins:btc,ltc;quotes_in:eur,usd'
 
 
 def test_get_cache_key_for_get_coin_quotes_method_params_one_coin_and_multi_quote():  # noqa: E501
@@ -37,4 +41,65 @@ def test_get_cache_key_for_get_coin_quotes_method_params_one_coin_and_multi_quot
         coins=[CoinSymbols.btc],
         quotes_in=[QuoteSymbols.usd, QuoteSymbols.eur],
     )
-    assert result == 'coins:btc;quotes_in:usd,eur'
+    assert result == 'anycoin:v1:coins:btc;quotes_in:eur,usd'
+
+
+def test_get_cache_key_for_get_coin_quotes_method_params_order_insensitive():  # noqa: E501
+    result = _get_cache_key_for_get_coin_quotes_method_params(
+        coins=[CoinSymbols.ltc, CoinSymbols.btc],
+        quotes_in=[QuoteSymbols.usd, QuoteSymbols.eur],
+    )
+    assert result == _get_cache_key_for_get_coin_quotes_method_params(
+        coins=[CoinSymbols.btc, CoinSymbols.ltc],
+        quotes_in=[QuoteSymbols.eur, QuoteSymbols.usd],
+    )
+
+
+def test_get_cache_key_for_get_coin_quotes_method_params_deduplicated():
+    result = _get_cache_key_for_get_coin_quotes_method_params(
+        coins=[CoinSymbols.btc, CoinSymbols.ltc, CoinSymbols.btc],
+        quotes_in=[QuoteSymbols.usd, QuoteSymbols.usd],
+    )
+    assert result == 'anycoin:v1:coins:btc,ltc;quotes_in:usd'
+
+
+def test_get_cache_key_for_get_coin_quotes_method_params_codec():
+    result = _get_cache_key_for_get_coin_quotes_method_params(
+        coins=[CoinSymbols.btc],
+        quotes_in=[QuoteSymbols.usd],
+        codec='compact',
+    )
+    assert result == 'anycoin:v1:codec:compact;coins:btc;quotes_in:usd'
+
+
+def test_get_cache_key_for_get_coin_quotes_method_params_long_key_is_hashed():  # noqa: E501
+    FakeCoinSymbols = Enum(
+        'FakeCoinSymbols', {f'coin{i}': f'coin-{i:04}' for i in range(100)}
+    )
+
+    result = _get_cache_key_for_get_coin_quotes_method_params(
+        coins=list(FakeCoinSymbols),
+        quotes_in=[QuoteSymbols.usd],
+    )
+    assert result.startswith('anycoin:v1:sha256:')
+    assert len(result) <= _MAX_CACHE_KEY_LENGTH
+
+    assert result == _get_cache_key_for_get_coin_quotes_method_params(
+        coins=list(reversed(FakeCoinSymbols)),
+        quotes_in=[QuoteSymbols.usd],
+    )
+
+
+def test_get_cache_key_for_ohlcv():
+    result = _get_cache_key_for_ohlcv(
+        'coingecko',
+        coins=[CoinSymbols.eth, CoinSymbols.btc],
+        quotes_in=[QuoteSymbols.usd],
+        start=1733011200,
+        end=1733788800,
+        interval='daily',
+    )
+    assert result == (
+        'anycoin:v1:ohlcv:coingecko:daily:1733011200-1733788800;'
+        'coins:btc,eth;quotes_in:usd'
+    )
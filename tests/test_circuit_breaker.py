@@ -0,0 +1,167 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from anycoin.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerPolicy,
+    CircuitState,
+)
+
+pytestmark: pytest.MarkDecorator = pytest.mark.asyncio(loop_scope='session')
+
+
+async def test_circuit_breaker_starts_closed():
+    breaker = CircuitBreaker('service', CircuitBreakerPolicy())
+
+    assert breaker.state is CircuitState.closed
+    assert breaker.health_score == 1.0
+    assert await breaker.allow_request()
+
+
+async def test_circuit_breaker_opens_on_error_rate():
+    breaker = CircuitBreaker(
+        'service',
+        CircuitBreakerPolicy(failure_rate_threshold=0.5, minimum_calls=4),
+    )
+
+    await breaker.record_success(0.1)
+    await breaker.record_failure()
+    await breaker.record_failure()
+    assert breaker.state is CircuitState.closed  # Below minimum_calls
+
+    await breaker.record_success(0.1)
+    assert breaker.state is CircuitState.open
+    assert breaker.health_score == 0.0
+    assert not await breaker.allow_request()
+
+
+async def test_circuit_breaker_opens_on_slow_calls():
+    breaker = CircuitBreaker(
+        'service',
+        CircuitBreakerPolicy(
+            slow_call_duration=1,
+            slow_call_rate_threshold=0.5,
+            minimum_calls=2,
+        ),
+    )
+
+    await breaker.record_success(0.1)
+    assert breaker.state is CircuitState.closed
+
+    await breaker.record_success(2)
+    assert breaker.slow_call_rate == 0.5  # noqa: PLR2004
+    assert breaker.state is CircuitState.open
+
+
+async def test_circuit_breaker_half_open_success_closes():
+    breaker = CircuitBreaker(
+        'service', CircuitBreakerPolicy(minimum_calls=1, cool_down=0.05)
+    )
+    await breaker.record_failure()
+    assert not await breaker.allow_request()
+
+    await asyncio.sleep(0.1)
+
+    assert await breaker.allow_request()  # Trial call
+    assert breaker.state is CircuitState.half_open
+    assert not await breaker.allow_request()  # Only one trial call
+
+    await breaker.record_success(0.1)
+    assert breaker.state is CircuitState.closed
+    assert breaker.error_rate == 0.0
+
+
+async def test_circuit_breaker_half_open_failure_opens():
+    breaker = CircuitBreaker(
+        'service', CircuitBreakerPolicy(minimum_calls=1, cool_down=0.05)
+    )
+    await breaker.record_failure()
+    await asyncio.sleep(0.1)
+
+    assert await breaker.allow_request()
+    await breaker.record_failure()
+
+    assert breaker.state is CircuitState.open
+    assert not await breaker.allow_request()
+
+
+async def test_circuit_breaker_release_request_frees_trial_call():
+    breaker = CircuitBreaker(
+        'service', CircuitBreakerPolicy(minimum_calls=1, cool_down=0.05)
+    )
+    await breaker.record_failure()
+    await asyncio.sleep(0.1)
+
+    assert await breaker.allow_request()
+    breaker.release_request()  # e.g. the trial call was cancelled
+
+    assert breaker.state is CircuitState.half_open
+    assert await breaker.allow_request()
+
+
+async def test_circuit_breaker_shared_through_cache(any_aiocache):
+    policy = CircuitBreakerPolicy(
+        minimum_calls=1, cache=any_aiocache, cache_sync_interval=0
+    )
+    breaker = CircuitBreaker('service', policy)
+    other_node_breaker = CircuitBreaker('service', policy)
+
+    await breaker.record_failure()
+
+    assert not await other_node_breaker.allow_request()
+    assert other_node_breaker.state is CircuitState.open
+
+
+def test_circuit_breaker_shared_by_threads():
+    # ``AnyCoin`` with portals shares the breakers between event loops
+    breaker = CircuitBreaker(
+        'service',
+        CircuitBreakerPolicy(window_size=50, minimum_calls=10**6),
+    )
+    n_threads, n_calls = 4, 2000
+
+    async def calls() -> None:
+        for index in range(n_calls):
+            if index % 2:
+                await breaker.record_failure()
+            else:
+                await breaker.record_success(0.1)
+            assert 0.0 <= breaker.health_score <= 1.0
+
+    with ThreadPoolExecutor(n_threads) as executor:
+        futures = [
+            executor.submit(asyncio.run, calls()) for _ in range(n_threads)
+        ]
+        for future in futures:
+            future.result()
+
+    assert breaker.state is CircuitState.closed
+
+
+async def test_circuit_breaker_half_open_trial_calls_across_threads():
+    breaker = CircuitBreaker(
+        'service',
+        CircuitBreakerPolicy(
+            minimum_calls=1, cool_down=0, half_open_max_calls=3
+        ),
+    )
+    await breaker.record_failure()
+
+    with ThreadPoolExecutor(8) as executor:
+        allowed = list(
+            executor.map(
+                lambda _: asyncio.run(breaker.allow_request()), range(64)
+            )
+        )
+
+    assert allowed.count(True) == 3  # noqa: PLR2004
+
+
+def test_circuit_breaker_repr():
+    breaker = CircuitBreaker('0:CoinGeckoService', CircuitBreakerPolicy())
+    assert repr(breaker) == (
+        "CircuitBreaker(name='0:CoinGeckoService', state=closed, "
+        'health_score=1.00)'
+    )
@@ -0,0 +1,130 @@
+from decimal import Decimal
+
+import pytest
+
+from anycoin import CoinSymbols, QuoteSymbols
+from anycoin.codecs import CompactCacheCodec, JSONCacheCodec
+from anycoin.response_models import CoinQuotes, CoinRow, QuoteRow
+
+COIN_QUOTES = CoinQuotes(
+    coins={
+        CoinSymbols.btc: CoinRow(
+            quotes={
+                QuoteSymbols.usd: QuoteRow(quote=Decimal('100811.123456789')),
+                QuoteSymbols.eur: QuoteRow(quote=Decimal('1.10')),
+            }
+        ),
+        CoinSymbols.eth: CoinRow(
+            quotes={QuoteSymbols.usd: QuoteRow(quote=Decimal('-3E+3'))}
+        ),
+    },
+    api_service='coinmarketcap',
+    raw_data={'data': {'1': {'name': 'Bitcoin'}}},
+)
+
+
+@pytest.mark.parametrize('fetched_at', [None, 1700000000.25])
+def test_json_codec_round_trip(fetched_at):
+    codec = JSONCacheCodec()
+
+    data = codec.encode(COIN_QUOTES, fetched_at=fetched_at)
+
+    assert isinstance(data, str)
+    assert codec.decode(data) == (COIN_QUOTES, fetched_at)
+
+
+def test_json_codec_decode_plain_json():
+    codec = JSONCacheCodec()
+    assert codec.decode(COIN_QUOTES.model_dump_json()) == (COIN_QUOTES, None)
+
+
+@pytest.mark.parametrize('fetched_at', [None, 1700000000.25])
+def test_compact_codec_round_trip(fetched_at):
+    codec = CompactCacheCodec()
+
+    data = codec.encode(COIN_QUOTES, fetched_at=fetched_at)
+    coin_quotes, decoded_fetched_at = codec.decode(data)
+
+    assert isinstance(data, bytes)
+    assert decoded_fetched_at == fetched_at
+    assert coin_quotes == COIN_QUOTES.model_copy(update={'raw_data': {}})
+
+    # Exact decimals: same digits and exponent
+    btc_eur = coin_quotes.coins[CoinSymbols.btc].quotes[QuoteSymbols.eur]
+    assert btc_eur.quote.as_tuple() == Decimal('1.10').as_tuple()
+
+
+def test_compact_codec_include_raw_data():
+    codec = CompactCacheCodec(include_raw_data=True)
+
+    coin_quotes, _ = codec.decode(codec.encode(COIN_QUOTES))
+
+    assert coin_quotes == COIN_QUOTES
+
+
+def test_compact_codec_missing_price():
+    codec = CompactCacheCodec()
+
+    coin_quotes, _ = codec.decode(codec.encode(COIN_QUOTES))
+
+    assert list(coin_quotes.coins[CoinSymbols.eth].quotes) == [
+        QuoteSymbols.usd
+    ]
+
+
+def test_compact_codec_long_price_stored_as_text():
+    codec = CompactCacheCodec()
+    price = Decimal('0.' + '1' * 600)
+    coin_quotes = CoinQuotes(
+        coins={
+            CoinSymbols.btc: CoinRow(
+                quotes={QuoteSymbols.usd: QuoteRow(quote=price)}
+            )
+        },
+        api_service='coingecko',
+        raw_data={},
+    )
+
+    data = codec.encode(coin_quotes)
+    decoded, _ = codec.decode(data)
+
+    assert str(price).encode('ascii') in data
+    decoded_price = decoded.coins[CoinSymbols.btc].quotes[QuoteSymbols.usd]
+    assert decoded_price.quote == price
+
+
+@pytest.mark.parametrize(
+    'price',
+    ['0', '-0.00012', '1E+40000', '12345678901234567890.123456789', '7.0'],
+)
+def test_compact_codec_exact_prices(price):
+    codec = CompactCacheCodec()
+    coin_quotes = CoinQuotes(
+        coins={
+            CoinSymbols.btc: CoinRow(
+                quotes={QuoteSymbols.usd: QuoteRow(quote=Decimal(price))}
+            )
+        },
+        api_service='coingecko',
+        raw_data={},
+    )
+
+    decoded, _ = codec.decode(codec.encode(coin_quotes))
+
+    decoded_price = decoded.coins[CoinSymbols.btc].quotes[QuoteSymbols.usd]
+    assert decoded_price.quote.as_tuple() == Decimal(price).as_tuple()
+
+
+def test_compact_codec_smaller_than_json():
+    json_data = JSONCacheCodec().encode(COIN_QUOTES)
+    compact_data = CompactCacheCodec().encode(COIN_QUOTES)
+
+    assert len(compact_data) < len(json_data.encode('utf-8')) / 2
+
+
+def test_compact_codec_invalid_data():
+    with pytest.raises(ValueError, match='Invalid compact cache value'):
+        CompactCacheCodec().decode(b'{"coins": {}}')
+
+    with pytest.raises(ValueError, match='Unsupported compact cache version'):
+        CompactCacheCodec().decode(b'AC\x09\x00\x00')
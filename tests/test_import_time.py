@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+import pytest
+
+import anycoin
+
+# Modules that made ``import anycoin`` take ~200 ms when the facades were-
+# imported eagerly (a few ms without them)
+HEAVY_MODULES = ('aiocache', 'anyio', 'httpx', 'pydantic', 'pydantic_core')
+
+
+def _run_python(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+
+def test_import_anycoin_does_not_load_heavy_modules():
+    result = _run_python(
+        'import sys\n'
+        'from anycoin import CoinSymbols, QuoteSymbols\n'
+        f'print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+    )
+
+    assert not result.stdout.strip()
+
+
+def test_facades_are_imported_on_first_access():
+    from anycoin._interfaces.async_ import AsyncAnyCoin  # noqa: PLC0415, PLC2701
+    from anycoin._interfaces.sync import AnyCoin  # noqa: PLC0415, PLC2701
+
+    assert anycoin.AsyncAnyCoin is AsyncAnyCoin
+    assert anycoin.AnyCoin is AnyCoin
+
+
+def test_unknown_attribute_raises_attribute_error():
+    with pytest.raises(AttributeError, match='has no attribute'):
+        anycoin.NotAnAttribute  # noqa: B018
@@ -0,0 +1,50 @@
+from anycoin.instrumentation import InMemoryCollector, Instrumentation
+
+
+def test_instrumentation_hooks_are_no_op():
+    instrumentation = Instrumentation()
+
+    instrumentation.on_http_request('CoinGeckoService', 0.1, 200)
+    instrumentation.on_service_call('CoinGeckoService', 0.1, None)
+    instrumentation.on_failover('CoinGeckoService', Exception())
+    instrumentation.on_cache_hit('CoinGeckoService', 'key')
+    instrumentation.on_cache_miss('CoinGeckoService', 'key')
+    instrumentation.on_lock_wait('CoinGeckoService', 'key', 0.1)
+    instrumentation.on_rate_limit_wait('CoinGeckoService', 0.1)
+    instrumentation.on_serialize('CoinGeckoService', 0.1, 10)
+    instrumentation.on_deserialize('CoinGeckoService', 0.1)
+    instrumentation.on_deserialize_error(
+        'CoinGeckoService', 'key', Exception()
+    )
+
+
+def test_in_memory_collector_summary():
+    collector = InMemoryCollector()
+    collector.on_http_request('CoinGeckoService', 0.1, 200)
+    collector.on_http_request('CoinGeckoService', 0.3, 500)
+    collector.on_failover('CoinGeckoService', Exception())
+    collector.on_cache_hit('CoinGeckoService', 'key')
+    collector.on_cache_miss('CoinGeckoService', 'key')
+    collector.on_cache_miss('CoinGeckoService', 'key')
+
+    summary = collector.summary()
+
+    assert list(summary) == ['CoinGeckoService']
+    service = summary['CoinGeckoService']
+    assert service['http_requests']['count'] == 2  # noqa: PLR2004
+    assert service['http_requests']['max_ms'] == 300  # noqa: PLR2004
+    assert service['http_statuses'] == {'200': 1, '500': 1}
+    assert service['failovers'] == 1
+    assert service['cache_hit_rate'] == 1 / 3
+    assert service['lock_waits'] == {'count': 0}
+
+
+def test_in_memory_collector_max_samples():
+    collector = InMemoryCollector(max_samples=2)
+    for duration in (0.1, 0.2, 0.3):
+        collector.on_lock_wait('CoinGeckoService', 'key', duration)
+
+    assert list(collector.lock_waits['CoinGeckoService']) == [0.2, 0.3]
+
+    collector.reset()
+    assert collector.summary() == {}
@@ -5,45 +5,73 @@ import pytest
 from anycoin import CoinSymbols, QuoteSymbols
 from anycoin._mapped_ids import (
     get_cgk_coin_ids,
+    get_cgk_coin_symbols,
     get_cgk_quotes_ids,
+    get_cgk_quotes_symbols,
     get_cmc_coins_ids,
+    get_cmc_coins_symbols,
     get_cmc_quotes_ids,
+    get_cmc_quotes_symbols,
 )
 
-pytestmark: pytest.MarkDecorator = pytest.mark.asyncio(loop_scope='session')
 
+def _get_class_body_values(symbols_class) -> set[str]:
+    # Every key of the mapped ids files is registered as a symbol on load,
+    # so the keys are checked against the ``CoinItem`` attributes instead
+    return {
+        symbol.value
+        for symbol in vars(symbols_class).values()
+        if type(symbol) is symbols_class
+    }
 
-async def test_mapped_cmc_coin_ids_keys_is_valid():
-    data: dict = await get_cmc_coins_ids()
 
-    for coin_symbol in data.keys():
-        # The CoinSymbols enumeration will-
-        # raise an error if the key is not a valid member
-        CoinSymbols(coin_symbol)
+def test_mapped_cmc_coin_ids_keys_is_valid():
+    data = get_cmc_coins_ids()
 
+    assert set(data.keys()) <= _get_class_body_values(CoinSymbols)
 
-async def test_mapped_cmc_quote_ids_keys_is_valid():
-    data: dict = await get_cmc_quotes_ids()
 
-    for coin_symbol in data.keys():
-        # The QuoteSymbols enumeration will-
-        # raise an error if the key is not a valid member
-        QuoteSymbols(coin_symbol)
+def test_mapped_cmc_quote_ids_keys_is_valid():
+    data = get_cmc_quotes_ids()
 
+    assert set(data.keys()) <= _get_class_body_values(QuoteSymbols)
 
-async def test_mapped_cgk_coin_ids_keys_is_valid():
-    data: dict = await get_cgk_coin_ids()
 
-    for coin_symbol in data.keys():
-        # The CoinSymbols enumeration will-
-        # raise an error if the key is not a valid member
-        CoinSymbols(coin_symbol)
+def test_mapped_cgk_coin_ids_keys_is_valid():
+    data = get_cgk_coin_ids()
 
+    assert set(data.keys()) <= _get_class_body_values(CoinSymbols)
 
-async def test_mapped_cgk_quote_ids_keys_is_valid():
-    data: dict = await get_cgk_quotes_ids()
 
-    for coin_symbol in data.keys():
-        # The QuoteSymbols enumeration will-
-        # raise an error if the key is not a valid member
-        QuoteSymbols(coin_symbol)
+def test_mapped_cgk_quote_ids_keys_is_valid():
+    data = get_cgk_quotes_ids()
+
+    assert set(data.keys()) <= _get_class_body_values(QuoteSymbols)
+
+
+def test_class_body_values_ignore_registered_symbols():
+    CoinSymbols.register('registered-only')
+
+    assert 'registered-only' in CoinSymbols
+    assert 'registered-only' not in _get_class_body_values(CoinSymbols)
+    assert 'btc' in _get_class_body_values(CoinSymbols)
+
+
+@pytest.mark.parametrize(
+    ('get_ids', 'get_symbols'),
+    [
+        (get_cmc_coins_ids, get_cmc_coins_symbols),
+        (get_cmc_quotes_ids, get_cmc_quotes_symbols),
+        (get_cgk_coin_ids, get_cgk_coin_symbols),
+        (get_cgk_quotes_ids, get_cgk_quotes_symbols),
+    ],
+)
+def test_mapped_symbols_is_reverse_of_mapped_ids(get_ids, get_symbols):
+    ids = get_ids()
+    symbols = get_symbols()
+
+    assert symbols == {id_: symbol for symbol, id_ in ids.items()}
+
+
+def test_mapped_symbols_is_built_once():
+    assert get_cmc_coins_symbols() is get_cmc_coins_symbols()
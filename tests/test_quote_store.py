@@ -0,0 +1,267 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from anycoin import CoinSymbols, QuoteSymbols
+from anycoin.quote_store import QuoteStore, StoredPrice
+from anycoin.response_models import CoinQuotes, CoinRow, QuoteRow
+
+T0 = 1733832300.0  # 2024-12-10T12:05:00Z
+
+
+def _coin_quotes(price: str, api_service: str = 'coingecko') -> CoinQuotes:
+    return CoinQuotes(
+        coins={
+            CoinSymbols.btc: CoinRow(
+                quotes={
+                    QuoteSymbols.usd: QuoteRow(quote=Decimal(price)),
+                    QuoteSymbols.eur: QuoteRow(quote=Decimal(price) - 1),
+                }
+            )
+        },
+        api_service=api_service,
+        raw_data={'price': price},
+    )
+
+
+def _count_rows(path) -> int:
+    with sqlite3.connect(path) as connection:
+        return connection.execute('SELECT COUNT(*) FROM quotes').fetchone()[0]
+
+
+def test_get_coin_quotes_fresh():
+    with QuoteStore(max_age=60) as store:
+        store.add(_coin_quotes('100000'))
+
+        result = store.get_coin_quotes(
+            coins=[CoinSymbols.btc],
+            quotes_in=[QuoteSymbols.eur, QuoteSymbols.usd],
+        )
+
+    assert result.api_service == 'coingecko'
+    assert not result.raw_data
+    assert result.coins[CoinSymbols.btc].quotes == {
+        QuoteSymbols.eur: QuoteRow(quote=Decimal('99999')),
+        QuoteSymbols.usd: QuoteRow(quote=Decimal('100000')),
+    }
+
+
+def test_get_coin_quotes_stale_or_missing():
+    with QuoteStore(max_age=60) as store:
+        store.add(_coin_quotes('100000'), at=time.time() - 61)
+
+        assert (
+            store.get_coin_quotes(
+                coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+            )
+            is None
+        )
+        # A looser freshness bound serves it
+        assert store.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd], max_age=120
+        )
+        assert (
+            store.get_coin_quotes(
+                coins=[CoinSymbols.btc, CoinSymbols.eth],
+                quotes_in=[QuoteSymbols.usd],
+                max_age=120,
+            )
+            is None
+        )
+
+
+def test_get_coin_quotes_fetched_at_oldest_price():
+    with QuoteStore(max_age=60) as store:
+        store.add(_coin_quotes('100000'), at=T0)
+        store.add(
+            CoinQuotes(
+                coins={
+                    CoinSymbols.btc: CoinRow(
+                        quotes={QuoteSymbols.usd: QuoteRow(quote=Decimal(1))}
+                    )
+                },
+                api_service='coingecko',
+                raw_data={},
+            ),
+            at=T0 + 30,
+        )
+
+        result = store.get_coin_quotes(
+            coins=[CoinSymbols.btc],
+            quotes_in=[QuoteSymbols.eur, QuoteSymbols.usd],
+            max_age=time.time(),
+        )
+
+    assert result.fetched_at == T0
+
+
+def test_get_coin_quotes_from_different_services():
+    with QuoteStore(max_age=60) as store:
+        store.add(_coin_quotes('100000'))
+        store.add(
+            CoinQuotes(
+                coins={
+                    CoinSymbols.btc: CoinRow(
+                        quotes={QuoteSymbols.usd: QuoteRow(quote=Decimal(1))}
+                    )
+                },
+                api_service='coinmarketcap',
+                raw_data={},
+            )
+        )
+
+        # One result is labelled with one service: not answered
+        assert (
+            store.get_coin_quotes(
+                coins=[CoinSymbols.btc],
+                quotes_in=[QuoteSymbols.eur, QuoteSymbols.usd],
+            )
+            is None
+        )
+        assert (
+            store.get_coin_quotes(
+                coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+            ).api_service
+            == 'coinmarketcap'
+        )
+
+
+def test_point_and_range_queries():
+    with QuoteStore() as store:
+        store.add(_coin_quotes('100'), at=T0)
+        store.add(_coin_quotes('200', api_service='coinmarketcap'), at=T0 + 60)
+        store.add(_coin_quotes('300'), at=T0 + 120)
+
+        # What was BTC/USD at 12:05:30?
+        at = datetime(2024, 12, 10, 12, 5, 30, tzinfo=timezone.utc)
+        assert store.get_price(
+            CoinSymbols.btc, QuoteSymbols.usd, at=at
+        ) == StoredPrice(
+            time=T0, price=Decimal('100'), api_service='coingecko'
+        )
+        price = store.get_price(CoinSymbols.btc, QuoteSymbols.usd, at=T0 - 1)
+        assert price is None
+
+        prices = store.get_prices(
+            CoinSymbols.btc, QuoteSymbols.eur, start=T0 + 1, end=T0 + 120
+        )
+        assert prices == [
+            StoredPrice(
+                time=T0 + 60, price=Decimal('199'), api_service='coinmarketcap'
+            ),
+            StoredPrice(
+                time=T0 + 120, price=Decimal('299'), api_service='coingecko'
+            ),
+        ]
+
+
+def test_prices_persist_across_restarts(tmp_path):
+    path = tmp_path / 'quotes.sqlite3'
+    with QuoteStore(path) as store:
+        store.add(_coin_quotes('100000'))
+
+    with QuoteStore(path, max_age=60) as store:
+        result = store.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+
+    assert result.coins[CoinSymbols.btc].quotes[QuoteSymbols.usd] == QuoteRow(
+        quote=Decimal('100000')
+    )
+
+
+def test_writes_are_batched(tmp_path):
+    path = tmp_path / 'quotes.sqlite3'
+    store = QuoteStore(path, batch_size=4, flush_interval=60)
+
+    store.add(_coin_quotes('1'))  # 2 rows: buffered
+    assert _count_rows(path) == 0
+
+    store.add(_coin_quotes('2'))  # 4 rows: written by the background thread
+    for _ in range(100):
+        if _count_rows(path):
+            break
+        time.sleep(0.01)
+    assert _count_rows(path) == 4  # noqa: PLR2004
+
+    store.add(_coin_quotes('3'))
+    store.close()
+    assert _count_rows(path) == 6  # noqa: PLR2004
+
+
+def test_queries_wait_for_the_batch_being_written():
+    class SlowWriterLock:
+        # The writer thread takes the database lock late, after it has
+        # taken the buffered rows
+        def __init__(self):
+            self._lock = threading.Lock()
+
+        def __enter__(self):
+            if threading.current_thread().name == 'anycoin-quote-store':
+                time.sleep(0.2)
+            self._lock.acquire()
+
+        def __exit__(self, *exc_info):
+            self._lock.release()
+
+    with QuoteStore(batch_size=1, flush_interval=60) as store:
+        store._db_lock = SlowWriterLock()
+        store.add(_coin_quotes('100'), at=T0)
+        for _ in range(100):
+            if not store._pending:  # Taken by the writer thread
+                break
+            time.sleep(0.01)
+
+        assert store.get_price(
+            CoinSymbols.btc, QuoteSymbols.usd, at=T0
+        ) == StoredPrice(
+            time=T0, price=Decimal('100'), api_service='coingecko'
+        )
+
+
+def test_add_after_close():
+    store = QuoteStore()
+    store.close()
+
+    with pytest.raises(RuntimeError, match='QuoteStore is closed'):
+        store.add(_coin_quotes('1'))
+
+
+def test_is_loaded(tmp_path):
+    path = tmp_path / 'quotes.sqlite3'
+    with QuoteStore(path) as store:
+        store.add(_coin_quotes('100000'))
+
+    with QuoteStore(path, max_age=60) as store:
+        assert not store.is_loaded([CoinSymbols.btc], [QuoteSymbols.usd])
+
+        store.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )  # Read from the database once
+
+        assert store.is_loaded([CoinSymbols.btc], [QuoteSymbols.usd])
+        assert not store.is_loaded([CoinSymbols.eth], [QuoteSymbols.usd])
+
+
+def test_get_coin_quotes_after_close():
+    store = QuoteStore(max_age=60)
+    store.add(_coin_quotes('100000'))
+    store.close()
+
+    # Answered from memory only
+    assert store.is_loaded([CoinSymbols.eth], [QuoteSymbols.usd])
+    assert store.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    ).coins[CoinSymbols.btc].quotes[QuoteSymbols.usd] == QuoteRow(
+        quote=Decimal('100000')
+    )
+    assert (
+        store.get_coin_quotes(
+            coins=[CoinSymbols.eth], quotes_in=[QuoteSymbols.usd]
+        )
+        is None
+    )
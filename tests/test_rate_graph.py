@@ -0,0 +1,179 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import pytest
+
+from anycoin import CoinSymbols, QuoteSymbols
+from anycoin.exeptions import ConvertCoin as ConvertCoinException
+from anycoin.rate_graph import RateGraph
+from anycoin.response_models import CoinQuotes, CoinRow, QuoteRow
+
+COIN_QUOTES = CoinQuotes(
+    coins={
+        CoinSymbols.btc: CoinRow(
+            quotes={
+                QuoteSymbols.usd: QuoteRow(quote=Decimal('100000')),
+                QuoteSymbols.eur: QuoteRow(quote=Decimal('95000')),
+            }
+        ),
+        CoinSymbols.eth: CoinRow(
+            quotes={QuoteSymbols.usd: QuoteRow(quote=Decimal('4000'))}
+        ),
+    },
+    api_service='coinmarketcap',
+    raw_data={},
+)
+
+
+@pytest.fixture
+def rate_graph():
+    rate_graph = RateGraph()
+    rate_graph.add(COIN_QUOTES)
+    return rate_graph
+
+
+@pytest.mark.parametrize(
+    ('from_coin', 'to_coin', 'expected'),
+    [
+        (CoinSymbols.btc, QuoteSymbols.eur, Decimal('190000')),
+        (QuoteSymbols.usd, CoinSymbols.eth, Decimal('0.0005')),
+        (CoinSymbols.btc, CoinSymbols.eth, Decimal('50')),
+        (
+            QuoteSymbols.eur,
+            QuoteSymbols.usd,
+            Decimal('2.105263157894736842105263158'),
+        ),
+        (CoinSymbols.eth, QuoteSymbols.eur, Decimal('7600')),
+        (CoinSymbols.eth, CoinSymbols.eth, Decimal('2')),
+    ],
+)
+def test_convert(rate_graph, from_coin, to_coin, expected):
+    assert rate_graph.convert(2, from_coin, to_coin) == expected
+
+
+def test_convert_without_rate(rate_graph):
+    with pytest.raises(ConvertCoinException, match='No rate from'):
+        rate_graph.convert(1, CoinSymbols.btc, QuoteSymbols.brl)
+
+
+def test_convert_expired_prices():
+    rate_graph = RateGraph(max_age=0)
+    rate_graph.add(COIN_QUOTES)
+
+    with pytest.raises(ConvertCoinException, match='No rate from'):
+        rate_graph.convert(1, CoinSymbols.btc, QuoteSymbols.usd)
+
+
+def test_convert_prices_aged_from_their_fetch():
+    rate_graph = RateGraph(max_age=60)
+    # e.g. read from the cache, fetched 2 minutes ago
+    rate_graph.add(
+        COIN_QUOTES.model_copy(update={'fetched_at': time.time() - 120})
+    )
+
+    with pytest.raises(ConvertCoinException, match='No rate from'):
+        rate_graph.convert(1, CoinSymbols.btc, QuoteSymbols.usd)
+
+    rate_graph.add(
+        COIN_QUOTES.model_copy(update={'fetched_at': time.time() - 30})
+    )
+    assert rate_graph.convert(1, CoinSymbols.btc, QuoteSymbols.usd) == Decimal(
+        '100000'
+    )
+
+
+def test_convert_at_the_time_of_get_missing():
+    rate_graph = RateGraph(max_age=10)
+    rate_graph.add(COIN_QUOTES)
+
+    now = time.monotonic()
+    assert rate_graph.get_missing(
+        [(CoinSymbols.btc, QuoteSymbols.usd)], now=now
+    ) == ([], [])
+    # Prices fresh for ``get_missing`` are fresh for ``convert`` at its now
+    assert rate_graph.convert(
+        1, CoinSymbols.btc, QuoteSymbols.usd, now=now
+    ) == Decimal('100000')
+
+    with pytest.raises(ConvertCoinException, match='No rate from'):
+        rate_graph.convert(1, CoinSymbols.btc, QuoteSymbols.usd, now=now + 11)
+
+
+def test_shared_by_threads():
+    # ``AnyCoin`` with portals shares the graph between event loops
+    rate_graph = RateGraph()
+    rate_graph.add(COIN_QUOTES)
+    added = threading.Event()
+
+    def add_prices() -> None:
+        # Built without validation: plain ints stand for many coins
+        for coin in range(5_000):
+            rate_graph.add(
+                CoinQuotes.model_construct(
+                    coins={
+                        coin: CoinRow.model_construct(
+                            quotes={
+                                QuoteSymbols.usd: QuoteRow.model_construct(
+                                    quote=Decimal(1)
+                                )
+                            }
+                        )
+                    }
+                )
+            )
+        added.set()
+
+    def find_paths() -> None:
+        while not added.is_set():
+            # No path: every usd price is visited while prices are added
+            rate_graph.get_missing([(CoinSymbols.btc, QuoteSymbols.brl)])
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads as often as possible
+    try:
+        with ThreadPoolExecutor(4) as executor:
+            futures = [
+                executor.submit(task)
+                for task in (add_prices, find_paths, find_paths, find_paths)
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert rate_graph.convert(1, CoinSymbols.btc, CoinSymbols.eth) == Decimal(
+        '25'
+    )
+
+
+def test_get_missing_uses_one_pivot():
+    rate_graph = RateGraph()
+
+    assert rate_graph.get_missing([
+        (CoinSymbols.btc, CoinSymbols.eth),
+        (CoinSymbols.eth, QuoteSymbols.brl),
+        (QuoteSymbols.eur, QuoteSymbols.brl),
+    ]) == (
+        [CoinSymbols.btc, CoinSymbols.eth],
+        [QuoteSymbols.usd, QuoteSymbols.brl, QuoteSymbols.eur],
+    )
+
+
+def test_get_missing_pivot_by_availability(rate_graph):
+    assert rate_graph.get_missing([
+        (CoinSymbols.btc, CoinSymbols.eth),
+        (CoinSymbols.eth, QuoteSymbols.eur),
+        (CoinSymbols.sol, CoinSymbols.eth),
+        (QuoteSymbols.eur, QuoteSymbols.brl),
+    ]) == (
+        [CoinSymbols.sol, CoinSymbols.eth, CoinSymbols.btc],
+        [QuoteSymbols.usd, QuoteSymbols.eur, QuoteSymbols.brl],
+    )
+
+
+def test_get_missing_invalid_conversion(rate_graph):
+    with pytest.raises(ConvertCoinException, match='Invalid conversion'):
+        rate_graph.get_missing([('btc', QuoteSymbols.usd)])
@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+import pytest
+
+from anycoin.exeptions import GetCoinQuotes as GetCoinQuotesException
+from anycoin.exeptions import RateLimited as RateLimitedException
+from anycoin.rate_limit import RateLimit, RateLimiter
+
+pytestmark: pytest.MarkDecorator = pytest.mark.asyncio(loop_scope='session')
+
+
+async def test_rate_limiter_paces_requests():
+    rate_limiter = RateLimiter([RateLimit(requests=100, period=1)])
+
+    start = time.monotonic()
+    waits = await asyncio.gather(*(rate_limiter.acquire() for _ in range(5)))
+
+    assert waits[0] == 0
+    assert time.monotonic() - start >= 0.04  # noqa: PLR2004
+    assert waits == sorted(waits)  # In arrival order
+
+
+async def test_rate_limiter_burst():
+    rate_limiter = RateLimiter([RateLimit(requests=1, period=60, burst=3)])
+
+    for _ in range(3):
+        assert await rate_limiter.acquire() == 0
+
+    assert rate_limiter.get_delay() > 59  # noqa: PLR2004
+
+
+async def test_rate_limiter_strictest_limit_wins():
+    rate_limiter = RateLimiter([
+        RateLimit(requests=1000, period=1),
+        RateLimit(requests=10, period=1),
+    ])
+
+    await rate_limiter.acquire()
+
+    assert rate_limiter.get_delay() == pytest.approx(0.1, abs=0.01)
+
+
+async def test_rate_limiter_queue_depth_and_max_queue():
+    rate_limiter = RateLimiter([RateLimit(requests=10, period=1)], max_queue=1)
+    await rate_limiter.acquire()
+
+    waiting = asyncio.create_task(rate_limiter.acquire())
+    await asyncio.sleep(0)
+    assert rate_limiter.queue_depth == 1
+
+    delay = rate_limiter.get_delay()
+    with pytest.raises(RateLimitedException, match='queue is full'):
+        await rate_limiter.acquire()
+    # The rejected request did not take a slot
+    assert rate_limiter.get_delay() == pytest.approx(delay, abs=0.01)
+
+    await waiting
+    assert rate_limiter.queue_depth == 0
+
+
+async def test_rate_limiter_pause():
+    rate_limiter = RateLimiter([RateLimit(requests=1000, period=1)])
+
+    rate_limiter.pause(0.05)
+
+    start = time.monotonic()
+    await rate_limiter.acquire()
+    assert time.monotonic() - start >= 0.04  # noqa: PLR2004
+
+
+async def test_rate_limiter_pause_while_waiting_keeps_the_slot():
+    rate_limiter = RateLimiter([RateLimit(requests=5, period=1)])
+    await rate_limiter.acquire()
+
+    waiting = asyncio.create_task(rate_limiter.acquire())
+    await asyncio.sleep(0)
+    rate_limiter.pause(0.4)
+
+    assert await waiting >= 0.35  # noqa: PLR2004
+    # The paused request did not take a second slot
+    assert rate_limiter.get_delay() < 0.1  # noqa: PLR2004
+
+
+async def test_rate_limiter_cancelled_request_gives_the_slot_back():
+    rate_limiter = RateLimiter([RateLimit(requests=5, period=1)])
+    await rate_limiter.acquire()
+    delay = rate_limiter.get_delay()
+
+    waiting = asyncio.create_task(rate_limiter.acquire())
+    await asyncio.sleep(0)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+
+    assert rate_limiter.queue_depth == 0
+    assert rate_limiter.get_delay() == pytest.approx(delay, abs=0.01)
+
+
+def test_rate_limiter_pause_without_retry_after():
+    rate_limiter = RateLimiter([
+        RateLimit(requests=1, period=1),
+        RateLimit(requests=30, period=60),
+    ])
+
+    rate_limiter.pause(None)
+
+    assert rate_limiter.get_delay() == pytest.approx(1, abs=0.01)
+
+
+def test_rate_limiter_without_limits():
+    with pytest.raises(ValueError, match='At least one rate limit'):
+        RateLimiter([])
+
+
+def test_rate_limited_is_a_get_coin_quotes_error():
+    assert issubclass(RateLimitedException, GetCoinQuotesException)
@@ -1,7 +1,29 @@
+import sys
 from decimal import Decimal
 
+import pytest
+
 from anycoin import CoinSymbols, QuoteSymbols
-from anycoin.response_models import CoinQuotes, CoinRow, QuoteRow
+from anycoin.exeptions import (
+    CoinNotSupportedCGK as CoinNotSupportedCGKException,
+)
+from anycoin.exeptions import (
+    CoinNotSupportedCMC as CoinNotSupportedCMCException,
+)
+from anycoin.exeptions import (
+    QuoteCoinNotSupportedCGK as QuoteCoinNotSupportedCGKException,
+)
+from anycoin.exeptions import (
+    QuoteCoinNotSupportedCMC as QuoteCoinNotSupportedCMCException,
+)
+from anycoin.response_models import (
+    OHLCV,
+    CoinQuotes,
+    CoinRow,
+    CompactCoinQuotes,
+    HistoricalQuotes,
+    QuoteRow,
+)
 
 
 def test_coin_quotes_repr():
@@ -64,3 +86,363 @@ def test_coin_quotes_model_validate_json():
     model_json: str = model.model_dump_json()
 
     assert CoinQuotes.model_validate_json(model_json) == model
+
+
+def test_coin_quotes_subset():
+    model = CoinQuotes(
+        coins={
+            CoinSymbols.btc: CoinRow(
+                quotes={
+                    QuoteSymbols.usd: QuoteRow(quote=Decimal('100000')),
+                    QuoteSymbols.eur: QuoteRow(quote=Decimal('90000')),
+                }
+            ),
+            CoinSymbols.eth: CoinRow(
+                quotes={QuoteSymbols.usd: QuoteRow(quote=Decimal('3000'))}
+            ),
+        },
+        api_service='coingecko',
+        raw_data={'bitcoin': {'usd': 100000, 'eur': 90000}},
+    )
+
+    subset = model.subset(
+        coins=[CoinSymbols.btc, CoinSymbols.sol], quotes_in=[QuoteSymbols.eur]
+    )
+    assert subset.model_dump(mode='json') == {
+        'coins': {'btc': {'quotes': {'eur': {'quote': '90000'}}}},
+        'api_service': 'coingecko',
+        'raw_data': {'bitcoin': {'usd': 100000, 'eur': 90000}},
+    }
+
+
+def test_compact_coin_quotes_round_trip():
+    model = CoinQuotes(
+        coins={
+            CoinSymbols.btc: CoinRow(
+                quotes={
+                    QuoteSymbols.usd: QuoteRow(quote=Decimal('100000.123')),
+                    QuoteSymbols.eur: QuoteRow(quote=Decimal('90000')),
+                }
+            ),
+            CoinSymbols.eth: CoinRow(
+                quotes={QuoteSymbols.usd: QuoteRow(quote=Decimal('3000'))}
+            ),
+            CoinSymbols.sol: CoinRow(quotes={}),
+        },
+        api_service='coinmarketcap',
+        raw_data={'data': {}},
+    )
+
+    compact = CompactCoinQuotes.from_coin_quotes(model)
+
+    assert compact.coins == (CoinSymbols.btc, CoinSymbols.eth, CoinSymbols.sol)
+    assert compact.quotes_in == (QuoteSymbols.usd, QuoteSymbols.eur)
+    assert compact[CoinSymbols.btc, QuoteSymbols.usd] == Decimal('100000.123')
+    assert compact.get(CoinSymbols.eth, QuoteSymbols.eur) is None
+    assert (CoinSymbols.eth, QuoteSymbols.usd) in compact
+    assert (CoinSymbols.eth, QuoteSymbols.eur) not in compact
+    assert compact.to_coin_quotes() == model
+
+
+def test_compact_coin_quotes_missing_price():
+    compact = CompactCoinQuotes(
+        coins=(CoinSymbols.btc,),
+        quotes_in=(QuoteSymbols.usd,),
+        prices=(Decimal('1'),),
+        api_service='coingecko',
+    )
+
+    with pytest.raises(KeyError):
+        compact[CoinSymbols.eth, QuoteSymbols.usd]  # noqa: B018
+
+    assert compact.to_coin_quotes().raw_data == {}
+
+
+def test_compact_coin_quotes_invalid_prices():
+    with pytest.raises(ValueError, match='Expected 2 prices, got 1'):
+        CompactCoinQuotes(
+            coins=(CoinSymbols.btc,),
+            quotes_in=(QuoteSymbols.usd, QuoteSymbols.eur),
+            prices=(Decimal('1'),),
+            api_service='coingecko',
+        )
+
+
+def test_compact_coin_quotes_repr():
+    compact = CompactCoinQuotes(
+        coins=(CoinSymbols.btc,),
+        quotes_in=(QuoteSymbols.usd,),
+        prices=(Decimal('1'),),
+        api_service='coingecko',
+    )
+    assert (
+        repr(compact)
+        == str(compact)
+        == (
+            f'CompactCoinQuotes(coins={compact.coins}, '
+            f"quotes_in={compact.quotes_in}, api_service='coingecko')"
+        )
+    )
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_coin_quotes_from_cmc_raw_data():
+    raw_data = {
+        'data': {
+            '1': {
+                'quote': {'2781': {'price': 100811.5}, '2790': {'price': 1}}
+            },
+            '1027': {'quote': {'2781': {'price': 3000}}},
+        }
+    }
+
+    model = await CoinQuotes.from_cmc_raw_data(raw_data)
+
+    assert model.model_dump() == {
+        'coins': {
+            CoinSymbols.btc: {
+                'quotes': {
+                    QuoteSymbols.usd: {'quote': Decimal('100811.5')},
+                    QuoteSymbols.eur: {'quote': Decimal('1')},
+                }
+            },
+            CoinSymbols.eth: {
+                'quotes': {QuoteSymbols.usd: {'quote': Decimal('3000')}}
+            },
+        },
+        'api_service': 'coinmarketcap',
+        'raw_data': raw_data,
+    }
+    assert CoinQuotes.model_validate_json(model.model_dump_json()) == model
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_coin_quotes_from_cmc_raw_data_not_supported():
+    with pytest.raises(
+        CoinNotSupportedCMCException, match='Coin with id 999999 not supported'
+    ):
+        await CoinQuotes.from_cmc_raw_data({
+            'data': {'999999': {'quote': {'2781': {'price': 1}}}}
+        })
+
+    with pytest.raises(
+        QuoteCoinNotSupportedCMCException,
+        match='Quote with id 999999 not supported',
+    ):
+        await CoinQuotes.from_cmc_raw_data({
+            'data': {'1': {'quote': {'999999': {'price': 1}}}}
+        })
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_coin_quotes_from_cgk_raw_data_not_supported():
+    with pytest.raises(
+        CoinNotSupportedCGKException, match='Coin with id fake not supported'
+    ):
+        await CoinQuotes.from_cgk_raw_data({'fake': {'usd': 1}})
+
+    with pytest.raises(
+        QuoteCoinNotSupportedCGKException,
+        match='Quote with id fake not supported',
+    ):
+        await CoinQuotes.from_cgk_raw_data({'bitcoin': {'fake': 1}})
+
+
+DAY_1 = 1733788800  # 2024-12-10T00:00:00Z
+DAY_2 = DAY_1 + 86_400
+
+CMC_OHLCV_RAW_DATA = {
+    'status': {'error_code': 0},
+    'data': {
+        '1': {
+            'id': 1,
+            'symbol': 'BTC',
+            'quotes': [
+                {
+                    'time_open': '2024-12-11T00:00:00.000Z',
+                    'quote': {
+                        '2781': {
+                            'open': 97000.5,
+                            'high': 99000,
+                            'low': 96000,
+                            'close': 98000.25,
+                            'volume': 123.5,
+                        }
+                    },
+                },
+                {
+                    'time_open': '2024-12-10T00:00:00.000Z',
+                    'quote': {
+                        '2781': {
+                            'open': 96000,
+                            'high': 98000,
+                            'low': 95000,
+                            'close': 97000.5,
+                            'volume': 100,
+                        }
+                    },
+                },
+            ],
+        }
+    },
+}
+
+CGK_OHLCV_RAW_DATA = {
+    'bitcoin': {
+        'eur': [
+            [(DAY_1 + 86_400) * 1000, 91000, 93000, 90000, 92000],
+            [(DAY_2 + 86_400) * 1000, 92000, 94000, 91000, 93000.5],
+        ]
+    }
+}
+
+
+def test_historical_quotes_from_cmc_raw_data():
+    historical_quotes = HistoricalQuotes.from_cmc_raw_data(
+        CMC_OHLCV_RAW_DATA, interval='daily'
+    )
+
+    ohlcv = historical_quotes[CoinSymbols.btc, QuoteSymbols.usd]
+    assert len(historical_quotes) == 1
+    assert historical_quotes.api_service == 'coinmarketcap'
+    assert historical_quotes.raw_data == CMC_OHLCV_RAW_DATA
+    # Sorted by time
+    assert ohlcv.timestamps == (DAY_1, DAY_2)
+    assert ohlcv.open == (Decimal('96000'), Decimal('97000.5'))
+    assert ohlcv.high == (Decimal('98000'), Decimal('99000'))
+    assert ohlcv.low == (Decimal('95000'), Decimal('96000'))
+    assert ohlcv.close == (Decimal('97000.5'), Decimal('98000.25'))
+    assert ohlcv.volume == (Decimal('100'), Decimal('123.5'))
+
+
+def test_historical_quotes_from_cgk_raw_data():
+    historical_quotes = HistoricalQuotes.from_cgk_raw_data(
+        CGK_OHLCV_RAW_DATA, interval='daily'
+    )
+
+    ohlcv = historical_quotes[CoinSymbols.btc, QuoteSymbols.eur]
+    assert historical_quotes.api_service == 'coingecko'
+    # Close time moved to the open time of the candle
+    assert ohlcv.timestamps == (DAY_1, DAY_2)
+    assert ohlcv.close == (Decimal('92000'), Decimal('93000.5'))
+    assert ohlcv.volume == (None, None)
+    assert historical_quotes.get(CoinSymbols.eth, QuoteSymbols.eur) is None
+
+
+@pytest.mark.parametrize(
+    ('build', 'raw_data', 'exception', 'message'),
+    [
+        (
+            HistoricalQuotes.from_cmc_raw_data,
+            {'data': {'999999999': {'quotes': []}}},
+            CoinNotSupportedCMCException,
+            'Coin with id 999999999 not supported',
+        ),
+        (
+            HistoricalQuotes.from_cmc_raw_data,
+            {
+                'data': {
+                    '1': {
+                        'quotes': [
+                            {
+                                'time_open': '2024-12-10T00:00:00.000Z',
+                                'quote': {'1': {}},
+                            }
+                        ]
+                    }
+                }
+            },
+            QuoteCoinNotSupportedCMCException,
+            'Quote with id 1 not supported',
+        ),
+        (
+            HistoricalQuotes.from_cgk_raw_data,
+            {'fake-coin': {'usd': []}},
+            CoinNotSupportedCGKException,
+            'Coin with id fake-coin not supported',
+        ),
+        (
+            HistoricalQuotes.from_cgk_raw_data,
+            {'bitcoin': {'fake-quote': []}},
+            QuoteCoinNotSupportedCGKException,
+            'Quote with id fake-quote not supported',
+        ),
+    ],
+)
+def test_historical_quotes_not_supported(build, raw_data, exception, message):
+    with pytest.raises(exception, match=message):
+        build(raw_data, interval='daily')
+
+
+def test_historical_quotes_json_round_trip():
+    historical_quotes = HistoricalQuotes.from_cgk_raw_data(
+        CGK_OHLCV_RAW_DATA, interval='daily'
+    )
+
+    decoded = HistoricalQuotes.from_json(historical_quotes.to_json())
+
+    assert decoded.series == historical_quotes.series
+    assert decoded.interval == 'daily'
+    assert not decoded.raw_data  # Not kept
+
+
+def test_ohlcv_columns_must_have_the_same_length():
+    with pytest.raises(ValueError, match='same length'):
+        OHLCV(
+            CoinSymbols.btc,
+            QuoteSymbols.eur,
+            (DAY_1,),
+            (Decimal(1),),
+            (Decimal(1),),
+            (Decimal(1),),
+            (),
+            (None,),
+        )
+
+
+def test_ohlcv_to_numpy():
+    np = pytest.importorskip('numpy')
+    ohlcv = HistoricalQuotes.from_cmc_raw_data(
+        CMC_OHLCV_RAW_DATA, interval='daily'
+    )[CoinSymbols.btc, QuoteSymbols.usd]
+
+    arrays = ohlcv.to_numpy()
+
+    assert arrays['timestamp'][0] == np.datetime64(DAY_1, 's')
+    assert arrays['close'].tolist() == [97000.5, 98000.25]
+
+
+def test_historical_quotes_to_arrow():
+    pytest.importorskip('pyarrow')
+    historical_quotes = HistoricalQuotes.from_cmc_raw_data(
+        CMC_OHLCV_RAW_DATA, interval='daily'
+    )
+
+    table = historical_quotes.to_arrow()
+
+    assert table.column_names == [
+        'coin',
+        'quote',
+        'timestamp',
+        'open',
+        'high',
+        'low',
+        'close',
+        'volume',
+    ]
+    assert table.column('coin').to_pylist() == ['btc', 'btc']
+    assert table.column('close').to_pylist() == [97000.5, 98000.25]
+
+
+def test_ohlcv_views_without_optional_dependency(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    historical_quotes = HistoricalQuotes.from_cmc_raw_data(
+        CMC_OHLCV_RAW_DATA, interval='daily'
+    )
+    ohlcv = historical_quotes[CoinSymbols.btc, QuoteSymbols.usd]
+
+    with pytest.raises(ImportError, match=r'anycoin\[numpy\]'):
+        ohlcv.to_numpy()
+    with pytest.raises(ImportError, match=r'anycoin\[arrow\]'):
+        historical_quotes.to_arrow()